@@ -1,4 +1,5 @@
 import os
+import tempfile
 import environ
 from pathlib import Path
 
@@ -63,6 +64,12 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media_test')
 MEDIA_URL = '/media_test/'
 
+# Hash uploads with SHA-256 while they are received (see core.utils.content_hashing).
+FILE_UPLOAD_HANDLERS = [
+    'core.utils.content_hashing.HashingMemoryFileUploadHandler',
+    'core.utils.content_hashing.HashingTemporaryFileUploadHandler',
+]
+
 # Supabase Storage Configuration (S3-compatible via django-storages)
 SUPABASE_PROJECT_URL = env("SUPABASE_PROJECT_URL")
 AWS_STORAGE_BUCKET_NAME = env("SUPABASE_STORAGE_BUCKET_NAME")
@@ -83,3 +90,122 @@ S3BOTO3_REGION_NAME = AWS_S3_REGION_NAME
 # Recommended default ACL for uploaded files
 AWS_DEFAULT_ACL = 'public-read'
 AWS_S3_FILE_OVERWRITE = False
+
+# Document list pagination (keyset/cursor based)
+DOCUMENT_PAGE_SIZE = env.int("DOCUMENT_PAGE_SIZE", default=25)
+DOCUMENT_MAX_PAGE_SIZE = env.int("DOCUMENT_MAX_PAGE_SIZE", default=100)
+
+# Background text extraction (PDF/DOCX/TXT -> DocumentContent)
+TEXT_EXTRACTION_ENABLED = env.bool("TEXT_EXTRACTION_ENABLED", default=True)
+TEXT_EXTRACTION_WORKERS = env.int("TEXT_EXTRACTION_WORKERS", default=2)
+TEXT_EXTRACTION_MAX_CHARS = env.int("TEXT_EXTRACTION_MAX_CHARS", default=500_000)
+TEXT_EXTRACTION_MAX_DOCX_XML_SIZE = env.int("TEXT_EXTRACTION_MAX_DOCX_XML_SIZE", default=50 * 1024 * 1024)
+
+# Presigned direct-to-storage uploads
+DIRECT_UPLOAD_MAX_SIZE = env.int("DIRECT_UPLOAD_MAX_SIZE", default=50 * 1024 * 1024)
+DIRECT_UPLOAD_EXPIRY_SECONDS = env.int("DIRECT_UPLOAD_EXPIRY_SECONDS", default=15 * 60)
+DIRECT_UPLOAD_FINALIZE_WINDOW_SECONDS = env.int("DIRECT_UPLOAD_FINALIZE_WINDOW_SECONDS", default=60 * 60)
+
+# Resumable chunked uploads
+CHUNKED_UPLOAD_TEMP_DIR = env.str("CHUNKED_UPLOAD_TEMP_DIR", default=os.path.join(tempfile.gettempdir(), 'archivus-uploads'))
+CHUNKED_UPLOAD_CHUNK_SIZE = env.int("CHUNKED_UPLOAD_CHUNK_SIZE", default=5 * 1024 * 1024)
+CHUNKED_UPLOAD_MIN_CHUNK_SIZE = env.int("CHUNKED_UPLOAD_MIN_CHUNK_SIZE", default=256 * 1024)
+CHUNKED_UPLOAD_MAX_SIZE = env.int("CHUNKED_UPLOAD_MAX_SIZE", default=500 * 1024 * 1024)
+CHUNKED_UPLOAD_SESSION_TTL_SECONDS = env.int("CHUNKED_UPLOAD_SESSION_TTL_SECONDS", default=24 * 60 * 60)
+
+# Document downloads. Set DOCUMENT_DOWNLOAD_SENDFILE_HEADER to 'X-Sendfile' (Apache) or
+# 'X-Accel-Redirect' (nginx, with an internal location at DOCUMENT_DOWNLOAD_ACCEL_PREFIX)
+# to let the web server send locally stored files.
+DOCUMENT_DOWNLOAD_SENDFILE_HEADER = env.str("DOCUMENT_DOWNLOAD_SENDFILE_HEADER", default='')
+DOCUMENT_DOWNLOAD_ACCEL_PREFIX = env.str("DOCUMENT_DOWNLOAD_ACCEL_PREFIX", default='/protected-media/')
+DOCUMENT_DOWNLOAD_CHUNK_SIZE = env.int("DOCUMENT_DOWNLOAD_CHUNK_SIZE", default=64 * 1024)
+
+# Bulk review: maximum decisions per request and IDs per SQL statement.
+DOCUMENT_BULK_MAX_ITEMS = env.int("DOCUMENT_BULK_MAX_ITEMS", default=5000)
+DOCUMENT_BULK_BATCH_SIZE = env.int("DOCUMENT_BULK_BATCH_SIZE", default=900)
+
+# Bulk ZIP/manifest ingest
+BULK_INGEST_WORKERS = env.int("BULK_INGEST_WORKERS", default=4)
+BULK_INGEST_MAX_FILES = env.int("BULK_INGEST_MAX_FILES", default=2000)
+BULK_INGEST_MAX_FILE_SIZE = env.int("BULK_INGEST_MAX_FILE_SIZE", default=50 * 1024 * 1024)
+
+# Background document previews (first PDF page / downscaled images), rendered in the
+# same worker process pool as text extraction.
+DOCUMENT_PREVIEWS_ENABLED = env.bool("DOCUMENT_PREVIEWS_ENABLED", default=True)
+DOCUMENT_PREVIEW_MAX_SIZE = env.int("DOCUMENT_PREVIEW_MAX_SIZE", default=480)
+DOCUMENT_PREVIEW_FORMAT = env.str("DOCUMENT_PREVIEW_FORMAT", default='WEBP')
+DOCUMENT_PREVIEW_QUALITY = env.int("DOCUMENT_PREVIEW_QUALITY", default=80)
+
+# Shared cache (e.g. CACHE_URL=redis://localhost:6379/1); the default is per-process and
+# sized to hold the signed URLs of a large document listing.
+CACHES = {'default': env.cache_url("CACHE_URL", default='locmemcache://?max_entries=50000')}
+
+# Document facet counts are cached per filter combination and invalidated on every document write.
+# Invalidation only reaches processes sharing the cache, so caching is off by default unless
+# CACHE_URL points at a shared backend (Redis, memcached); with several gunicorn workers on the
+# per-process default, the other workers would serve stale counts until the timeout.
+DOCUMENT_FACETS_CACHE_ENABLED = env.bool(
+    "DOCUMENT_FACETS_CACHE_ENABLED",
+    default=CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache',
+)
+DOCUMENT_FACETS_CACHE_TIMEOUT = env.int("DOCUMENT_FACETS_CACHE_TIMEOUT", default=10 * 60)
+
+# Presigned file URLs are cached per storage key until they are this close to expiring.
+DOCUMENT_URL_CACHE_ENABLED = env.bool("DOCUMENT_URL_CACHE_ENABLED", default=True)
+DOCUMENT_URL_REFRESH_MARGIN_SECONDS = env.int("DOCUMENT_URL_REFRESH_MARGIN_SECONDS", default=5 * 60)
+
+# Stored files are deleted through an outbox drained in the background, in batches of at
+# most 1000 keys (the S3 DeleteObjects limit), retrying failures with exponential backoff.
+STORAGE_DELETION_DRAIN_ON_COMMIT = env.bool("STORAGE_DELETION_DRAIN_ON_COMMIT", default=True)
+STORAGE_DELETION_BATCH_SIZE = env.int("STORAGE_DELETION_BATCH_SIZE", default=1000)
+STORAGE_DELETION_MAX_ATTEMPTS = env.int("STORAGE_DELETION_MAX_ATTEMPTS", default=10)
+STORAGE_DELETION_RETRY_SECONDS = env.int("STORAGE_DELETION_RETRY_SECONDS", default=60)
+STORAGE_DELETION_LEASE_SECONDS = env.int("STORAGE_DELETION_LEASE_SECONDS", default=5 * 60)
+# Stored objects without a Document row are reaped once they are at least this old.
+STORAGE_ORPHAN_MIN_AGE_SECONDS = env.int("STORAGE_ORPHAN_MIN_AGE_SECONDS", default=24 * 60 * 60)
+
+# At-rest compression: uploads of these formats are stored gzip-compressed and served with
+# Content-Encoding: gzip. Already-compressed formats (PDF, images, DOCX) are never listed.
+DOCUMENT_COMPRESSION_ENABLED = env.bool("DOCUMENT_COMPRESSION_ENABLED", default=True)
+DOCUMENT_COMPRESSION_CONTENT_TYPES = env.list("DOCUMENT_COMPRESSION_CONTENT_TYPES", default=['text/plain'])
+DOCUMENT_COMPRESSION_LEVEL = env.int("DOCUMENT_COMPRESSION_LEVEL", default=6)
+DOCUMENT_COMPRESSION_MIN_SIZE = env.int("DOCUMENT_COMPRESSION_MIN_SIZE", default=1024)
+
+# Scanned uploads: JPEG/PNG uploads are re-encoded in the background without EXIF metadata and
+# downscaled so that a photographed page is at most DOCUMENT_IMAGE_DPI (its long edge taken as
+# DOCUMENT_IMAGE_PAGE_INCHES, A4); several page images uploaded together are stitched into a PDF.
+DOCUMENT_IMAGE_PROCESSING_ENABLED = env.bool("DOCUMENT_IMAGE_PROCESSING_ENABLED", default=True)
+DOCUMENT_IMAGE_DPI = env.int("DOCUMENT_IMAGE_DPI", default=150)
+DOCUMENT_IMAGE_PAGE_INCHES = env.float("DOCUMENT_IMAGE_PAGE_INCHES", default=11.69)
+DOCUMENT_IMAGE_JPEG_QUALITY = env.int("DOCUMENT_IMAGE_JPEG_QUALITY", default=75)
+DOCUMENT_SCAN_MAX_PAGES = env.int("DOCUMENT_SCAN_MAX_PAGES", default=50)
+DOCUMENT_SCAN_MAX_PAGE_SIZE = env.int("DOCUMENT_SCAN_MAX_PAGE_SIZE", default=20 * 1024 * 1024)
+# What happens to uploaded originals once processed: 'keep' retains them, 'discard' deletes them.
+DOCUMENT_ORIGINALS_POLICY = env.str("DOCUMENT_ORIGINALS_POLICY", default='keep')
+
+# Catalog export: rows fetched per database round trip (and encoded per streamed chunk).
+DOCUMENT_EXPORT_CHUNK_SIZE = env.int("DOCUMENT_EXPORT_CHUNK_SIZE", default=2000)
+
+# ZIP bundles of approved papers, streamed on the fly.
+DOCUMENT_BUNDLE_MAX_FILES = env.int("DOCUMENT_BUNDLE_MAX_FILES", default=200)
+
+# Write-behind view/download counters: increments accumulate in memory ('memory': per process,
+# 'cache': the shared cache) and are written in batches every DOCUMENT_COUNTERS_FLUSH_SECONDS
+# (0 disables the background flusher). A crash loses at most one interval of counts.
+DOCUMENT_COUNTERS_ENABLED = env.bool("DOCUMENT_COUNTERS_ENABLED", default=True)
+DOCUMENT_COUNTERS_BACKEND = env.str("DOCUMENT_COUNTERS_BACKEND", default='memory')
+DOCUMENT_COUNTERS_FLUSH_SECONDS = env.int("DOCUMENT_COUNTERS_FLUSH_SECONDS", default=10)
+DOCUMENT_COUNTERS_BATCH_SIZE = env.int("DOCUMENT_COUNTERS_BATCH_SIZE", default=500)
+
+# Trending documents: views and downloads (weighted) decay with a half-life of
+# DOCUMENT_TRENDING_HALF_LIFE_HOURS. The rollup is refreshed from the counters by
+# `update_trending_scores` (cron), or every DOCUMENT_TRENDING_REFRESH_SECONDS with its --loop option.
+DOCUMENT_TRENDING_HALF_LIFE_HOURS = env.float("DOCUMENT_TRENDING_HALF_LIFE_HOURS", default=24.0)
+DOCUMENT_TRENDING_VIEW_WEIGHT = env.float("DOCUMENT_TRENDING_VIEW_WEIGHT", default=1.0)
+DOCUMENT_TRENDING_DOWNLOAD_WEIGHT = env.float("DOCUMENT_TRENDING_DOWNLOAD_WEIGHT", default=3.0)
+DOCUMENT_TRENDING_MIN_SCORE = env.float("DOCUMENT_TRENDING_MIN_SCORE", default=0.05)
+DOCUMENT_TRENDING_REFRESH_SECONDS = env.int("DOCUMENT_TRENDING_REFRESH_SECONDS", default=60)
+DOCUMENT_TRENDING_CACHE_TIMEOUT = env.int("DOCUMENT_TRENDING_CACHE_TIMEOUT", default=60)
+
+# Review queue: claimed pending documents return to the queue if not reviewed within the lease.
+DOCUMENT_REVIEW_LEASE_SECONDS = env.int("DOCUMENT_REVIEW_LEASE_SECONDS", default=15 * 60)
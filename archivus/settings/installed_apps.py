@@ -15,6 +15,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist',
     'drf_yasg',
     'storages',
+    'django_filters',
 
     # Local apps
     'core',
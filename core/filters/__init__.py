@@ -0,0 +1 @@
+from .document_filters import *
\ No newline at end of file
@@ -0,0 +1,23 @@
+from django_filters import rest_framework as filters
+
+from core.models import Document
+from core.models.base import SemesterNumber
+
+
+class DocumentFilter(filters.FilterSet):
+    """
+    Server-side filters for document listings.
+    Every combination exposed here is backed by one of the composite indexes
+    declared on `Document.Meta.indexes`.
+    """
+    course = filters.NumberFilter(field_name='course_id')
+    academic_year = filters.NumberFilter(field_name='academic_year_id')
+    semester_number = filters.ChoiceFilter(choices=SemesterNumber.choices)
+    doc_type = filters.ChoiceFilter(choices=Document.DocumentType.choices)
+    file_format = filters.CharFilter(field_name='file_format')
+    # Exposed as ?created_at_after=YYYY-MM-DD&created_at_before=YYYY-MM-DD
+    created_at = filters.DateFromToRangeFilter(field_name='created_at')
+
+    class Meta:
+        model = Document
+        fields = ['course', 'academic_year', 'semester_number', 'doc_type', 'file_format', 'created_at']
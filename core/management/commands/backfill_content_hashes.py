@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.models import Document
+from core.services.document_service import DocumentService
+from core.utils.content_hashing import hash_stored_file
+from core.utils.workers import create_process_pool
+
+
+class Command(BaseCommand):
+    help = ("Computes SHA-256 content hashes for documents stored before hashing existed, in parallel, "
+            "and flags exact duplicates. Documents that already have a hash are skipped, so an "
+            "interrupted run can simply be started again.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.TEXT_EXTRACTION_WORKERS,
+                            help="Number of hashing worker processes.")
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help="Documents hashed and saved per batch.")
+
+    def handle(self, *args, **options):
+        pending = Document.objects.exclude(file='').filter(content_hash__isnull=True)
+        last_id, hashed, failed, duplicates = 0, 0, 0, 0
+
+        with create_process_pool(options['workers']) as pool:
+            while True:
+                batch = list(pending.filter(id__gt=last_id).order_by('id')
+                             .values_list('id', 'file')[:options['batch_size']])
+                if not batch:
+                    break
+                ids, names = zip(*batch)
+                documents = []
+                for document_id, content_hash, error in pool.map(hash_stored_file, ids, names):
+                    if content_hash is None:
+                        failed += 1
+                        self.stderr.write(f"Could not hash document {document_id}: {error}")
+                        continue
+                    documents.append(Document(id=document_id, content_hash=content_hash))
+
+                Document.objects.bulk_update(documents, ['content_hash'])
+                duplicates += DocumentService.mark_duplicates([document.id for document in documents])
+                hashed += len(documents)
+                last_id = ids[-1]
+                self.stdout.write(f"Hashed {hashed} document(s) (up to ID {last_id}).")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Content hash backfill complete: {hashed} hashed, {duplicates} duplicate(s) flagged, {failed} failed."))
@@ -0,0 +1,78 @@
+import time
+
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import AcademicYear, Document, User
+from core.models.base import DocumentStatus
+from core.services.counter_service import DocumentCounterService
+
+
+class Command(BaseCommand):
+    help = ("Measures document detail-view throughput without view counting, with write-behind counting and "
+            "with one UPDATE per request. Requests go through the full API stack (in-process client) against "
+            "synthetic documents created inside a transaction that is rolled back afterwards. The run is "
+            "single-threaded, so it shows the per-request cost only, not the row-lock waits that per-request "
+            "UPDATEs cause under concurrent traffic to the same documents.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help="Detail requests per mode.")
+        parser.add_argument('--documents', type=int, default=10,
+                            help="Distinct documents the requests are spread over (few = hot rows).")
+
+    def run_requests(self, client, urls, count, after_request=None):
+        started = time.perf_counter()
+        for index in range(count):
+            url, document_id = urls[index % len(urls)]
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"Detail request failed with status {response.status_code}.")
+            if after_request:
+                after_request(document_id)
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        with transaction.atomic():
+            reader = User.objects.create_user(email="benchmark-reader@example.invalid", password=None)
+            group, _ = Group.objects.get_or_create(name='staff')
+            reader.groups.set([group])
+            documents = Document.objects.bulk_create([
+                Document(uploader=reader, file=f"documents/benchmark/{index}.pdf", title=f"Benchmark {index}",
+                         doc_type=Document.DocumentType.NOTES, status=DocumentStatus.APPROVED,
+                         academic_year=AcademicYear.objects.first(), file_format='application/pdf')
+                for index in range(options['documents'])
+            ])
+            urls = [(reverse('document-detail', args=[document.id]), document.id) for document in documents]
+            # A host from ALLOWED_HOSTS, since the test server name is only allowed under the test runner.
+            client = APIClient(SERVER_NAME='localhost')
+            client.force_authenticate(reader)
+            # Warm up URL resolution, serializer construction and connection setup.
+            self.run_requests(client, urls, min(count, 50))
+
+            def update_now(document_id):
+                Document.objects.filter(id=document_id).update(view_count=F('view_count') + 1)
+
+            DocumentCounterService.take_pending()
+            with override_settings(DOCUMENT_COUNTERS_ENABLED=False):
+                disabled = self.run_requests(client, urls, count)
+                direct = self.run_requests(client, urls, count, after_request=update_now)
+            with override_settings(DOCUMENT_COUNTERS_ENABLED=True, DOCUMENT_COUNTERS_BACKEND='memory',
+                                   DOCUMENT_COUNTERS_FLUSH_SECONDS=0):
+                write_behind = self.run_requests(client, urls, count)
+                started = time.perf_counter()
+                DocumentCounterService.flush()
+                flush = time.perf_counter() - started
+
+            self.stdout.write(f"{'mode':<22}  {'requests/s':>10}  {'ms/request':>10}")
+            for mode, elapsed in (("no counting", disabled), ("UPDATE per request", direct),
+                                  ("write-behind", write_behind)):
+                self.stdout.write(f"{mode:<22}  {count / elapsed:>10.0f}  {elapsed / count * 1000:>10.3f}")
+            self.stdout.write(f"write-behind flush of {count} views over {len(documents)} document(s): "
+                              f"{flush * 1000:.1f} ms")
+            transaction.set_rollback(True)
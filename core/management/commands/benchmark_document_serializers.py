@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import AcademicYear, Course, DegreeLevel, Document, Program, User
+from core.serializers.document_serializers import DocumentRetrieveSerializer, DocumentValuesSerializer
+
+
+class Command(BaseCommand):
+    help = ("Times DocumentRetrieveSerializer against the values_list() fast path on synthetic document lists. "
+            "The rows are created inside a transaction that is rolled back afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000],
+                            help="List sizes to benchmark.")
+        parser.add_argument('--repeat', type=int, default=3,
+                            help="Runs per list size; the best time is reported.")
+
+    def best_time(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def create_documents(self, count, existing):
+        uploader = existing['uploader']
+        Document.objects.bulk_create([
+            Document(uploader=uploader, file=f"documents/benchmark/{existing['created'] + index}.pdf",
+                     title=f"Benchmark document {existing['created'] + index}", doc_type=Document.DocumentType.NOTES,
+                     course=existing['course'], academic_year=existing['academic_year'], semester_number='1',
+                     file_format='application/pdf', content_hash=f"{existing['created'] + index:064x}")
+            for index in range(count)
+        ], batch_size=2000)
+        existing['created'] += count
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            degree_level, _ = DegreeLevel.objects.get_or_create(code=DegreeLevel.Code.UG,
+                                                                defaults={'name': "Undergraduate"})
+            program = Program.objects.create(name="Benchmark", code="BENCH", degree_level=degree_level)
+            existing = {
+                'uploader': User.objects.create_user(email="benchmark@example.invalid", password=None),
+                'course': Course.objects.create(program=program, code="BENCH101", name="Benchmark"),
+                'academic_year': AcademicYear.objects.first(),
+                'created': 0,
+            }
+
+            self.stdout.write(f"{'rows':>8}  {'DRF serializer':>15}  {'values path':>12}  {'speedup':>8}")
+            for rows in sorted(options['rows']):
+                self.create_documents(rows - existing['created'], existing)
+                queryset = Document.objects.filter(uploader=existing['uploader']).order_by('-created_at', '-id')
+
+                drf_time = self.best_time(options['repeat'], lambda: DocumentRetrieveSerializer(
+                    queryset.select_related('course', 'academic_year', 'uploader'), many=True).data)
+                fast = DocumentValuesSerializer()
+                fast_time = self.best_time(options['repeat'], lambda: fast.serialize(fast.get_rows(queryset)))
+                self.stdout.write(f"{rows:>8}  {drf_time:>14.3f}s  {fast_time:>11.3f}s  {drf_time / fast_time:>7.1f}x")
+
+            transaction.set_rollback(True)
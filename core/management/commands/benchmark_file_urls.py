@@ -0,0 +1,68 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from core.models import AcademicYear, Document, User
+from core.serializers.document_serializers import DocumentValuesSerializer
+from core.services.file_url_service import FileUrlService
+
+
+class Command(BaseCommand):
+    help = ("Times list serialization with presigned file URLs, with and without the URL cache. "
+            "Uses a private-bucket S3 storage (URLs are signed locally; no requests are sent) and "
+            "synthetic documents created inside a transaction that is rolled back afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000],
+                            help="List sizes to benchmark.")
+
+    def timed(self, serializer, queryset):
+        started = time.perf_counter()
+        serializer.serialize(serializer.get_rows(queryset))
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        storage = S3Boto3Storage(bucket_name='archivus-benchmark', access_key='benchmark', secret_key='benchmark',
+                                 region_name='us-east-1', querystring_auth=True, querystring_expire=3600)
+        file_fields = [Document._meta.get_field(name) for name in ('file', 'preview')]
+        original_storages = [field.storage for field in file_fields]
+
+        with transaction.atomic():
+            uploader = User.objects.create_user(email="benchmark@example.invalid", password=None)
+            academic_year = AcademicYear.objects.first()
+            created = 0
+            try:
+                for field in file_fields:
+                    field.storage = storage
+                # The first signature creates the boto3 client; keep that out of the timings.
+                storage.url('documents/benchmark/warm-up.pdf')
+                self.stdout.write(f"{'rows':>8}  {'uncached':>9}  {'cold cache':>10}  {'warm cache':>10}  "
+                                  f"{'speedup':>8}  hits/misses")
+                for rows in sorted(options['rows']):
+                    Document.objects.bulk_create([
+                        Document(uploader=uploader, file=f"documents/benchmark/{index}.pdf",
+                                 preview=f"documents/benchmark/{index}.preview.webp", title=f"Benchmark {index}",
+                                 doc_type=Document.DocumentType.NOTES, academic_year=academic_year)
+                        for index in range(created, rows)
+                    ], batch_size=2000)
+                    created = max(created, rows)
+                    queryset = Document.objects.filter(uploader=uploader).order_by('id')
+                    serializer = DocumentValuesSerializer(fields=['id', 'title', 'file_url', 'preview_url'])
+
+                    with override_settings(DOCUMENT_URL_CACHE_ENABLED=False):
+                        uncached = self.timed(serializer, queryset)
+                    cache.clear()
+                    FileUrlService.reset_stats()
+                    cold = self.timed(serializer, queryset)
+                    warm = self.timed(serializer, queryset)
+                    stats = FileUrlService.get_stats()
+                    self.stdout.write(f"{rows:>8}  {uncached:>8.3f}s  {cold:>9.3f}s  {warm:>9.3f}s  "
+                                      f"{uncached / warm:>7.1f}x  {stats['hits']}/{stats['misses']}")
+            finally:
+                for field, original in zip(file_fields, original_storages):
+                    field.storage = original
+                transaction.set_rollback(True)
@@ -0,0 +1,89 @@
+import math
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import AcademicYear, Course, DegreeLevel, Document, DocumentTrendingScore, Program, User
+from core.models.base import DocumentStatus
+from core.services.trending_service import TrendingService
+
+
+class Command(BaseCommand):
+    help = ("Times the trending top-K queries and a rollup refresh on synthetic documents (spread over several "
+            "programs and courses) created inside a transaction that is rolled back afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=100000, help="Documents with trending scores.")
+        parser.add_argument('--programs', type=int, default=20)
+        parser.add_argument('--courses-per-program', type=int, default=40)
+        parser.add_argument('--limit', type=int, default=20, help="K, the number of documents returned.")
+        parser.add_argument('--active', type=int, default=5000,
+                            help="Documents with new activity for the refresh timing.")
+        parser.add_argument('--repeat', type=int, default=20, help="Runs per query; the best time is reported.")
+
+    def best_time(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        with transaction.atomic():
+            degree_level, _ = DegreeLevel.objects.get_or_create(code=DegreeLevel.Code.UG,
+                                                                defaults={'name': "Undergraduate"})
+            uploader = User.objects.create_user(email="benchmark@example.invalid", password=None)
+            academic_year = AcademicYear.objects.first()
+            programs = Program.objects.bulk_create([
+                Program(name=f"Benchmark {index}", code=f"BENCH{index}", degree_level=degree_level)
+                for index in range(options['programs'])
+            ])
+            courses = Course.objects.bulk_create([
+                Course(program=program, code=f"B{index}", name=f"Benchmark {index}")
+                for program in programs for index in range(options['courses_per_program'])
+            ])
+            documents = Document.objects.bulk_create([
+                Document(uploader=uploader, file=f"documents/benchmark/{index}.pdf", title=f"Benchmark {index}",
+                         doc_type=Document.DocumentType.NOTES, status=DocumentStatus.APPROVED,
+                         course=courses[index % len(courses)], academic_year=academic_year,
+                         view_count=rng.randint(0, 500), download_count=rng.randint(0, 100))
+                for index in range(options['documents'])
+            ], batch_size=2000)
+
+            # Scores as if the activity had happened at random moments over the last two weeks.
+            offset = TrendingService.get_offset()
+            DocumentTrendingScore.objects.bulk_create([
+                DocumentTrendingScore(
+                    document_id=document.id, approved=True, course_id=document.course_id,
+                    program_id=document.course.program_id,
+                    log_score=math.log(1 + document.view_count + 3 * document.download_count) + offset
+                    - rng.uniform(0, 14) * math.log(2),
+                    views_seen=document.view_count, downloads_seen=document.download_count)
+                for document in documents
+            ], batch_size=2000)
+
+            limit = options['limit']
+            queries = [
+                ("all programs", {}),
+                ("one program", {'program_id': programs[0].id}),
+                ("one course", {'course_id': courses[0].id}),
+            ]
+            self.stdout.write(f"top-{limit} over {len(documents)} scored documents (best of {options['repeat']}):")
+            for label, selection in queries:
+                elapsed = self.best_time(options['repeat'],
+                                         lambda: TrendingService.get_top(limit=limit, **selection))
+                self.stdout.write(f"  {label:<14} {elapsed * 1000:>8.2f} ms")
+
+            active = rng.sample(documents, min(options['active'], len(documents)))
+            for document in active:
+                document.view_count += rng.randint(1, 20)
+            Document.objects.bulk_update(active, ['view_count'], batch_size=2000)
+            started = time.perf_counter()
+            updated = TrendingService.refresh()
+            self.stdout.write(f"refresh of {updated} active document(s): "
+                              f"{(time.perf_counter() - started) * 1000:.1f} ms")
+            transaction.set_rollback(True)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.services.document_service import DocumentService
+
+
+class Command(BaseCommand):
+    help = "Reports how many bytes at-rest compression saves across the stored documents."
+
+    def handle(self, *args, **options):
+        stats = DocumentService.get_compression_stats()
+        ratio = stats['stored_bytes'] / stats['original_bytes'] if stats['original_bytes'] else 1
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['objects']} compressed object(s): {stats['original_bytes']} -> {stats['stored_bytes']} bytes "
+            f"({stats['saved_bytes']} saved, {ratio:.1%} of original size)."))
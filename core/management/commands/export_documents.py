@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.filters.document_filters import DocumentFilter
+from core.services.document_service import DocumentService
+from core.services.export_service import EXPORT_FORMATS, DocumentExportService
+
+# Applied as queryset filters, like the list endpoint does for admins; everything else goes through DocumentFilter.
+DIRECT_FILTERS = ('status', 'uploader_id')
+
+
+class Command(BaseCommand):
+    help = ("Streams the document catalog as NDJSON or CSV to a file or stdout, in constant memory. "
+            "Filters are the document list's query parameters, e.g. --filter course=3 --filter status=approved.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='ndjson', dest='export_format')
+        parser.add_argument('--output', default='-', help="File to write; '-' (the default) writes to stdout.")
+        parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE',
+                            help="A document list filter; repeat for several.")
+        parser.add_argument('--chunk-size', type=int, default=settings.DOCUMENT_EXPORT_CHUNK_SIZE,
+                            help="Rows fetched from the database at a time.")
+
+    def handle(self, *args, **options):
+        filters = {}
+        for item in options['filter']:
+            name, separator, value = item.partition('=')
+            if not separator:
+                raise CommandError(f"Filters must look like NAME=VALUE, got '{item}'.")
+            filters[name.strip()] = value.strip()
+        filter_kwargs = {name: filters.pop(name) for name in DIRECT_FILTERS if name in filters}
+
+        filterset = DocumentFilter(filters, queryset=DocumentService.get_all_documents(filter_kwargs=filter_kwargs))
+        if not filterset.is_valid():
+            raise CommandError(f"Invalid filters: {dict(filterset.errors)}")
+
+        chunks = DocumentExportService.stream(filterset.qs, options['export_format'], options['chunk_size'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Exported the catalog to {options['output']}."))
@@ -0,0 +1,67 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.models import Document, DocumentContent
+from core.services.extraction_service import TextExtractionService
+from core.utils.workers import create_process_pool
+
+
+class Command(BaseCommand):
+    help = ("Backfills extracted text for existing documents in parallel. Progress is checkpointed "
+            "after every batch so an interrupted run resumes where it stopped.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.TEXT_EXTRACTION_WORKERS,
+                            help="Number of extraction worker processes.")
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help="Documents per batch; the checkpoint advances once per batch.")
+        parser.add_argument('--checkpoint', default='text_extraction.checkpoint.json',
+                            help="Path of the JSON checkpoint file.")
+        parser.add_argument('--restart', action='store_true',
+                            help="Ignore any existing checkpoint and start from the first document.")
+        parser.add_argument('--retry-failed', action='store_true',
+                            help="Also reprocess documents whose previous extraction failed.")
+
+    def handle(self, *args, **options):
+        checkpoint_path = options['checkpoint']
+        checkpoint = {'last_id': 0, 'processed': 0}
+        if not options['restart'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint_file:
+                checkpoint.update(json.load(checkpoint_file))
+            self.stdout.write(f"Resuming after document ID {checkpoint['last_id']}.")
+
+        done_statuses = [DocumentContent.ExtractionStatus.DONE, DocumentContent.ExtractionStatus.UNSUPPORTED]
+        if not options['retry_failed']:
+            done_statuses.append(DocumentContent.ExtractionStatus.FAILED)
+        pending = Document.objects.exclude(file='').filter(
+            Q(content__isnull=True) | ~Q(content__status__in=done_statuses)
+        )
+
+        totals = {}
+        with create_process_pool(options['workers']) as pool:
+            while True:
+                batch = list(pending.filter(id__gt=checkpoint['last_id'])
+                             .order_by('id').values_list('id', flat=True)[:options['batch_size']])
+                if not batch:
+                    break
+                summary = TextExtractionService.process_documents(batch, executor=pool)
+                for extraction_status, count in summary.items():
+                    totals[extraction_status] = totals.get(extraction_status, 0) + count
+
+                checkpoint['last_id'] = batch[-1]
+                checkpoint['processed'] += len(batch)
+                self.write_checkpoint(checkpoint_path, checkpoint)
+                self.stdout.write(f"Processed {checkpoint['processed']} document(s) (up to ID {batch[-1]}): {summary}")
+
+        self.stdout.write(self.style.SUCCESS(f"Text extraction backfill complete: {totals}"))
+
+    def write_checkpoint(self, path, checkpoint):
+        # Write-then-rename so a crash never leaves a truncated checkpoint behind.
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temporary_path, path)
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.models import Document
+from core.services.preview_service import PreviewService
+from core.utils.workers import create_process_pool
+
+
+class Command(BaseCommand):
+    help = "Generates preview images for documents that do not have one yet, in parallel worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.TEXT_EXTRACTION_WORKERS,
+                            help="Number of rendering worker processes.")
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help="Documents rendered and saved per batch.")
+
+    def handle(self, *args, **options):
+        pending = Document.objects.exclude(file='').filter(preview__isnull=True)
+        last_id, totals = 0, {}
+
+        with create_process_pool(options['workers']) as pool:
+            while True:
+                batch = list(pending.filter(id__gt=last_id).order_by('id')
+                             .values_list('id', flat=True)[:options['batch_size']])
+                if not batch:
+                    break
+                summary = PreviewService.process_documents(batch, executor=pool)
+                for outcome, count in summary.items():
+                    totals[outcome] = totals.get(outcome, 0) + count
+                last_id = batch[-1]
+                self.stdout.write(f"Processed documents up to ID {last_id}: {summary}")
+
+        self.stdout.write(self.style.SUCCESS(f"Preview generation complete: {totals}"))
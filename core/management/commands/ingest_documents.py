@@ -0,0 +1,50 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from core.services.bulk_ingest_service import BulkIngestService, IngestError, IngestSource
+
+
+class Command(BaseCommand):
+    help = ("Bulk-ingests documents from a ZIP archive or a folder, using a JSON/CSV manifest that maps "
+            "each file to its title, doc_type, course, academic_year and semester_number.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="Path of a ZIP archive or a directory.")
+        parser.add_argument('--uploader', required=True, help="Email of the staff user the documents are attributed to.")
+        parser.add_argument('--manifest', help="Manifest path; defaults to manifest.json/.csv inside the source.")
+        parser.add_argument('--workers', type=int, default=settings.BULK_INGEST_WORKERS,
+                            help="Number of concurrent storage uploads.")
+        parser.add_argument('--report', help="Write the per-file JSON report to this path.")
+
+    def handle(self, *args, **options):
+        try:
+            uploader = User.objects.get(email=options['uploader'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email '{options['uploader']}'.")
+
+        path = options['source']
+        try:
+            source = IngestSource.from_directory(path) if os.path.isdir(path) else IngestSource.from_zip(path)
+            try:
+                if options['manifest']:
+                    with open(options['manifest'], 'rb') as manifest_file:
+                        rows = BulkIngestService.parse_manifest(manifest_file.read(), options['manifest'])
+                else:
+                    rows = BulkIngestService.find_manifest(source)
+                report = BulkIngestService.ingest(source, rows, uploader, max_workers=options['workers'])
+            finally:
+                source.close()
+        except IngestError as e:
+            raise CommandError(str(e))
+
+        for result in report['results']:
+            if result['status'] != 'created':
+                self.stdout.write(f"{result['status'].upper()}: {result['file']} {result['errors']}")
+        if options['report']:
+            with open(options['report'], 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Bulk ingest complete: {report['summary']}"))
@@ -0,0 +1,106 @@
+import time
+import threading
+from collections import Counter
+
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from core.models import Document, User
+from core.models.base import DocumentStatus
+from core.services.document_service import DocumentService
+from core.services.review_queue_service import ReviewQueueService
+
+
+class Command(BaseCommand):
+    help = ("Load-tests the review queue: for each reviewer count, that many threads (one database connection "
+            "each) claim and approve pending documents until the queue is empty, and the run reports throughput, "
+            "claim latency and any document handed out twice. The documents and reviewers are committed to the "
+            "configured database and deleted afterwards. SKIP LOCKED is only used on PostgreSQL; on SQLite all "
+            "writers share one lock, so throughput does not scale there, but claims must still never overlap.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reviewers', type=int, nargs='+', default=[1, 2, 4, 8],
+                            help="Concurrent reviewer counts to test.")
+        parser.add_argument('--documents', type=int, default=2000, help="Pending documents per run.")
+        parser.add_argument('--batch', type=int, default=10, help="Documents claimed per request.")
+
+    def review(self, reviewer, batch, results):
+        claims, latencies, errors = [], [], 0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    document_ids, _ = ReviewQueueService.claim_next(reviewer, batch)
+                except OperationalError:
+                    # SQLite's busy timeout ran out under write contention; try again.
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                if not document_ids:
+                    break
+                claims.extend(document_ids)
+                while True:
+                    try:
+                        DocumentService.bulk_change_status(
+                            [(document_id, DocumentStatus.APPROVED) for document_id in document_ids], reviewer)
+                        break
+                    except OperationalError:
+                        errors += 1
+        finally:
+            connection.close()
+        results.append((claims, latencies, errors))
+
+    def run(self, reviewers, documents, batch):
+        uploader = reviewers[0]
+        created = Document.objects.bulk_create([
+            Document(uploader=uploader, file=f"documents/loadtest/{index}.pdf", title=f"Load test {index}",
+                     doc_type=Document.DocumentType.NOTES, status=DocumentStatus.PENDING)
+            for index in range(documents)
+        ], batch_size=2000)
+        created_ids = [document.id for document in created]
+        try:
+            results = []
+            threads = [threading.Thread(target=self.review, args=(reviewer, batch, results)) for reviewer in reviewers]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            claimed = Counter(document_id for claims, _, _ in results for document_id in claims)
+            latencies = sorted(latency for _, thread_latencies, _ in results for latency in thread_latencies)
+            return {
+                'elapsed': elapsed,
+                'reviewed': len(claimed),
+                'duplicates': sum(count - 1 for count in claimed.values()),
+                'left': Document.objects.filter(id__in=created_ids, status=DocumentStatus.PENDING).count(),
+                'p50': latencies[len(latencies) // 2] if latencies else 0,
+                'p95': latencies[int(len(latencies) * 0.95)] if latencies else 0,
+                'errors': sum(errors for _, _, errors in results),
+            }
+        finally:
+            Document.objects.filter(id__in=created_ids).delete()
+
+    def handle(self, *args, **options):
+        skip_locked = connection.features.has_select_for_update_skip_locked
+        self.stdout.write(f"Database: {connection.vendor} (SKIP LOCKED {'on' if skip_locked else 'unavailable'}); "
+                          f"{options['documents']} documents, claims of {options['batch']}.")
+        group, _ = Group.objects.get_or_create(name='staff')
+        reviewers = []
+        for index in range(max(options['reviewers'])):
+            reviewer = User.objects.create_user(email=f"loadtest-reviewer-{index}@example.invalid", password=None)
+            reviewer.groups.set([group])
+            reviewers.append(reviewer)
+        try:
+            self.stdout.write(f"{'reviewers':>9}  {'docs/s':>8}  {'claim p50':>9}  {'claim p95':>9}  "
+                              f"{'duplicates':>10}  {'left':>5}  {'retries':>7}")
+            for count in sorted(options['reviewers']):
+                result = self.run(reviewers[:count], options['documents'], options['batch'])
+                self.stdout.write(
+                    f"{count:>9}  {result['reviewed'] / result['elapsed']:>8.0f}  {result['p50'] * 1000:>7.1f}ms  "
+                    f"{result['p95'] * 1000:>7.1f}ms  {result['duplicates']:>10}  {result['left']:>5}  "
+                    f"{result['errors']:>7}")
+        finally:
+            User.objects.filter(id__in=[reviewer.id for reviewer in reviewers]).delete()
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.models import Document
+from core.services.image_processing_service import IMAGE_MIME_TYPES, ImageProcessingService
+from core.utils.workers import create_process_pool
+
+ProcessingStatus = Document.ImageProcessingStatus
+
+
+class Command(BaseCommand):
+    help = ("Re-encodes image uploads and stitches scans whose processing is pending or failed, "
+            "in parallel worker processes. With --backfill, images uploaded before processing existed are included.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.TEXT_EXTRACTION_WORKERS,
+                            help="Number of image worker processes.")
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help="Documents processed and saved per batch.")
+        parser.add_argument('--backfill', action='store_true',
+                            help="First mark unprocessed JPEG/PNG documents as pending.")
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            marked = (Document.objects.filter(file_format__in=IMAGE_MIME_TYPES, image_processing_status=ProcessingStatus.NONE)
+                      .exclude(file='').update(image_processing_status=ProcessingStatus.PENDING))
+            self.stdout.write(f"Marked {marked} image document(s) for processing.")
+
+        pending = Document.objects.filter(image_processing_status__in=[ProcessingStatus.PENDING, ProcessingStatus.FAILED])
+        last_id, totals = 0, {}
+
+        with create_process_pool(options['workers']) as pool:
+            while True:
+                batch = list(pending.filter(id__gt=last_id).order_by('id')
+                             .values_list('id', flat=True)[:options['batch_size']])
+                if not batch:
+                    break
+                summary = ImageProcessingService.process_documents(batch, executor=pool)
+                ImageProcessingService.run_follow_ups(batch, executor=pool)
+                for outcome, count in summary.items():
+                    totals[outcome] = totals.get(outcome, 0) + count
+                last_id = batch[-1]
+                self.stdout.write(f"Processed documents up to ID {last_id}: {summary}")
+
+        self.stdout.write(self.style.SUCCESS(f"Image processing complete: {totals}"))
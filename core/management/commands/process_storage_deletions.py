@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.services.storage_deletion_service import StorageDeletionService
+
+
+class Command(BaseCommand):
+    help = ("Deletes the stored files queued in the storage deletion outbox, in batches. "
+            "Run periodically (e.g. cron) to retry failures and catch anything a web worker did not drain. "
+            "Files that failed STORAGE_DELETION_MAX_ATTEMPTS times are reported; --retry-exhausted requeues them.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.STORAGE_DELETION_BATCH_SIZE,
+                            help="Keys deleted per storage request (at most 1000).")
+        parser.add_argument('--retry-exhausted', action='store_true',
+                            help="Give files that ran out of attempts a fresh attempt budget first.")
+
+    def handle(self, *args, **options):
+        if options['retry_exhausted']:
+            self.stdout.write(f"Requeued {StorageDeletionService.retry_exhausted()} exhausted deletion(s).")
+        totals = StorageDeletionService.drain(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Storage deletion complete: {totals}"))
+
+        exhausted = StorageDeletionService.get_exhausted().order_by('name')
+        count = exhausted.count()
+        if count:
+            self.stdout.write(self.style.WARNING(
+                f"{count} file(s) ran out of attempts and are no longer retried (use --retry-exhausted):"))
+            for entry in exhausted[:20]:
+                self.stdout.write(f"  {entry.name}: {entry.last_error}")
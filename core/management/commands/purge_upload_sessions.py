@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services.chunked_upload_service import ChunkedUploadService
+
+
+class Command(BaseCommand):
+    help = "Deletes expired resumable upload sessions and their temporary chunk files. Run periodically (e.g. cron)."
+
+    def handle(self, *args, **options):
+        purged = ChunkedUploadService.purge_expired_sessions()
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} expired upload session(s)."))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.services.storage_deletion_service import StorageDeletionService
+
+
+class Command(BaseCommand):
+    help = ("Finds stored files that no document references and deletes them in bulk. "
+            "Run periodically (e.g. daily).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='documents/',
+                            help="Only scan storage keys under this prefix.")
+        parser.add_argument('--min-age-hours', type=float, default=settings.STORAGE_ORPHAN_MIN_AGE_SECONDS / 3600,
+                            help="Leave files younger than this alone.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report how many orphans were found.")
+
+    def handle(self, *args, **options):
+        result = StorageDeletionService.reap_orphans(
+            prefix=options['prefix'], min_age=timedelta(hours=options['min_age_hours']), dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f"Scanned {result['scanned']} file(s); {result['orphaned']} orphan(s) would be deleted.")
+            return
+        totals = StorageDeletionService.drain()
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {result['scanned']} file(s) and queued {result['orphaned']} orphan(s); deletion: {totals}"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.services.search_service import SearchService
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the document full-text search index (tsvector on PostgreSQL, FTS5 on SQLite)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Number of documents reindexed per batch.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = SearchService.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {total} document(s)."))
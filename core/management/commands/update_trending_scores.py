@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.services.trending_service import TrendingService
+
+
+class Command(BaseCommand):
+    help = ("Folds document view/download activity recorded since the last run into the trending rollup. "
+            "Run it periodically (e.g. every minute from cron), or once with --loop as a dedicated scheduler "
+            "that refreshes every DOCUMENT_TRENDING_REFRESH_SECONDS.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep running, refreshing every DOCUMENT_TRENDING_REFRESH_SECONDS.")
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            try:
+                updated = TrendingService.refresh()
+                self.stdout.write(self.style.SUCCESS(f"Updated {updated} trending score(s)."))
+            except Exception as e:
+                if not options['loop']:
+                    raise
+                self.stderr.write(f"Refreshing trending scores failed: {e}")
+            if not options['loop']:
+                return
+            # Do not hold a connection open between refreshes.
+            connection.close()
+            interval = max(1, settings.DOCUMENT_TRENDING_REFRESH_SECONDS)
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_document_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status', 'course', 'academic_year', 'semester_number'], name='doc_status_course_year_sem_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['uploader', 'status', 'created_at'], name='doc_upl_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status', 'doc_type', 'created_at'], name='doc_status_type_created_idx'),
+        ),
+    ]
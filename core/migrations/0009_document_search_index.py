@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("ALTER TABLE core_document ADD COLUMN search_vector tsvector")
+        schema_editor.execute(
+            "CREATE INDEX document_search_vector_gin ON core_document USING GIN (search_vector)"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE core_document_fts USING fts5("
+            "title, course_code, course_name, program_name, doc_type, "
+            "tokenize = 'porter unicode61')"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS document_search_vector_gin")
+        schema_editor.execute("ALTER TABLE core_document DROP COLUMN IF EXISTS search_vector")
+    elif vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS core_document_fts")
+
+
+def populate_search_index(apps, schema_editor):
+    # Imported lazily: the service works on the live models, which match this state.
+    from core.services.search_service import SearchService
+    SearchService.rebuild_index()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_document_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text="SHA-256 of the file's bytes; identical files share one stored object.", max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, help_text='Earliest document with identical file contents, if any.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='core.document'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['content_hash'], name='doc_content_hash_idx'),
+        ),
+    ]
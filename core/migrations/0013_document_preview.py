@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_document_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='preview',
+            field=models.FileField(blank=True, help_text='Small first-page / downscaled preview image, generated in the background.', max_length=255, null=True, upload_to=''),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_document_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorageDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(help_text='Storage key of the object to delete.', max_length=255)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Not processed before this time (retry backoff / worker lease).')),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'abstract': False,
+                'indexes': [models.Index(fields=['available_at'], name='storage_deletion_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_storage_deletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='file_encoding',
+            field=models.CharField(blank=True, default='', help_text='Content coding the file is stored with (e.g. gzip); empty if stored as uploaded.', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='file_size',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Size of the uploaded file in bytes.', null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='stored_size',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Size of the stored object in bytes, after any compression.', null=True),
+        ),
+    ]
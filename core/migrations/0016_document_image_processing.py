@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_document_file_encoding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentOriginal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('file', models.FileField(max_length=255, upload_to='')),
+                ('file_format', models.CharField(blank=True, default='', max_length=100)),
+                ('file_size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('position', models.PositiveSmallIntegerField(default=0, help_text='Page number (from 0) within a scan.')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='image_processing_status',
+            field=models.CharField(blank=True, choices=[('', 'Not Applicable'), ('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='', help_text='Background re-encoding of image uploads / stitching of scanned pages into a PDF.', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['image_processing_status'], name='doc_image_processing_idx'),
+        ),
+        migrations.AddField(
+            model_name='documentoriginal',
+            name='document',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='originals', to='core.document'),
+        ),
+        migrations.AddConstraint(
+            model_name='documentoriginal',
+            constraint=models.UniqueConstraint(fields=('document', 'position'), name='unique_document_original_position'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_document_image_processing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='download_count',
+            field=models.PositiveBigIntegerField(default=0, help_text="Times the document's file was downloaded."),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='view_count',
+            field=models.PositiveBigIntegerField(default=0, help_text="Times the document's details were viewed."),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_document_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentTrendingScore',
+            fields=[
+                ('document', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='core.document')),
+                ('approved', models.BooleanField(default=False, help_text='Whether the document is approved (and so ranked).')),
+                ('log_score', models.FloatField(blank=True, help_text='ln(weighted activity, each event grown by its age since the epoch); empty until the document has activity while approved.', null=True)),
+                ('views_seen', models.PositiveBigIntegerField(default=0, help_text='Document view_count at the last refresh.')),
+                ('downloads_seen', models.PositiveBigIntegerField(default=0, help_text='Document download_count at the last refresh.')),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.course')),
+                ('program', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.program')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('approved', True)), fields=['-log_score', 'document'], name='trending_score_idx'), models.Index(condition=models.Q(('approved', True)), fields=['program', '-log_score', 'document'], name='trending_program_score_idx'), models.Index(condition=models.Q(('approved', True)), fields=['course', '-log_score', 'document'], name='trending_course_score_idx')],
+            },
+        ),
+    ]
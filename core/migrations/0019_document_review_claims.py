@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_document_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='review_claim_expires_at',
+            field=models.DateTimeField(blank=True, help_text='When the review claim lapses if no decision is made.', null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='review_claimed_by',
+            field=models.ForeignKey(blank=True, help_text='Reviewer currently working on this pending document.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_claims', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['status', 'created_at', 'id'], name='doc_review_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:03
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_role_names(apps, schema_editor):
+    Group = apps.get_model('auth', 'Group')
+    User = apps.get_model('core', 'User')
+    first_group = Group.objects.filter(user=OuterRef('pk')).order_by('pk').values('name')[:1]
+    User.objects.update(role_name=Coalesce(Subquery(first_group), Value('')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_document_review_claims'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='role_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text="Name of the user's first group (lowest ID); empty without groups.", max_length=150),
+        ),
+        migrations.RunPython(fill_role_names, migrations.RunPython.noop),
+    ]
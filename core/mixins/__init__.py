@@ -1 +1,4 @@
-from .response_mixins import *
\ No newline at end of file
+from .response_mixins import *
+from .document_visibility_mixins import *
+from .dynamic_fields_mixins import *
+from .conditional_mixins import *
\ No newline at end of file
@@ -0,0 +1,46 @@
+import json
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+class ConditionalResponseMixin(object):
+    """
+    A mixin for conditional GETs on API responses whose content depends on who is asking.
+    Validators are weak ETags computed from cheap freshness data (e.g. the latest `updated_at`
+    and a row count) together with the user's role, user ID, full request path and Accept header,
+    so that users, roles and query variants never share validators.
+    """
+    def get_weak_etag(self, request, *freshness):
+        """
+        Builds a weak ETag for the current user and request.
+        :param request: The incoming DRF request.
+        :param freshness: Values that change whenever the represented data changes.
+        """
+        key = [request.user.role, request.user.pk, request.get_full_path(),
+               request.META.get('HTTP_ACCEPT', ''), *freshness]
+        digest = hashlib.sha256(json.dumps(key, default=str).encode('utf-8')).hexdigest()
+        return f'W/"{digest[:32]}"'
+
+    def get_not_modified_response(self, request, etag, last_modified=None):
+        """
+        Returns a 304 (or 412) response if the client's copy is current, else None.
+        :param etag: The validator from `get_weak_etag`.
+        :param last_modified: Datetime to evaluate If-Modified-Since against; only pass it when
+                              every change to the representation also moves it forward.
+        """
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None)
+        if response is not None:
+            self.set_validator_headers(response, etag, last_modified)
+        return response
+
+    def set_validator_headers(self, response, etag, last_modified=None):
+        """Adds the validators to a response; it may be cached by the client only, and must be revalidated."""
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ('Accept', 'Authorization', 'Cookie'))
+        return response
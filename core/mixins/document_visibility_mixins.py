@@ -0,0 +1,60 @@
+import logging
+
+from rest_framework.exceptions import PermissionDenied
+
+from core.models.base import DocumentStatus
+from core.permissions.role_permissions import IsAdminOrStaffUserRole
+
+logger = logging.getLogger(__name__)
+
+class DocumentVisibilityMixin(object):
+    """
+    A mixin that resolves which documents the requesting user is allowed to see.
+    The list filter kwargs and the single-document check are shared by every endpoint
+    that returns documents, so that role-based visibility rules live in one place.
+    """
+    def get_visibility_filter_kwargs(self, request):
+        """
+        Builds the role-based filter kwargs for a document queryset.
+        :param request: The incoming DRF request.
+        :raises PermissionDenied: If a student asks for another user's uploads.
+        """
+        filter_kwargs = {}
+
+        if request.user.role == 'student':
+            filter_kwargs['status'] = DocumentStatus.APPROVED.value
+            if request.query_params.get('my_uploads', 'false').lower() == 'true':
+                filter_kwargs['uploader'] = request.user
+            uploader_id = request.query_params.get('uploader_id')
+            if uploader_id and str(request.user.id) != uploader_id:
+                logger.warning(f"Student {request.user.email} attempted to view documents of uploader ID {uploader_id}.")
+                raise PermissionDenied("Students can only view their own uploads or general approved documents.")
+            elif uploader_id:
+                filter_kwargs['uploader_id'] = request.user.id
+        elif IsAdminOrStaffUserRole().has_permission(request, self):
+            status_param = request.query_params.get('status')
+            if status_param:
+                filter_kwargs['status'] = status_param
+            uploader_id = request.query_params.get('uploader_id')
+            if uploader_id:
+                filter_kwargs['uploader_id'] = uploader_id
+        else:
+            filter_kwargs['status'] = DocumentStatus.APPROVED.value
+
+        return filter_kwargs
+
+    def check_document_access(self, request, document):
+        """
+        Object-level visibility: admins and staff may access any document, students
+        their own uploads and approved documents.
+        :param request: The incoming DRF request.
+        :param document: The document being accessed.
+        :raises PermissionDenied: If the user may not access the document.
+        """
+        if IsAdminOrStaffUserRole().has_permission(request, self):
+            return
+        if request.user.role == 'student' and (document.uploader_id == request.user.id or
+                                               document.status == DocumentStatus.APPROVED.value):
+            return
+        logger.warning(f"User {request.user.email} (Role: {request.user.role}) attempted unauthorized access to document ID {document.id}.")
+        raise PermissionDenied("You do not have permission to access this document.")
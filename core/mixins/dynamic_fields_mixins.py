@@ -0,0 +1,87 @@
+from rest_framework import serializers
+
+
+class DynamicFieldsMixin(object):
+    """
+    A ModelSerializer mixin for sparse fieldsets (`?fields=`) and relation expansion (`?expand=`).
+    - `fields` keeps only the named fields.
+    - `expand` names the relations to nest; every other expandable relation is returned as a bare
+      primary key. Omitting `expand` keeps every relation nested, as before.
+    `optimize_queryset` applies the same selection to the queryset, so unrequested columns are not
+    loaded and unexpanded relations are not joined.
+    Subclasses declare:
+    - `expandable_fields`: {field name: callable returning the collapsed (primary key) field}
+    - `expanded_sources`: {field name: (select_related path, related columns to load or None for all)}
+    - `field_sources`: {field name: model fields it reads}, for fields whose source differs from their name
+    """
+    expandable_fields = {}
+    expanded_sources = {}
+    field_sources = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if expand is not None:
+            for name, collapsed_field in self.expandable_fields.items():
+                if name in self.fields and name not in expand:
+                    self.fields[name] = collapsed_field()
+
+    @staticmethod
+    def parse_field_list(value):
+        """Splits a comma-separated query parameter; None when the parameter is absent."""
+        if value is None:
+            return None
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+    @classmethod
+    def get_field_selection(cls, query_params):
+        """
+        Reads and validates `fields` and `expand` from the query string.
+        :param query_params: The request's query parameters.
+        :returns: A (fields, expand) tuple; either is None when its parameter is absent.
+        :raises ValidationError: If an unknown field or a non-expandable relation is named.
+        """
+        fields = cls.parse_field_list(query_params.get('fields'))
+        expand = cls.parse_field_list(query_params.get('expand'))
+        errors = {}
+        available = list(cls.Meta.fields)
+        if fields is not None:
+            unknown = [name for name in fields if name not in available]
+            if unknown or not fields:
+                errors['fields'] = f"Choose from: {', '.join(available)}."
+        if expand is not None:
+            unknown = [name for name in expand if name not in cls.expandable_fields]
+            if unknown:
+                errors['expand'] = f"Choose from: {', '.join(cls.expandable_fields)}."
+        if errors:
+            raise serializers.ValidationError(errors)
+        return fields, expand
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, expand=None, extra_fields=()):
+        """
+        Restricts the queryset to the columns and joins the selected fields need.
+        :param queryset: Queryset of the serializer's model.
+        :param fields: Selected fields; None selects all.
+        :param expand: Relations to nest; None nests every expandable relation.
+        :param extra_fields: Model fields the caller needs besides the serialized ones
+                             (e.g. the ordering column or fields read by permission checks).
+        """
+        selected = list(cls.Meta.fields) if fields is None else fields
+        expanded = set(cls.expandable_fields) if expand is None else set(expand)
+        only, related = {'pk', *extra_fields}, []
+        for name in selected:
+            if name in cls.expanded_sources and name in expanded:
+                path, columns = cls.expanded_sources[name]
+                related.append(path)
+                only.add(path)
+                only.update(f"{path}__{column}" for column in columns or ())
+            else:
+                only.update(cls.field_sources.get(name, [name]))
+        queryset = queryset.select_related(None)
+        if related:
+            # select_related() with no arguments would follow every foreign key.
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
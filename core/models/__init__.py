@@ -5,5 +5,11 @@ from .semester import Semester
 from .course import Course
 from .user import User
 from .document import Document
+from .document_content import DocumentContent
 from .points_history import PointsHistory
-from .upload_log import UploadLog
\ No newline at end of file
+from .upload_log import UploadLog
+from .upload_session import UploadSession, UploadChunk
+from .storage_deletion import StorageDeletion
+from .document_original import DocumentOriginal
+from .document_trending_score import DocumentTrendingScore
+from .direct_upload import DirectUpload
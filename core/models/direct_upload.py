@@ -0,0 +1,19 @@
+from .base import TimeStampedModel
+from .user import User
+from .document import Document
+
+from django.db import models
+
+class DirectUpload(TimeStampedModel):
+    """
+    Record of a finalized presigned upload. The row is inserted in the same transaction
+    that creates the Document, and the unique key makes finalizing a single claim:
+    a concurrent or retried finalize of the same upload fails on the constraint.
+    """
+    key = models.CharField(max_length=255, unique=True, help_text="Storage key the upload was presigned for.")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='direct_uploads')
+    document = models.ForeignKey(Document, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='direct_uploads')
+
+    def __str__(self):
+        return f"Direct upload {self.key} by {self.user.email}"
@@ -14,6 +14,12 @@ class Document(TimeStampedModel):
         NOTES = 'notes', 'Study Notes'
         OTHER = 'other', 'Other'
 
+    class ImageProcessingStatus(TextChoices):
+        NONE = '', 'Not Applicable'
+        PENDING = 'pending', 'Pending'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
     uploader = models.ForeignKey(User, on_delete=models.CASCADE)
     file = models.FileField(upload_to='documents/')
     title = models.CharField(max_length=200)
@@ -31,6 +37,33 @@ class Document(TimeStampedModel):
 
     status = models.CharField(max_length=20, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
 
+    preview = models.FileField(max_length=255, blank=True, null=True,
+                               help_text="Small first-page / downscaled preview image, generated in the background.")
+
+    content_hash = models.CharField(max_length=64, blank=True, null=True,
+                                    help_text="SHA-256 of the file's bytes; identical files share one stored object.")
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='duplicates',
+                                     help_text="Earliest document with identical file contents, if any.")
+
+    file_encoding = models.CharField(max_length=20, blank=True, default='',
+                                     help_text="Content coding the file is stored with (e.g. gzip); empty if stored as uploaded.")
+    file_size = models.PositiveBigIntegerField(null=True, blank=True, help_text="Size of the uploaded file in bytes.")
+    stored_size = models.PositiveBigIntegerField(null=True, blank=True,
+                                                 help_text="Size of the stored object in bytes, after any compression.")
+    image_processing_status = models.CharField(
+        max_length=20, choices=ImageProcessingStatus.choices, blank=True, default=ImageProcessingStatus.NONE,
+        help_text="Background re-encoding of image uploads / stitching of scanned pages into a PDF.")
+    # Claims taken from the review queue (ReviewQueueService); a claim past its expiry is free again.
+    review_claimed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
+                                          related_name='review_claims',
+                                          help_text="Reviewer currently working on this pending document.")
+    review_claim_expires_at = models.DateTimeField(null=True, blank=True,
+                                                   help_text="When the review claim lapses if no decision is made.")
+    # Written in batches by DocumentCounterService, so they lag by at most one flush interval.
+    view_count = models.PositiveBigIntegerField(default=0, help_text="Times the document's details were viewed.")
+    download_count = models.PositiveBigIntegerField(default=0, help_text="Times the document's file was downloaded.")
+
     def __str__(self):
         year_info = f" {self.academic_year}" if self.academic_year else ""
         sem_info = f" Semester {self.get_semester_number_display()}" if self.semester_number else ""
@@ -42,4 +75,21 @@ class Document(TimeStampedModel):
             ("can_publish_document", "Can publish approved documents"),
             ("can_access_confidential", "Can access confidential documents"),
         ]
-        default_permissions = ('add', 'change', 'delete', 'view',)
\ No newline at end of file
+        default_permissions = ('add', 'change', 'delete', 'view',)
+        indexes = [
+            # Backs the keyset pagination of the document list: (created_at, id) cursors.
+            models.Index(fields=['created_at', 'id'], name='document_created_id_idx'),
+            # Back the catalog filters exposed by core.filters.DocumentFilter.
+            models.Index(fields=['status', 'course', 'academic_year', 'semester_number'],
+                         name='doc_status_course_year_sem_idx'),
+            models.Index(fields=['uploader', 'status', 'created_at'], name='doc_upl_status_created_idx'),
+            models.Index(fields=['status', 'doc_type', 'created_at'], name='doc_status_type_created_idx'),
+            # Exact-duplicate lookups on upload.
+            models.Index(fields=['content_hash'], name='doc_content_hash_idx'),
+            # The review queue: pending documents, oldest first. Partial, so that list queries on
+            # other statuses keep using the filter indexes above.
+            models.Index(fields=['status', 'created_at', 'id'], condition=models.Q(status=DocumentStatus.PENDING),
+                         name='doc_review_queue_idx'),
+            # Retries of unfinished image processing.
+            models.Index(fields=['image_processing_status'], name='doc_image_processing_idx'),
+        ]
\ No newline at end of file
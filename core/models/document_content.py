@@ -0,0 +1,27 @@
+from .base import TimeStampedModel
+from .document import Document
+
+from django.db import models
+from django.db.models import TextChoices
+
+class DocumentContent(TimeStampedModel):
+    class ExtractionStatus(TextChoices):
+        PENDING = 'pending', 'Pending'
+        DONE = 'done', 'Done'
+        UNSUPPORTED = 'unsupported', 'Unsupported Format'
+        FAILED = 'failed', 'Failed'
+
+    document = models.OneToOneField(Document, on_delete=models.CASCADE, primary_key=True,
+                                    related_name='content')
+    text = models.TextField(blank=True, default='')
+    status = models.CharField(max_length=20, choices=ExtractionStatus.choices, default=ExtractionStatus.PENDING)
+    error = models.TextField(blank=True, null=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            models.Index(fields=['status'], name='doc_content_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Content of document {self.document_id} ({self.status})"
@@ -0,0 +1,24 @@
+from .base import TimeStampedModel
+from .document import Document
+
+from django.db import models
+
+class DocumentOriginal(TimeStampedModel):
+    """
+    An uploaded file that a document's stored file was derived from: the full-size image
+    behind a re-encoded JPEG/PNG, or one page image of a scan stitched into a PDF.
+    Kept or discarded after processing according to DOCUMENT_ORIGINALS_POLICY.
+    """
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name='originals')
+    file = models.FileField(max_length=255)
+    file_format = models.CharField(max_length=100, blank=True, default='')
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    position = models.PositiveSmallIntegerField(default=0, help_text="Page number (from 0) within a scan.")
+
+    def __str__(self):
+        return f"Original {self.position} of document {self.document_id}"
+
+    class Meta(TimeStampedModel.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=['document', 'position'], name='unique_document_original_position'),
+        ]
@@ -0,0 +1,38 @@
+from .course import Course
+from .document import Document
+from .program import Program
+
+from django.db import models
+
+class DocumentTrendingScore(models.Model):
+    """
+    Rollup of a document's time-decayed view/download activity, maintained by
+    TrendingService.refresh. The score is stored as the logarithm of the activity decayed
+    to a fixed epoch, so ordering by it ranks documents by their decayed activity at any
+    moment and rows only change when the document has new activity (or a new status or course).
+    """
+    document = models.OneToOneField(Document, on_delete=models.CASCADE, primary_key=True,
+                                    related_name='trending_score')
+    # Copied from the document (and its course) so top-K queries never leave this table's indexes.
+    approved = models.BooleanField(default=False, help_text="Whether the document is approved (and so ranked).")
+    program = models.ForeignKey(Program, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    course = models.ForeignKey(Course, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    log_score = models.FloatField(null=True, blank=True,
+                                  help_text="ln(weighted activity, each event grown by its age since the epoch); "
+                                            "empty until the document has activity while approved.")
+    views_seen = models.PositiveBigIntegerField(default=0, help_text="Document view_count at the last refresh.")
+    downloads_seen = models.PositiveBigIntegerField(default=0, help_text="Document download_count at the last refresh.")
+
+    def __str__(self):
+        return f"Trending score of document {self.document_id}"
+
+    class Meta:
+        indexes = [
+            # Partial indexes: only approved documents are ever ranked.
+            models.Index(fields=['-log_score', 'document'], condition=models.Q(approved=True),
+                         name='trending_score_idx'),
+            models.Index(fields=['program', '-log_score', 'document'], condition=models.Q(approved=True),
+                         name='trending_program_score_idx'),
+            models.Index(fields=['course', '-log_score', 'document'], condition=models.Q(approved=True),
+                         name='trending_course_score_idx'),
+        ]
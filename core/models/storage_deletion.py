@@ -0,0 +1,24 @@
+from .base import TimeStampedModel
+
+from django.db import models
+from django.utils import timezone
+
+class StorageDeletion(TimeStampedModel):
+    """
+    Outbox entry for a storage object to delete. Rows are written in the same transaction
+    that deletes the referencing Document, so the object is removed if and only if the
+    delete commits; a background worker drains them.
+    """
+    name = models.CharField(max_length=255, help_text="Storage key of the object to delete.")
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now,
+                                        help_text="Not processed before this time (retry backoff / worker lease).")
+    last_error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f"Delete {self.name} (attempts: {self.attempts})"
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            models.Index(fields=['available_at'], name='storage_deletion_due_idx'),
+        ]
@@ -0,0 +1,56 @@
+import uuid
+
+from .base import TimeStampedModel
+from .user import User
+from .document import Document
+
+from django.db import models
+from django.db.models import TextChoices
+
+class UploadSession(TimeStampedModel):
+    class SessionStatus(TextChoices):
+        ACTIVE = 'active', 'Active'
+        COMPLETED = 'completed', 'Completed'
+        ABORTED = 'aborted', 'Aborted'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    file_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    total_size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, null=True,
+                              help_text="Optional checksum of the whole file, verified on completion.")
+    metadata = models.JSONField(default=dict, help_text="Document metadata applied on completion.")
+    status = models.CharField(max_length=20, choices=SessionStatus.choices, default=SessionStatus.ACTIVE)
+    expires_at = models.DateTimeField()
+    document = models.ForeignKey(Document, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='upload_session_expiry_idx'),
+        ]
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def expected_chunk_size(self, index):
+        if index == self.total_chunks - 1:
+            return self.total_size - index * self.chunk_size
+        return self.chunk_size
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status}) by {self.user.email}"
+
+class UploadChunk(TimeStampedModel):
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+
+    class Meta(TimeStampedModel.Meta):
+        unique_together = ('session', 'index')
+
+    def __str__(self):
+        return f"Chunk {self.index} of {self.session_id}"
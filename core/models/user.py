@@ -1,6 +1,10 @@
 import logging
 
 from django.db import models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin, Group
 from django.utils import timezone
 
@@ -81,6 +85,11 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
 
     last_login = models.DateTimeField(blank=True, null=True, verbose_name='last login')
 
+    # Denormalized from the groups (kept in sync by the signal handlers below), so reading
+    # `role` never queries: it is loaded with the user row.
+    role_name = models.CharField(max_length=150, blank=True, default='', db_index=True, editable=False,
+                                 help_text="Name of the user's first group (lowest ID); empty without groups.")
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
@@ -91,4 +100,43 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
 
     @property
     def role(self):
-        return self.groups.first().name if self.groups.exists() else None
+        return self.role_name or None
+
+    @classmethod
+    def sync_roles(cls, user_ids):
+        """Recomputes `role_name` from the groups of the given users with one UPDATE."""
+        first_group = Group.objects.filter(user=OuterRef('pk')).order_by('pk').values('name')[:1]
+        cls.objects.filter(pk__in=list(user_ids)).update(role_name=Coalesce(Subquery(first_group), Value('')))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def sync_role_on_group_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # group.user_set.clear() reports no user IDs afterwards; remember who was in the group.
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        # Set on the instance in hand too (often request.user), not only on its row.
+        instance.role_name = instance.groups.order_by('pk').values_list('name', flat=True).first() or ''
+        User.objects.filter(pk=instance.pk).update(role_name=instance.role_name)
+    elif action == 'post_clear':
+        User.sync_roles(getattr(instance, '_cleared_user_ids', []))
+    else:
+        User.sync_roles(pk_set or [])
+
+
+@receiver(post_save, sender=Group)
+def sync_role_on_group_rename(sender, instance, created, **kwargs):
+    if not created:
+        User.sync_roles(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Group)
+def remember_group_members(sender, instance, **kwargs):
+    instance._deleted_user_ids = list(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Group)
+def sync_role_on_group_delete(sender, instance, **kwargs):
+    User.sync_roles(getattr(instance, '_deleted_user_ids', []))
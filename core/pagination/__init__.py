@@ -0,0 +1 @@
+from .keyset_pagination import *
\ No newline at end of file
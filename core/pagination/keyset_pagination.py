@@ -0,0 +1,140 @@
+import json
+import base64
+import binascii
+
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import serializers
+
+
+class KeysetPagination(object):
+    """
+    Opaque-cursor keyset pagination over an ordering field plus the primary key.
+    Each page is fetched with a `WHERE (field, id) < (last_field, last_id)` style
+    predicate instead of an OFFSET, so deep pages cost the same as the first one.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_query_param = 'ordering'
+
+    ordering_fields = ('created_at', 'updated_at', 'title')
+    default_ordering = '-created_at'
+
+    def __init__(self, page_size=None, max_page_size=None):
+        self.page_size = page_size or getattr(settings, 'DOCUMENT_PAGE_SIZE', 25)
+        self.max_page_size = max_page_size or getattr(settings, 'DOCUMENT_MAX_PAGE_SIZE', 100)
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def get_page_size(self, request):
+        """Returns the requested page size, clamped to `max_page_size`."""
+        raw_page_size = request.query_params.get(self.page_size_query_param)
+        if not raw_page_size:
+            return self.page_size
+        try:
+            page_size = int(raw_page_size)
+        except ValueError:
+            raise serializers.ValidationError({self.page_size_query_param: "Page size must be an integer."})
+        if page_size < 1:
+            raise serializers.ValidationError({self.page_size_query_param: "Page size must be a positive integer."})
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        """Returns the validated ordering string, e.g. '-created_at' or 'title'."""
+        ordering = request.query_params.get(self.ordering_query_param) or self.default_ordering
+        if ordering.lstrip('-') not in self.ordering_fields:
+            raise serializers.ValidationError({
+                self.ordering_query_param: f"Ordering must be one of: {', '.join(self.ordering_fields)} (prefix with '-' for descending)."
+            })
+        return ordering
+
+    def paginate_queryset(self, queryset, request, get_value=getattr):
+        """
+        Returns the list of objects for the requested page and remembers the
+        cursors needed by `get_paginated_data`.
+        `get_value(row, field)` reads cursor values from a row; pass one when paginating
+        values()/values_list() querysets instead of model instances.
+        """
+        page_size = self.get_page_size(request)
+        ordering = self.get_ordering(request)
+        field = ordering.lstrip('-')
+        descending = ordering.startswith('-')
+
+        cursor = self.decode_cursor(request.query_params.get(self.cursor_query_param), ordering)
+        reverse = bool(cursor and cursor['r'])
+
+        # Walking backwards means flipping both the comparison and the ordering.
+        walk_descending = descending != reverse
+        prefix = '-' if walk_descending else ''
+        queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}id')
+
+        if cursor:
+            value = self.parse_value(queryset.model, field, cursor['v'])
+            lookup = 'lt' if walk_descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'id__{lookup}': cursor['id']})
+            )
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.get_value = get_value
+        self.next_cursor = self.encode_cursor(rows[-1], field, ordering, False) if rows and has_next else None
+        self.previous_cursor = self.encode_cursor(rows[0], field, ordering, True) if rows and has_previous else None
+        self.page_size = page_size
+        return rows
+
+    def get_paginated_data(self, data):
+        """Wraps serialized page data together with the cursors for the neighbouring pages."""
+        return {
+            "results": data,
+            "next_cursor": self.next_cursor,
+            "previous_cursor": self.previous_cursor,
+            "page_size": self.page_size,
+        }
+
+    def encode_cursor(self, obj, field, ordering, reverse):
+        value = self.get_value(obj, field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps({"v": value, "id": self.get_value(obj, 'id'), "o": ordering, "r": reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, encoded, ordering):
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            if not isinstance(cursor, dict) or not {'v', 'id', 'o', 'r'} <= cursor.keys():
+                raise ValueError("Malformed cursor payload.")
+            # bool is an int subclass, but never a valid primary key.
+            if not isinstance(cursor['id'], int) or isinstance(cursor['id'], bool) or not isinstance(cursor['r'], bool):
+                raise ValueError("Malformed cursor payload.")
+        except (ValueError, UnicodeError, binascii.Error):
+            raise serializers.ValidationError({self.cursor_query_param: "Invalid cursor."})
+        if cursor['o'] != ordering:
+            raise serializers.ValidationError({self.cursor_query_param: "Cursor does not match the requested ordering."})
+        return cursor
+
+    def parse_value(self, model, field, raw_value):
+        """Coerces a cursor value to the ordering field's type, so tampered values fail here and not in the query."""
+        if not isinstance(raw_value, (str, int, float)) or isinstance(raw_value, bool):
+            raise serializers.ValidationError({self.cursor_query_param: "Invalid cursor."})
+        try:
+            value = model._meta.get_field(field).to_python(raw_value)
+        except (ValidationError, TypeError, ValueError):
+            raise serializers.ValidationError({self.cursor_query_param: "Invalid cursor."})
+        if value is None:
+            raise serializers.ValidationError({self.cursor_query_param: "Invalid cursor."})
+        return value
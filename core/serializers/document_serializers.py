@@ -1,9 +1,18 @@
 # core/serializers/document_serializers.py
 
-from rest_framework import serializers
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from core.models import Document, Course, AcademicYear, User
 from core.models.base import SemesterNumber, DocumentStatus
+from core.mixins.dynamic_fields_mixins import DynamicFieldsMixin
 from core.services.document_service import DocumentService
+from core.services.file_url_service import FileUrlService
+from core.validators.file_validators import ALLOWED_UPLOAD_CONTENT_TYPES
 
 
 # --- Existing Lookups Serializers (Modified with ref_name) ---
@@ -74,29 +83,335 @@ class DocumentUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"Document update failed: {e}")
 
 # --- Document Retrieve/List Serializer ---
-class DocumentRetrieveSerializer(serializers.ModelSerializer):
+class DocumentRetrieveSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     course = CourseSerializer()
     academic_year = AcademicYearSerializer()
     uploader = serializers.ReadOnlyField(source='uploader.email')
     file_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+
+    # Relations that `?expand=` controls; unexpanded ones are returned as bare IDs.
+    expandable_fields = {
+        'course': lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+        'academic_year': lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+        'uploader': lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+    }
+    expanded_sources = {
+        'course': ('course', None),
+        'academic_year': ('academic_year', None),
+        'uploader': ('uploader', ['email']),
+    }
+    field_sources = {
+        'file_url': ['file'],
+        'preview_url': ['preview'],
+    }
 
     class Meta:
         model = Document
         fields = [
             'id', 'title', 'doc_type', 'course', 'academic_year',
-            'semester_number', 'file_url', 'uploader', 'status',
-            'created_at', 'updated_at', 'file_format',
+            'semester_number', 'file_url', 'preview_url', 'uploader', 'status',
+            'created_at', 'updated_at', 'file_format', 'content_hash', 'duplicate_of',
+            'view_count', 'download_count',
         ]
         read_only_fields = [
-            'id', 'file_url', 'uploader', 'status', 'created_at',
-            'updated_at', 'file_format'
+            'id', 'file_url', 'preview_url', 'uploader', 'status', 'created_at',
+            'updated_at', 'file_format', 'content_hash', 'duplicate_of', 'view_count', 'download_count'
         ]
 
     def get_file_url(self, obj):
         if obj.file:
-            return obj.file.url
+            return FileUrlService.get_url(obj.file.storage, obj.file.name)
+        return None
+
+    def get_preview_url(self, obj):
+        if obj.preview:
+            return FileUrlService.get_url(obj.preview.storage, obj.preview.name)
         return None
 
+# --- Fast read-only path for DocumentRetrieveSerializer output ---
+class DocumentValuesSerializer(object):
+    """
+    Builds exactly the output of DocumentRetrieveSerializer from `QuerySet.values_list()` tuples,
+    skipping model instantiation and per-object serializer overhead. The serializer is
+    compiled once per field selection into a flat plan of (key, tuple index, converter):
+    - values already in their JSON-ready form (strings, integers, IDs) are copied as-is,
+    - ISO 8601 datetimes are formatted with the active timezone resolved once per instance,
+    - any other field falls back to the DRF field's `to_representation`,
+    - nested relations become dicts built from their joined columns,
+    - file URLs of a whole list are resolved in one batch through FileUrlService.
+    `core/tests/test_document_values_serializer.py` asserts parity with the DRF serializer.
+    """
+    # Fields whose DRF `to_representation` returns a values() column unchanged.
+    passthrough_field_types = (
+        serializers.CharField, serializers.IntegerField, serializers.ChoiceField,
+        serializers.ReadOnlyField, serializers.PrimaryKeyRelatedField,
+    )
+    # Method fields that render the URL of a stored file: {field name: model file field}.
+    file_url_fields = {'file_url': 'file', 'preview_url': 'preview'}
+
+    def __init__(self, fields=None, expand=None):
+        columns, plan = self.compile(
+            tuple(fields) if fields is not None else None,
+            tuple(expand) if expand is not None else None,
+        )
+        self.columns = columns
+        self.column_index = {column: index for index, column in enumerate(columns)}
+        # Converters are bound per instance, i.e. per request, so they see the active timezone
+        # and the current storage.
+        self.plan = [
+            (name, index, self.bind_converter(field), children if children in (None, True) else [
+                (child_name, child_index, self.bind_converter(child)) for child_name, child_index, child in children
+            ])
+            for name, index, field, children in plan
+        ]
+
+    @classmethod
+    def bind_converter(cls, field):
+        """Returns a callable rendering one non-null column value, or None to copy it unchanged."""
+        if field is None:
+            return None
+        if isinstance(field, str):
+            # A file URL: bound to the storage of the named model file field.
+            return Document._meta.get_field(field).storage
+        if isinstance(field, cls.passthrough_field_types):
+            return None
+        if (isinstance(field, serializers.DateTimeField)
+                and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601):
+            field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+            if field_timezone is not None:
+                def convert(value):
+                    if not timezone.is_aware(value):
+                        return field.to_representation(value)
+                    value = value.astimezone(field_timezone).isoformat()
+                    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+                return convert
+        return field.to_representation
+
+    @classmethod
+    def compile_nested(cls, name, serializer, add_column):
+        children = []
+        for child_name, child in serializer.fields.items():
+            if isinstance(child, (serializers.BaseSerializer, serializers.SerializerMethodField)):
+                raise ImproperlyConfigured(f"DocumentValuesSerializer cannot render '{name}.{child_name}'.")
+            children.append((child_name, add_column(f"{name}__{child.source.replace('.', '__')}"), child))
+        return add_column(f"{name}__{serializer.Meta.model._meta.pk.name}"), children
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def compile(cls, fields, expand):
+        """
+        Returns (values_list columns, plan) for one `fields`/`expand` selection. Plan entries are
+        (key, column index, DRF field or file field name, nested children / True for file URLs / None).
+        """
+        serializer = DocumentRetrieveSerializer(fields=fields, expand=expand)
+        columns = []
+
+        def add_column(column):
+            if column not in columns:
+                columns.append(column)
+            return columns.index(column)
+
+        plan = []
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.BaseSerializer):
+                pk_index, children = cls.compile_nested(name, field, add_column)
+                plan.append((name, pk_index, None, children))
+            elif isinstance(field, serializers.SerializerMethodField):
+                if name not in cls.file_url_fields:
+                    raise ImproperlyConfigured(f"DocumentValuesSerializer cannot render method field '{name}'.")
+                file_field = cls.file_url_fields[name]
+                plan.append((name, add_column(file_field), file_field, True))
+            else:
+                plan.append((name, add_column(field.source.replace('.', '__')), field, None))
+        return tuple(columns), tuple(plan)
+
+    def get_rows(self, queryset, extra_fields=()):
+        """
+        Narrows a Document queryset to the tuples this serializer reads.
+        :param extra_fields: Additional model fields the caller needs from each row (see `get_value`).
+        """
+        for column in extra_fields:
+            if column not in self.column_index:
+                self.column_index[column] = len(self.columns)
+                self.columns += (column,)
+        return queryset.values_list(*self.columns)
+
+    def get_value(self, row, name):
+        """Reads a column from a row produced by `get_rows`, e.g. for pagination cursors."""
+        return row[self.column_index[name]]
+
+    def to_representation(self, row, urls=None):
+        """
+        Renders one row.
+        :param urls: {column index: {storage key: URL}} resolved in advance by `serialize`.
+        """
+        data = {}
+        for name, index, convert, children in self.plan:
+            value = row[index]
+            if children is True:
+                # Matches `obj.file.url if obj.file else None`: empty and NULL names both render None.
+                if not value:
+                    data[name] = None
+                elif urls is not None:
+                    data[name] = urls[index][value]
+                else:
+                    data[name] = FileUrlService.get_url(convert, value)
+            elif children is not None:
+                data[name] = None if value is None else {
+                    child_name: row[child_index] if child_convert is None or row[child_index] is None
+                    else child_convert(row[child_index])
+                    for child_name, child_index, child_convert in children
+                }
+            elif value is None or convert is None:
+                data[name] = value
+            else:
+                data[name] = convert(value)
+        return data
+
+    def serialize(self, rows):
+        rows = list(rows)
+        urls = {
+            index: FileUrlService.get_urls(storage, (row[index] for row in rows))
+            for _, index, storage, children in self.plan if children is True
+        }
+        to_representation = self.to_representation
+        return [to_representation(row, urls) for row in rows]
+
 # --- Document Status Change Serializer ---
 class DocumentStatusChangeSerializer(serializers.Serializer):
-    new_status = serializers.ChoiceField(choices=DocumentStatus.choices, required=True)
\ No newline at end of file
+    new_status = serializers.ChoiceField(choices=DocumentStatus.choices, required=True)
+
+class ReviewQueueClaimSerializer(serializers.Serializer):
+    count = serializers.IntegerField(required=False, min_value=1, max_value=100, default=10,
+                                     help_text="Number of pending documents to claim (max 100).")
+
+# --- Bulk Status Change Serializers ---
+class BulkStatusChangeItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    new_status = serializers.ChoiceField(choices=DocumentStatus.choices)
+
+
+class BulkStatusChangeSerializer(serializers.Serializer):
+    items = BulkStatusChangeItemSerializer(many=True, required=False,
+                                           help_text="Per-document decisions: [{id, new_status}, ...].")
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False,
+                                help_text="Document IDs that all receive 'new_status'.")
+    new_status = serializers.ChoiceField(choices=DocumentStatus.choices, required=False)
+
+    def validate(self, data):
+        changes = [(item['id'], item['new_status']) for item in data.get('items', [])]
+        if data.get('ids'):
+            if 'new_status' not in data:
+                raise serializers.ValidationError({"new_status": "This field is required together with 'ids'."})
+            changes.extend((document_id, data['new_status']) for document_id in data['ids'])
+        if not changes:
+            raise serializers.ValidationError("Provide 'items', or 'ids' with 'new_status'.")
+        if len(changes) > settings.DOCUMENT_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(f"At most {settings.DOCUMENT_BULK_MAX_ITEMS} documents can be reviewed per request.")
+        data['changes'] = changes
+        return data
+
+# --- Direct (presigned) Upload Serializers ---
+class DirectUploadRequestSerializer(serializers.Serializer):
+    file_name = serializers.CharField(max_length=255)
+    content_type = serializers.ChoiceField(choices=sorted(ALLOWED_UPLOAD_CONTENT_TYPES))
+    title = serializers.CharField(max_length=200)
+    doc_type = serializers.ChoiceField(choices=Document.DocumentType.choices)
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
+    academic_year = serializers.PrimaryKeyRelatedField(queryset=AcademicYear.objects.all())
+    semester_number = serializers.ChoiceField(choices=SemesterNumber.choices)
+
+    def validate(self, data):
+        data['extension'] = ALLOWED_UPLOAD_CONTENT_TYPES[data['content_type']]
+        return data
+
+
+class DirectUploadFinalizeSerializer(serializers.Serializer):
+    upload_token = serializers.CharField()
+
+
+# --- Resumable (chunked) Upload Serializers ---
+class UploadSessionCreateSerializer(DirectUploadRequestSerializer):
+    total_size = serializers.IntegerField(min_value=1)
+    chunk_size = serializers.IntegerField(required=False, help_text="Bytes per chunk; defaults to the server setting.")
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False,
+                                    help_text="Optional SHA-256 of the whole file, verified on completion.")
+
+    def validate_total_size(self, value):
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"File size cannot exceed {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate_chunk_size(self, value):
+        if not settings.CHUNKED_UPLOAD_MIN_CHUNK_SIZE <= value <= settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Chunk size must be between {settings.CHUNKED_UPLOAD_MIN_CHUNK_SIZE} and "
+                f"{settings.CHUNKED_UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate_sha256(self, value):
+        return value.lower()
+
+
+# --- Bulk Ingest Serializer ---
+class BulkIngestSerializer(serializers.Serializer):
+    archive = serializers.FileField(required=False, help_text="ZIP archive of the documents.")
+    files = serializers.ListField(child=serializers.FileField(), required=False,
+                                  help_text="Individual files, as an alternative to 'archive'.")
+    manifest = serializers.FileField(required=False,
+                                     help_text="JSON or CSV manifest; defaults to manifest.json/.csv inside the archive.")
+
+    def validate(self, data):
+        if bool(data.get('archive')) == bool(data.get('files')):
+            raise serializers.ValidationError("Provide either 'archive' or 'files'.")
+        if data.get('files') and not data.get('manifest'):
+            raise serializers.ValidationError({"manifest": "A manifest is required when uploading individual files."})
+        return data
+
+
+
+# --- Scan Upload Serializer ---
+class ScanUploadSerializer(serializers.Serializer):
+    pages = serializers.ListField(child=serializers.FileField(), allow_empty=False,
+                                 help_text="Page images (JPG/PNG) in page order; stitched into one PDF.")
+    title = serializers.CharField(max_length=200)
+    doc_type = serializers.ChoiceField(choices=Document.DocumentType.choices)
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
+    academic_year = serializers.PrimaryKeyRelatedField(queryset=AcademicYear.objects.all())
+    semester_number = serializers.ChoiceField(choices=SemesterNumber.choices)
+
+    def validate_pages(self, pages):
+        if len(pages) > settings.DOCUMENT_SCAN_MAX_PAGES:
+            raise serializers.ValidationError(f"A scan may have at most {settings.DOCUMENT_SCAN_MAX_PAGES} pages.")
+        for page in pages:
+            if page.content_type not in ('image/jpeg', 'image/png'):
+                raise serializers.ValidationError(f"'{page.name}' is not a JPG or PNG image.")
+            if page.size > settings.DOCUMENT_SCAN_MAX_PAGE_SIZE:
+                raise serializers.ValidationError(
+                    f"'{page.name}' exceeds {settings.DOCUMENT_SCAN_MAX_PAGE_SIZE} bytes.")
+        return pages
+
+
+# --- Bundle Serializer ---
+class DocumentBundleSerializer(serializers.Serializer):
+    course = serializers.IntegerField(required=False, min_value=1, help_text="Course ID.")
+    academic_year = serializers.IntegerField(required=False, min_value=1, help_text="Academic year ID.")
+    semester_number = serializers.ChoiceField(choices=SemesterNumber.choices, required=False)
+
+    def validate(self, data):
+        if not data.get('course') and not (data.get('academic_year') and data.get('semester_number')):
+            raise serializers.ValidationError("Provide a course, or an academic year and a semester number.")
+        return data
+
+    def get_filters(self) -> dict:
+        """The validated selection as Document queryset filters."""
+        columns = {'course': 'course_id', 'academic_year': 'academic_year_id', 'semester_number': 'semester_number'}
+        return {columns[name]: value for name, value in self.validated_data.items()}
+
+
+class DocumentTrendingSerializer(serializers.Serializer):
+    program = serializers.IntegerField(required=False, min_value=1, help_text="Program ID.")
+    course = serializers.IntegerField(required=False, min_value=1, help_text="Course ID.")
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100, default=20,
+                                     help_text="Number of documents (max 100).")
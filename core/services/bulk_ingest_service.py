@@ -0,0 +1,306 @@
+# core/services/bulk_ingest_service.py
+
+import io
+import os
+import csv
+import json
+import hashlib
+import logging
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from core.models import AcademicYear, Course, Document, User
+from core.models.base import DocumentStatus, SemesterNumber
+from core.services.document_service import DocumentService
+from core.services.extraction_service import TextExtractionService
+from core.services.facet_service import FacetService
+from core.services.image_processing_service import ImageProcessingService
+from core.services.preview_service import PreviewService
+from core.services.search_service import SearchService
+from core.services.storage_deletion_service import StorageDeletionService
+from core.utils.compression import CompressingStorage
+from core.validators.file_validators import ALLOWED_UPLOAD_CONTENT_TYPES
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAMES = ('manifest.json', 'manifest.csv')
+EXTENSION_CONTENT_TYPES = {extension: content_type for content_type, extension in ALLOWED_UPLOAD_CONTENT_TYPES.items()}
+EXTENSION_CONTENT_TYPES['.jpeg'] = 'image/jpeg'
+
+STATUS_CREATED = 'created'
+STATUS_INVALID = 'invalid'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+
+class IngestError(Exception):
+    """Raised when an archive or manifest cannot be read at all."""
+
+
+class IngestSource:
+    """
+    A set of named files to ingest, each opened lazily as a binary stream:
+    the entries of a ZIP archive, the files under a directory, or uploaded files.
+    """
+
+    def __init__(self, entries, closer=None):
+        # entries: {relative name: (size in bytes, zero-argument callable returning a binary stream)}
+        self.entries = entries
+        self.closer = closer
+
+    @classmethod
+    def from_zip(cls, archive):
+        """`archive` is a path or a seekable binary file. ZipFile reads are safe to share across threads."""
+        try:
+            zip_file = zipfile.ZipFile(archive)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise IngestError(f"Not a readable ZIP archive: {e}")
+        entries = {
+            info.filename: (info.file_size, lambda info=info: zip_file.open(info))
+            for info in zip_file.infolist() if not info.is_dir()
+        }
+        return cls(entries, closer=zip_file.close)
+
+    @classmethod
+    def from_directory(cls, path):
+        entries = {}
+        for root, _, files in os.walk(path):
+            for file_name in files:
+                full_path = os.path.join(root, file_name)
+                name = os.path.relpath(full_path, path).replace(os.sep, '/')
+                entries[name] = (os.path.getsize(full_path), lambda full_path=full_path: open(full_path, 'rb'))
+        return cls(entries)
+
+    @classmethod
+    def from_uploaded_files(cls, files):
+        def opener(uploaded_file):
+            uploaded_file.seek(0)
+            return uploaded_file
+        return cls({uploaded_file.name: (uploaded_file.size, lambda f=uploaded_file: opener(f)) for uploaded_file in files})
+
+    def read(self, name):
+        with self.entries[name][1]() as stream:
+            return stream.read()
+
+    def close(self):
+        if self.closer:
+            self.closer()
+
+
+class BulkIngestService:
+    """
+    Ingests many documents at once from a ZIP archive (or folder, or several uploaded files)
+    plus a manifest mapping each file to its metadata:
+    1. The manifest (JSON or CSV) is parsed and every row validated with a handful of lookups.
+    2. Valid files are streamed out of the source and stored concurrently by a bounded thread pool.
+    3. All Document rows are created with one bulk_create, then indexed and queued for text extraction and previews.
+    A per-file report records the outcome of every manifest row and every unlisted file.
+    """
+
+    @staticmethod
+    def parse_manifest(data: bytes, name: str) -> list:
+        """
+        Parses a manifest: a JSON list of objects (or {"documents": [...]}) or a CSV with a header row.
+        Raises:
+            IngestError: If the manifest cannot be parsed.
+        """
+        try:
+            if name.lower().endswith('.json'):
+                rows = json.loads(data.decode('utf-8-sig'))
+                if isinstance(rows, dict):
+                    rows = rows.get('documents')
+                if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                    raise IngestError("A JSON manifest must be a list of objects.")
+                return rows
+            if name.lower().endswith('.csv'):
+                return list(csv.DictReader(io.StringIO(data.decode('utf-8-sig'))))
+        except (UnicodeDecodeError, ValueError, csv.Error) as e:
+            raise IngestError(f"Could not parse manifest '{name}': {e}")
+        raise IngestError("The manifest must be a .json or .csv file.")
+
+    @staticmethod
+    def find_manifest(source: IngestSource) -> list:
+        for manifest_name in MANIFEST_NAMES:
+            if manifest_name in source.entries:
+                return BulkIngestService.parse_manifest(source.read(manifest_name), manifest_name)
+        raise IngestError(f"No manifest supplied and none of {', '.join(MANIFEST_NAMES)} found in the archive.")
+
+    @staticmethod
+    def build_lookups(rows):
+        """Resolves every course and academic year referenced by the manifest in two queries."""
+        course_refs = {str(row.get('course', '')).strip() for row in rows}
+        course_ids = {int(ref) for ref in course_refs if ref.isdigit()}
+        courses = {}
+        for course in Course.objects.filter(id__in=course_ids) | Course.objects.filter(code__in=course_refs):
+            courses[str(course.id)] = course
+            # Course codes are unique per program only; an ambiguous code resolves to None.
+            courses[course.code] = None if course.code in courses and courses[course.code] != course else course
+
+        academic_years = {}
+        for academic_year in AcademicYear.objects.all():
+            academic_years[str(academic_year.id)] = academic_year
+            academic_years[str(academic_year)] = academic_year
+        return courses, academic_years
+
+    @staticmethod
+    def validate_row(row, source, courses, academic_years, seen_files):
+        """Returns (cleaned metadata, None) for a valid row or (None, {field: error})."""
+        errors = {}
+        file_name = str(row.get('file') or '').strip().lstrip('/')
+        if not file_name:
+            errors['file'] = "This field is required."
+        elif file_name in seen_files:
+            errors['file'] = "This file is listed more than once."
+        elif file_name not in source.entries:
+            errors['file'] = "File not found in the upload."
+        else:
+            extension = os.path.splitext(file_name)[1].lower()
+            if extension not in EXTENSION_CONTENT_TYPES:
+                errors['file'] = f"Unsupported file type '{extension}'."
+            elif not 0 < source.entries[file_name][0] <= settings.BULK_INGEST_MAX_FILE_SIZE:
+                errors['file'] = f"File size must be between 1 and {settings.BULK_INGEST_MAX_FILE_SIZE} bytes."
+
+        title = str(row.get('title') or '').strip()
+        if not title:
+            errors['title'] = "This field is required."
+        elif len(title) > Document._meta.get_field('title').max_length:
+            errors['title'] = "Title is too long."
+        doc_type = str(row.get('doc_type') or '').strip()
+        if doc_type not in Document.DocumentType.values:
+            errors['doc_type'] = f"Must be one of: {', '.join(Document.DocumentType.values)}."
+        semester_number = str(row.get('semester_number') or '').strip()
+        if semester_number not in SemesterNumber.values:
+            errors['semester_number'] = f"Must be one of: {', '.join(SemesterNumber.values)}."
+        course = courses.get(str(row.get('course', '')).strip())
+        if course is None:
+            errors['course'] = "Unknown or ambiguous course (use its ID or a unique code)."
+        academic_year = academic_years.get(str(row.get('academic_year', '')).strip())
+        if academic_year is None:
+            errors['academic_year'] = "Unknown academic year (use its ID or e.g. 2023-2024)."
+
+        if errors:
+            return None, errors
+        return {
+            'file': file_name,
+            'file_format': EXTENSION_CONTENT_TYPES[os.path.splitext(file_name)[1].lower()],
+            'title': title,
+            'doc_type': doc_type,
+            'course': course,
+            'academic_year': academic_year,
+            'semester_number': semester_number,
+        }, None
+
+    @staticmethod
+    def store_entry(source: IngestSource, file_name: str):
+        """
+        Streams one entry into a spooled temporary file while hashing it, then stores it
+        content-addressed. Returns the StoredFile.
+        """
+        limit = settings.BULK_INGEST_MAX_FILE_SIZE
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE) as spooled:
+            with source.entries[file_name][1]() as stream:
+                while True:
+                    block = stream.read(64 * 1024)
+                    if not block:
+                        break
+                    size += len(block)
+                    # Guards against archives whose declared sizes lie (zip bombs).
+                    if size > limit:
+                        raise ValueError(f"File exceeds {limit} bytes.")
+                    digest.update(block)
+                    spooled.write(block)
+            spooled.seek(0)
+            stored_file = File(spooled, name=os.path.basename(file_name))
+            stored_file.sha256 = digest.hexdigest()
+            content_type = EXTENSION_CONTENT_TYPES[os.path.splitext(file_name)[1].lower()]
+            return DocumentService.store_file(stored_file, content_type)
+
+    @staticmethod
+    def ingest(source: IngestSource, rows, uploader: User, max_workers=None) -> dict:
+        """
+        Validates the manifest rows, stores the files concurrently and creates the documents.
+        Args:
+            source (IngestSource): Where the files come from.
+            rows (list[dict]): Parsed manifest rows.
+            uploader (User): The staff member the documents are attributed to.
+            max_workers (int): Storage upload threads; defaults to BULK_INGEST_WORKERS.
+        Returns:
+            dict: {'results': [per-file outcome], 'summary': {status: count}}.
+        """
+        if len(rows) > settings.BULK_INGEST_MAX_FILES:
+            raise IngestError(f"A manifest may list at most {settings.BULK_INGEST_MAX_FILES} files.")
+
+        courses, academic_years = BulkIngestService.build_lookups(rows)
+        results, valid, seen_files = [], [], set()
+        for row in rows:
+            metadata, errors = BulkIngestService.validate_row(row, source, courses, academic_years, seen_files)
+            result = {'file': str(row.get('file') or ''), 'status': STATUS_INVALID if errors else None,
+                      'document_id': None, 'errors': errors}
+            results.append(result)
+            if metadata:
+                seen_files.add(metadata['file'])
+                valid.append((result, metadata))
+
+        with ThreadPoolExecutor(max_workers=max_workers or settings.BULK_INGEST_WORKERS,
+                                thread_name_prefix='bulk-ingest') as pool:
+            futures = [pool.submit(BulkIngestService.store_entry, source, metadata['file']) for _, metadata in valid]
+            stored = []
+            for (result, metadata), future in zip(valid, futures):
+                try:
+                    stored.append((result, metadata, future.result()))
+                except Exception as e:
+                    logger.warning(f"Bulk ingest could not store '{metadata['file']}': {e}")
+                    result.update(status=STATUS_FAILED, errors={'file': str(e)})
+
+        with transaction.atomic():
+            # Files were stored outside this transaction; a shared object may have been deleted since.
+            deleted = StorageDeletionService.claim_stored(
+                CompressingStorage(Document._meta.get_field('file').storage),
+                [stored_file.name for _, _, stored_file in stored if stored_file.reused])
+            for result, metadata, stored_file in stored:
+                if stored_file.name in deleted:
+                    logger.warning(f"Bulk ingest lost '{metadata['file']}': its stored object was deleted meanwhile.")
+                    result.update(status=STATUS_FAILED, errors={'file': "The stored file was removed concurrently; retry."})
+            stored = [item for item in stored if item[2].name not in deleted]
+
+            documents = [
+                Document(
+                    uploader=uploader, status=DocumentStatus.PENDING,
+                    image_processing_status=ImageProcessingService.get_initial_status(metadata['file_format']),
+                    **DocumentService.get_stored_file_fields(stored_file),
+                    **{key: value for key, value in metadata.items() if key != 'file'}
+                )
+                for _, metadata, stored_file in stored
+            ]
+            Document.objects.bulk_create(documents, batch_size=settings.DOCUMENT_BULK_BATCH_SIZE)
+            document_ids = [document.id for document in documents]
+            DocumentService.mark_duplicates(document_ids)
+            SearchService.index_documents(document_ids)
+            # Images get their previews and text once they have been re-encoded.
+            image_ids = [document.id for document in documents if document.image_processing_status]
+            other_ids = [document.id for document in documents if not document.image_processing_status]
+            ImageProcessingService.schedule(image_ids)
+            TextExtractionService.schedule(other_ids)
+            PreviewService.schedule(other_ids)
+            if document_ids:
+                FacetService.invalidate_on_commit()
+        for (result, _, _), document in zip(stored, documents):
+            result.update(status=STATUS_CREATED, document_id=document.id)
+
+        listed = {result['file'].lstrip('/') for result in results}
+        for name in sorted(set(source.entries) - listed - set(MANIFEST_NAMES)):
+            results.append({'file': name, 'status': STATUS_SKIPPED, 'document_id': None,
+                            'errors': {'file': "Not listed in the manifest."}})
+
+        summary = {}
+        for result in results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+        logger.info(f"Bulk ingest by {uploader.email}: {summary}.")
+        return {'results': results, 'summary': summary}
@@ -0,0 +1,158 @@
+# core/services/bundle_service.py
+
+import io
+import os
+import sys
+import json
+import hashlib
+import logging
+import zipfile
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import Document
+from core.models.base import DocumentStatus
+from core.services.download_service import DocumentDownloadService
+from core.utils.compression import iter_decoded
+
+logger = logging.getLogger(__name__)
+
+# Formats that are compressed containers already; deflating them again only costs CPU.
+STORED_FORMATS = {
+    'application/pdf',
+    'image/jpeg',
+    'image/png',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/zip',
+}
+# Bumped whenever the archive layout changes, so clients do not keep bundles built the old way.
+BUNDLE_FORMAT_VERSION = 1
+
+
+class BundleTooLarge(Exception):
+    """Raised when more documents match than one bundle may contain."""
+
+
+class ZipStreamBuffer(io.RawIOBase):
+    """Unseekable sink for zipfile that hands written bytes back to the streaming generator."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class DocumentBundleService:
+    """
+    Builds ZIP bundles of approved documents on the fly. Each file is read from storage in
+    bounded chunks (S3 objects as a streamed GET) and written straight into a ZIP stream that is
+    sent to the client as it grows: no temporary file and at most a few chunks in memory.
+    Already-compressed formats are stored, text is deflated, and files compressed at rest are
+    decoded on the way. Entries carry the documents' modification times, so the same documents
+    always produce the same archive and the bundle's ETag only depends on what it contains.
+    """
+
+    @staticmethod
+    def get_documents(filters) -> list:
+        """
+        Returns the approved, stored documents matching `filters`, in archive order.
+        Args:
+            filters (dict): Any of course_id, academic_year_id and semester_number.
+        Raises:
+            BundleTooLarge: If more than DOCUMENT_BUNDLE_MAX_FILES documents match.
+        """
+        limit = settings.DOCUMENT_BUNDLE_MAX_FILES
+        documents = list(
+            Document.objects.filter(status=DocumentStatus.APPROVED, **filters).exclude(file='')
+            .only('id', 'title', 'file', 'file_format', 'file_encoding', 'file_size', 'updated_at')
+            .order_by('doc_type', 'title', 'id')[:limit + 1]
+        )
+        if len(documents) > limit:
+            raise BundleTooLarge(f"More than {limit} documents match; narrow the bundle down.")
+        return documents
+
+    @staticmethod
+    def get_etag(filters, documents) -> str:
+        """Strong validator for the archive: its parameters plus the identity and version of every entry."""
+        key = [BUNDLE_FORMAT_VERSION, sorted(filters.items()),
+               [(document.id, document.updated_at.isoformat()) for document in documents]]
+        return f'"{hashlib.sha256(json.dumps(key, default=str).encode()).hexdigest()[:32]}"'
+
+    @staticmethod
+    def get_archive_name(filters) -> str:
+        labels = {'course_id': 'course', 'academic_year_id': 'year', 'semester_number': 'semester'}
+        parts = [f"{labels[name]}-{value}" for name, value in sorted(filters.items())]
+        return f"papers-{'-'.join(parts) or 'all'}.zip"
+
+    @staticmethod
+    def get_entry_names(documents) -> list:
+        """Archive member names: the download name, made unique with the document ID if titles clash."""
+        names, used = [], set()
+        for document in documents:
+            name = DocumentDownloadService.get_download_name(document).replace('/', '-').replace('\\', '-')
+            if name.lower() in used:
+                stem, extension = os.path.splitext(name)
+                name = f"{stem} ({document.id}){extension}"
+            used.add(name.lower())
+            names.append(name)
+        return names
+
+    @staticmethod
+    def iter_content(document, chunk_size):
+        """Yields the document's original bytes in chunks of at most `chunk_size`."""
+        storage, name = document.file.storage, document.file.name
+        chunks = DocumentDownloadService.open_stream(storage, name, None, sys.maxsize, chunk_size)
+        if document.file_encoding:
+            return iter_decoded(chunks, document.file_encoding, chunk_size)
+        return chunks
+
+    @staticmethod
+    def stream(documents, chunk_size=None):
+        """
+        Yields the ZIP archive of `documents` piece by piece. A storage read error is re-raised,
+        which aborts the response mid-transfer.
+        Args:
+            documents (list[Document]): From `get_documents`.
+            chunk_size (int): Bytes read from storage at a time.
+        """
+        chunk_size = chunk_size or settings.DOCUMENT_DOWNLOAD_CHUNK_SIZE
+        buffer = ZipStreamBuffer()
+        with zipfile.ZipFile(buffer, mode='w', allowZip64=True) as archive:
+            for document, entry_name in zip(documents, DocumentBundleService.get_entry_names(documents)):
+                modified = timezone.localtime(document.updated_at)
+                info = zipfile.ZipInfo(entry_name, date_time=modified.timetuple()[:6])
+                info.external_attr = 0o644 << 16
+                info.compress_type = zipfile.ZIP_STORED if document.file_format in STORED_FORMATS else zipfile.ZIP_DEFLATED
+                info.file_size = document.file_size or 0
+                try:
+                    # Without a known size the entry might exceed 4 GiB, which needs ZIP64 up front.
+                    with archive.open(info, mode='w', force_zip64=document.file_size is None) as member:
+                        for block in DocumentBundleService.iter_content(document, chunk_size):
+                            member.write(block)
+                            yield buffer.drain()
+                except Exception as e:
+                    # Bytes are already sent, so the only honest signal left is a broken transfer: an
+                    # archive with a truncated member would look complete and carry the complete
+                    # archive's ETag.
+                    logger.error(f"Bundle aborted: could not read document {document.id} from storage: {e}")
+                    raise
+                yield buffer.drain()
+        yield buffer.drain()
+        logger.info(f"Streamed a bundle of {len(documents)} document(s) ({buffer.position} bytes).")
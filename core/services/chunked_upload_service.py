@@ -0,0 +1,298 @@
+# core/services/chunked_upload_service.py
+
+import os
+import re
+import uuid
+import shutil
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+from rest_framework import serializers
+
+from core.models import AcademicYear, Course, Document, UploadChunk, UploadSession, User
+from core.services.document_service import DocumentService
+
+logger = logging.getLogger(__name__)
+
+SessionStatus = UploadSession.SessionStatus
+
+CHECKSUM_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class ChunkedUploadService:
+    """
+    Resumable upload protocol for large documents:
+    1. `create_session` records the file size, chunk size and document metadata.
+    2. `write_chunk` streams one numbered chunk to a temporary file and verifies its SHA-256.
+       Chunks may arrive in any order and may be re-sent after a dropped connection.
+    3. `get_progress` reports which chunks (and byte ranges) the server already holds.
+    4. `complete_session` assembles the chunks and creates the Document through DocumentService.
+    Sessions that are never completed expire and are removed by `purge_expired_sessions`.
+    """
+    COPY_BUFFER_SIZE = 64 * 1024
+
+    @staticmethod
+    def get_session_dir(session_id):
+        return os.path.join(settings.CHUNKED_UPLOAD_TEMP_DIR, str(session_id))
+
+    @staticmethod
+    def get_chunk_path(session_id, index):
+        return os.path.join(ChunkedUploadService.get_session_dir(session_id), f"{index:06d}.part")
+
+    @staticmethod
+    def get_expiry():
+        return timezone.now() + timedelta(seconds=settings.CHUNKED_UPLOAD_SESSION_TTL_SECONDS)
+
+    @staticmethod
+    def create_session(validated_data, user: User) -> UploadSession:
+        """
+        Opens a new upload session.
+        Args:
+            validated_data (dict): Validated UploadSessionCreateSerializer data.
+            user (User): The uploading user.
+        Returns:
+            UploadSession: The new, active session.
+        """
+        session = UploadSession.objects.create(
+            user=user,
+            file_name=os.path.basename(validated_data['file_name']),
+            content_type=validated_data['content_type'],
+            total_size=validated_data['total_size'],
+            chunk_size=validated_data.get('chunk_size') or settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+            sha256=validated_data.get('sha256'),
+            metadata={
+                'title': validated_data['title'],
+                'doc_type': validated_data['doc_type'],
+                'course_id': validated_data['course'].id,
+                'academic_year_id': validated_data['academic_year'].id,
+                'semester_number': validated_data['semester_number'],
+            },
+            expires_at=ChunkedUploadService.get_expiry(),
+        )
+        os.makedirs(ChunkedUploadService.get_session_dir(session.id), exist_ok=True)
+        logger.info(f"Upload session {session.id} opened by {user.email} for '{session.file_name}' "
+                    f"({session.total_size} bytes in {session.total_chunks} chunk(s)).")
+        return session
+
+    @staticmethod
+    def get_session(session_id, user: User) -> UploadSession:
+        """
+        Returns the user's upload session.
+        Raises:
+            Http404: If the session does not exist or belongs to another user.
+        """
+        try:
+            return UploadSession.objects.get(id=session_id, user=user)
+        except UploadSession.DoesNotExist:
+            raise Http404("Upload session not found.")
+
+    @staticmethod
+    def ensure_active(session: UploadSession):
+        if session.status != SessionStatus.ACTIVE:
+            raise serializers.ValidationError({"detail": f"Upload session is {session.status}."})
+        if session.expires_at <= timezone.now():
+            raise serializers.ValidationError({"detail": "Upload session has expired."})
+
+    @staticmethod
+    def write_chunk(session: UploadSession, index: int, stream, checksum: str) -> UploadChunk:
+        """
+        Streams one chunk to temporary storage. Re-sending a chunk replaces it.
+        Args:
+            session (UploadSession): An active session.
+            index (int): Zero-based chunk number.
+            stream: File-like object holding the chunk body.
+            checksum (str): Hex SHA-256 of the chunk body.
+        Returns:
+            UploadChunk: The recorded chunk.
+        Raises:
+            ValidationError: If the index, size or checksum is wrong.
+        """
+        ChunkedUploadService.ensure_active(session)
+        if not 0 <= index < session.total_chunks:
+            raise serializers.ValidationError({"index": f"Chunk index must be between 0 and {session.total_chunks - 1}."})
+        checksum = (checksum or '').strip().lower()
+        if not CHECKSUM_PATTERN.match(checksum):
+            raise serializers.ValidationError({"checksum": "A hex SHA-256 checksum of the chunk is required."})
+
+        expected_size = session.expected_chunk_size(index)
+        chunk_path = ChunkedUploadService.get_chunk_path(session.id, index)
+        os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+        # A unique temporary name keeps concurrent retries of the same chunk from interleaving.
+        temp_path = f"{chunk_path}.{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, 'wb') as temp_file:
+                while True:
+                    block = stream.read(ChunkedUploadService.COPY_BUFFER_SIZE)
+                    if not block:
+                        break
+                    size += len(block)
+                    if size > expected_size:
+                        break
+                    digest.update(block)
+                    temp_file.write(block)
+
+            if size != expected_size:
+                raise serializers.ValidationError(
+                    {"detail": f"Chunk {index} must be exactly {expected_size} bytes."})
+            if digest.hexdigest() != checksum:
+                raise serializers.ValidationError({"checksum": f"Checksum mismatch for chunk {index}."})
+            os.replace(temp_path, chunk_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        chunk, _ = UploadChunk.objects.update_or_create(
+            session=session, index=index, defaults={'size': size, 'sha256': checksum},
+        )
+        # Each chunk keeps a slow but live upload from being garbage-collected.
+        UploadSession.objects.filter(id=session.id).update(expires_at=ChunkedUploadService.get_expiry())
+        return chunk
+
+    @staticmethod
+    def get_progress(session: UploadSession) -> dict:
+        """Describes which chunks and byte ranges have been received so a client can resume."""
+        received = list(session.chunks.order_by('index').values_list('index', flat=True))
+        received_set = set(received)
+        ranges = []
+        for index in received:
+            start = index * session.chunk_size
+            end = start + session.expected_chunk_size(index)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+        return {
+            'session_id': str(session.id),
+            'status': session.status,
+            'file_name': session.file_name,
+            'total_size': session.total_size,
+            'chunk_size': session.chunk_size,
+            'total_chunks': session.total_chunks,
+            'received_chunks': received,
+            'missing_chunks': [index for index in range(session.total_chunks) if index not in received_set],
+            'received_ranges': ranges,
+            'received_bytes': sum(end - start for start, end in ranges),
+            'expires_at': session.expires_at,
+            'document_id': session.document_id,
+        }
+
+    @staticmethod
+    def complete_session(session_id, user: User) -> Document:
+        """
+        Assembles all chunks in order and stores the result as a new Document.
+        Returns:
+            Document: The newly created (pending) document.
+        Raises:
+            Http404: If the session does not exist.
+            ValidationError: If chunks are missing or the whole-file checksum does not match.
+        """
+        with transaction.atomic():
+            try:
+                # Row lock so that two concurrent completes cannot create two documents.
+                session = UploadSession.objects.select_for_update().get(id=session_id, user=user)
+            except UploadSession.DoesNotExist:
+                raise Http404("Upload session not found.")
+            ChunkedUploadService.ensure_active(session)
+
+            missing = session.total_chunks - session.chunks.count()
+            if missing:
+                raise serializers.ValidationError({"detail": f"{missing} chunk(s) have not been uploaded yet."})
+
+            try:
+                course = Course.objects.get(id=session.metadata['course_id'])
+                academic_year = AcademicYear.objects.get(id=session.metadata['academic_year_id'])
+            except (Course.DoesNotExist, AcademicYear.DoesNotExist):
+                raise serializers.ValidationError({"detail": "The course or academic year no longer exists."})
+
+            session_dir = ChunkedUploadService.get_session_dir(session.id)
+            assembled_path = os.path.join(session_dir, 'assembled')
+            digest = hashlib.sha256()
+            with open(assembled_path, 'wb') as assembled:
+                for index in range(session.total_chunks):
+                    with open(ChunkedUploadService.get_chunk_path(session.id, index), 'rb') as chunk_file:
+                        while True:
+                            block = chunk_file.read(ChunkedUploadService.COPY_BUFFER_SIZE)
+                            if not block:
+                                break
+                            digest.update(block)
+                            assembled.write(block)
+
+            if session.sha256 and digest.hexdigest() != session.sha256.lower():
+                raise serializers.ValidationError({"sha256": "The assembled file does not match the declared checksum."})
+
+            # The storage backend streams the assembled file (S3 commits it as a multipart upload).
+            with open(assembled_path, 'rb') as assembled:
+                assembled_file = File(assembled, name=session.file_name)
+                assembled_file.sha256 = digest.hexdigest()
+                document = DocumentService.create_document({
+                    'file': assembled_file,
+                    'file_format': session.content_type,
+                    'title': session.metadata['title'],
+                    'doc_type': session.metadata['doc_type'],
+                    'course': course,
+                    'academic_year': academic_year,
+                    'semester_number': session.metadata['semester_number'],
+                }, user)
+
+            session.status = SessionStatus.COMPLETED
+            session.document = document
+            session.save(update_fields=['status', 'document', 'updated_at'])
+            transaction.on_commit(lambda: shutil.rmtree(session_dir, ignore_errors=True))
+
+        logger.info(f"Upload session {session.id} completed as document {document.id} by {user.email}.")
+        return document
+
+    @staticmethod
+    def abort_session(session: UploadSession):
+        """Discards an unfinished session and its temporary chunks."""
+        ChunkedUploadService.ensure_active(session)
+        session.status = SessionStatus.ABORTED
+        session.save(update_fields=['status', 'updated_at'])
+        session.chunks.all().delete()
+        shutil.rmtree(ChunkedUploadService.get_session_dir(session.id), ignore_errors=True)
+        logger.info(f"Upload session {session.id} aborted by {session.user.email}.")
+
+    @staticmethod
+    def purge_expired_sessions(now=None) -> int:
+        """
+        Garbage-collects abandoned uploads. Every session past its expiry is deleted with its
+        temporary chunks; completed and aborted sessions are kept until then so clients can
+        still query their outcome. Chunk directories with no session row are removed too, once
+        untouched for longer than the session TTL: a session created while the purge runs has
+        its directory before the purge could have seen its row.
+        Returns:
+            int: Number of sessions removed.
+        """
+        now = now or timezone.now()
+        session_ids = list(UploadSession.objects.filter(expires_at__lte=now).values_list('id', flat=True))
+        for session_id in session_ids:
+            shutil.rmtree(ChunkedUploadService.get_session_dir(session_id), ignore_errors=True)
+        UploadSession.objects.filter(id__in=session_ids).delete()
+
+        temp_dir = settings.CHUNKED_UPLOAD_TEMP_DIR
+        if os.path.isdir(temp_dir):
+            orphan_cutoff = (now - timedelta(seconds=settings.CHUNKED_UPLOAD_SESSION_TTL_SECONDS)).timestamp()
+            live_ids = {str(session_id) for session_id in UploadSession.objects.values_list('id', flat=True)}
+            for entry in os.listdir(temp_dir):
+                if entry in live_ids:
+                    continue
+                path = os.path.join(temp_dir, entry)
+                try:
+                    # Writing a chunk updates its directory's mtime.
+                    if os.path.getmtime(path) > orphan_cutoff:
+                        continue
+                except OSError:
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+
+        if session_ids:
+            logger.info(f"Purged {len(session_ids)} expired upload session(s).")
+        return len(session_ids)
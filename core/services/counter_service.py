@@ -0,0 +1,198 @@
+# core/services/counter_service.py
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, F, PositiveBigIntegerField, Value, When
+
+from core.models import Document
+
+logger = logging.getLogger(__name__)
+
+COUNTER_BACKEND_MEMORY = 'memory'
+COUNTER_BACKEND_CACHE = 'cache'
+
+
+class DocumentCounterService:
+    """
+    Write-behind view and download counters. A request only adds to an in-memory tally
+    (this process's, or the shared cache's with DOCUMENT_COUNTERS_BACKEND='cache'); a
+    background thread writes the tallies to the database every DOCUMENT_COUNTERS_FLUSH_SECONDS
+    with a few set-based UPDATEs, so hot documents never serialize requests on their row lock.
+    Increments not yet flushed when a process dies are lost (at most one flush interval).
+    """
+    VIEWS = 'view_count'
+    DOWNLOADS = 'download_count'
+    FIELDS = (VIEWS, DOWNLOADS)
+    CACHE_KEY_PREFIX = 'document-counter'
+    FLUSH_LOCK_KEY = 'document-counter:flush-lock'
+    FLUSH_LOCK_TIMEOUT = 60
+
+    _lock = threading.Lock()
+    # {(field, document_id): increments}; with the cache backend only the keys this process
+    # touched are tracked here (the counts live in the cache).
+    _pending = {}
+    _flusher = None
+    _stop = threading.Event()
+
+    @staticmethod
+    def get_cache_key(field, document_id):
+        return f"{DocumentCounterService.CACHE_KEY_PREFIX}:{field}:{document_id}"
+
+    @staticmethod
+    def increment(document_id, field, amount=1):
+        """
+        Counts a view or download; never touches the database.
+        Args:
+            document_id (int): The viewed or downloaded document.
+            field (str): VIEWS or DOWNLOADS.
+            amount (int): Number of events to add.
+        """
+        if not settings.DOCUMENT_COUNTERS_ENABLED:
+            return
+        if field not in DocumentCounterService.FIELDS:
+            raise ValueError(f"Unknown counter '{field}'.")
+        key = (field, document_id)
+        if settings.DOCUMENT_COUNTERS_BACKEND == COUNTER_BACKEND_CACHE:
+            cache_key = DocumentCounterService.get_cache_key(field, document_id)
+            # incr() is atomic on shared caches but requires an existing key.
+            cache.add(cache_key, 0, timeout=None)
+            try:
+                cache.incr(cache_key, amount)
+            except ValueError:
+                # Evicted between add() and incr(); the event is dropped like an unflushed one.
+                return
+            with DocumentCounterService._lock:
+                DocumentCounterService._pending[key] = 0
+        else:
+            with DocumentCounterService._lock:
+                DocumentCounterService._pending[key] = DocumentCounterService._pending.get(key, 0) + amount
+        DocumentCounterService.start_flusher()
+
+    @staticmethod
+    def is_download_start(response):
+        """True for responses that start a download: a full file, or a range beginning at byte 0."""
+        if response.status_code == 200:
+            return True
+        return response.status_code == 206 and response.get('Content-Range', '').startswith('bytes 0-')
+
+    @staticmethod
+    def start_flusher():
+        """Starts this process's background flusher on first use; a no-op if DOCUMENT_COUNTERS_FLUSH_SECONDS is 0."""
+        if settings.DOCUMENT_COUNTERS_FLUSH_SECONDS <= 0 or DocumentCounterService._flusher is not None:
+            return
+        with DocumentCounterService._lock:
+            if DocumentCounterService._flusher is None:
+                DocumentCounterService._flusher = threading.Thread(
+                    target=DocumentCounterService._run_flusher, name='document-counters', daemon=True)
+                DocumentCounterService._flusher.start()
+                # A graceful shutdown writes what is left instead of losing the last interval.
+                atexit.register(DocumentCounterService.flush)
+
+    @staticmethod
+    def _run_flusher():
+        while not DocumentCounterService._stop.wait(settings.DOCUMENT_COUNTERS_FLUSH_SECONDS):
+            try:
+                DocumentCounterService.flush()
+            except Exception as e:
+                logger.exception(f"Flushing document counters failed: {e}")
+            finally:
+                connection.close()
+
+    @staticmethod
+    def take_pending() -> dict:
+        """
+        Removes and returns the accumulated increments.
+        Returns:
+            dict: {(field, document_id): increments}, zero counts omitted.
+        """
+        with DocumentCounterService._lock:
+            pending, DocumentCounterService._pending = DocumentCounterService._pending, {}
+        if settings.DOCUMENT_COUNTERS_BACKEND != COUNTER_BACKEND_CACHE:
+            return {key: count for key, count in pending.items() if count}
+        if not pending:
+            return {}
+
+        # Read-then-decrement is not atomic across processes, so one process flushes at a time.
+        if not cache.add(DocumentCounterService.FLUSH_LOCK_KEY, True, timeout=DocumentCounterService.FLUSH_LOCK_TIMEOUT):
+            DocumentCounterService.restore(pending)
+            return {}
+        try:
+            cache_keys = {DocumentCounterService.get_cache_key(*key): key for key in pending}
+            taken = {}
+            for cache_key, count in cache.get_many(list(cache_keys)).items():
+                if not count:
+                    continue
+                try:
+                    # Decrementing (rather than deleting) keeps increments made since the read.
+                    cache.decr(cache_key, count)
+                except ValueError:
+                    continue
+                taken[cache_keys[cache_key]] = count
+            return taken
+        finally:
+            cache.delete(DocumentCounterService.FLUSH_LOCK_KEY)
+
+    @staticmethod
+    def restore(counts):
+        """Puts increments back after a failed write, to be retried by the next flush."""
+        if settings.DOCUMENT_COUNTERS_BACKEND == COUNTER_BACKEND_CACHE:
+            for (field, document_id), count in counts.items():
+                if count:
+                    DocumentCounterService.increment(document_id, field, count)
+                else:
+                    with DocumentCounterService._lock:
+                        DocumentCounterService._pending.setdefault((field, document_id), 0)
+            return
+        with DocumentCounterService._lock:
+            for key, count in counts.items():
+                DocumentCounterService._pending[key] = DocumentCounterService._pending.get(key, 0) + count
+
+    @staticmethod
+    def write_counts(counts) -> int:
+        """
+        Adds the increments to the documents with one UPDATE per batch of documents,
+        e.g. SET view_count = view_count + CASE id WHEN 7 THEN 3 ... END WHERE id IN (...).
+        `update()` leaves updated_at alone, so counting does not invalidate cached representations.
+        Args:
+            counts (dict): {(field, document_id): increments}.
+        Returns:
+            int: Number of document rows updated; deleted documents match no row.
+        """
+        document_ids = sorted({document_id for _, document_id in counts})
+        batch_size = settings.DOCUMENT_COUNTERS_BATCH_SIZE
+        updated = 0
+        # Ascending IDs, so concurrent flushes from several processes lock rows in the same order.
+        for start in range(0, len(document_ids), batch_size):
+            batch = document_ids[start:start + batch_size]
+            changes = {}
+            for field in DocumentCounterService.FIELDS:
+                whens = [When(id=document_id, then=Value(counts[(field, document_id)]))
+                         for document_id in batch if counts.get((field, document_id))]
+                if whens:
+                    changes[field] = F(field) + Case(*whens, default=Value(0),
+                                                     output_field=PositiveBigIntegerField())
+            updated += Document.objects.filter(id__in=batch).update(**changes)
+        return updated
+
+    @staticmethod
+    def flush() -> int:
+        """
+        Writes all accumulated increments to the database.
+        Returns:
+            int: Number of document rows updated.
+        """
+        counts = DocumentCounterService.take_pending()
+        if not counts:
+            return 0
+        try:
+            updated = DocumentCounterService.write_counts(counts)
+        except Exception:
+            DocumentCounterService.restore(counts)
+            raise
+        logger.info(f"Flushed {sum(counts.values())} document counter increment(s) to {updated} document(s).")
+        return updated
@@ -23,7 +23,8 @@ class DashboardService:
             active_users = User.objects.filter(is_active=True).count()
 
             users_by_role = dict(
-                User.objects.values('role').annotate(count=Count('id')).order_by('role').values_list('role', 'count'))
+                User.objects.values('role_name').annotate(count=Count('id')).order_by('role_name')
+                .values_list('role_name', 'count'))
 
             total_documents = Document.objects.count()
             documents_pending_review = Document.objects.filter(status='pending').count()
@@ -0,0 +1,191 @@
+# core/services/direct_upload_service.py
+
+import os
+import re
+import uuid
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from core.models import AcademicYear, Course, DirectUpload, Document, User
+from core.services.document_service import DocumentService
+from core.utils.content_hashing import HASH_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_TOKEN_SALT = 'core.direct-upload'
+
+
+class DirectUploadNotSupported(Exception):
+    """Raised when the configured storage backend cannot issue presigned uploads."""
+
+
+class DirectUploadService:
+    """
+    Two-step upload flow in which the client sends the file bytes straight to the
+    S3-compatible bucket and Django only handles metadata:
+    1. `create_upload` validates the metadata and returns a presigned POST for a new key.
+    2. `finalize_upload` checks the object landed with an acceptable size and then
+       creates the Document through DocumentService. The object is streamed once to hash it,
+       so direct uploads are flagged as duplicates like any other upload. A DirectUpload row
+       claims the key in the same transaction, so each upload yields at most one Document.
+    """
+
+    @staticmethod
+    def get_storage():
+        storage = default_storage
+        if not (hasattr(storage, 'bucket_name') and hasattr(storage, 'connection')):
+            raise DirectUploadNotSupported("Direct uploads require an S3-compatible storage backend.")
+        return storage
+
+    @staticmethod
+    def build_key(file_name, extension):
+        """Returns a fresh, collision-free storage name such as documents/<uuid>/<name>.pdf."""
+        stem = os.path.splitext(os.path.basename(file_name))[0]
+        stem = re.sub(r'[^A-Za-z0-9._-]+', '_', stem).strip('._')[:100] or 'document'
+        return f"documents/{uuid.uuid4().hex}/{stem}{extension}"
+
+    @staticmethod
+    def create_upload(validated_data, user: User) -> dict:
+        """
+        Issues a presigned POST for a new document object.
+        Args:
+            validated_data (dict): Validated DirectUploadRequestSerializer data.
+            user (User): The uploading user.
+        Returns:
+            dict: The POST url and form fields, the storage key and a signed upload token.
+        Raises:
+            DirectUploadNotSupported: If the storage backend is not S3-compatible.
+        """
+        storage = DirectUploadService.get_storage()
+        content_type = validated_data['content_type']
+        key = DirectUploadService.build_key(validated_data['file_name'], validated_data['extension'])
+        max_size = settings.DIRECT_UPLOAD_MAX_SIZE
+        expires_in = settings.DIRECT_UPLOAD_EXPIRY_SECONDS
+
+        presigned = storage.connection.meta.client.generate_presigned_post(
+            Bucket=storage.bucket_name,
+            Key=storage._normalize_name(key),
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, max_size],
+            ],
+            ExpiresIn=expires_in,
+        )
+
+        upload_token = signing.dumps({
+            'key': key,
+            'user_id': user.id,
+            'content_type': content_type,
+            'title': validated_data['title'],
+            'doc_type': validated_data['doc_type'],
+            'course_id': validated_data['course'].id,
+            'academic_year_id': validated_data['academic_year'].id,
+            'semester_number': validated_data['semester_number'],
+        }, salt=UPLOAD_TOKEN_SALT)
+
+        logger.info(f"Issued direct upload for key '{key}' to {user.email}.")
+        return {
+            'url': presigned['url'],
+            'fields': presigned['fields'],
+            'key': key,
+            'upload_token': upload_token,
+            'expires_in': expires_in,
+            'max_size': max_size,
+        }
+
+    @staticmethod
+    def finalize_upload(upload_token: str, user: User) -> Document:
+        """
+        Verifies that the presigned upload completed and creates its Document.
+        Args:
+            upload_token (str): Token returned by `create_upload`.
+            user (User): The user finalizing; must be the one who requested the upload.
+        Returns:
+            Document: The newly created (pending) document.
+        Raises:
+            ValidationError: If the token is invalid or expired, or the object is missing or too large.
+        """
+        storage = DirectUploadService.get_storage()
+        try:
+            payload = signing.loads(upload_token, salt=UPLOAD_TOKEN_SALT,
+                                    max_age=settings.DIRECT_UPLOAD_FINALIZE_WINDOW_SECONDS)
+        except signing.SignatureExpired:
+            raise serializers.ValidationError({"upload_token": "Upload token has expired."})
+        except signing.BadSignature:
+            raise serializers.ValidationError({"upload_token": "Invalid upload token."})
+
+        if payload['user_id'] != user.id:
+            raise serializers.ValidationError({"upload_token": "This upload belongs to another user."})
+
+        key = payload['key']
+        # Cheap early exit for retries; the claim below is what makes finalizing exclusive.
+        if DirectUploadService.is_finalized(key):
+            raise serializers.ValidationError({"upload_token": "This upload has already been finalized."})
+
+        client = storage.connection.meta.client
+        try:
+            head = client.head_object(Bucket=storage.bucket_name, Key=storage._normalize_name(key))
+        except client.exceptions.ClientError as e:
+            logger.warning(f"Finalize for '{key}' by {user.email} found no object: {e}")
+            raise serializers.ValidationError({"upload_token": "The file has not been uploaded yet."})
+
+        size = head['ContentLength']
+        if not 0 < size <= settings.DIRECT_UPLOAD_MAX_SIZE:
+            client.delete_object(Bucket=storage.bucket_name, Key=storage._normalize_name(key))
+            raise serializers.ValidationError({"file": f"Uploaded file size ({size} bytes) is not allowed."})
+
+        try:
+            course = Course.objects.get(id=payload['course_id'])
+            academic_year = AcademicYear.objects.get(id=payload['academic_year_id'])
+        except (Course.DoesNotExist, AcademicYear.DoesNotExist):
+            raise serializers.ValidationError({"detail": "The course or academic year no longer exists."})
+
+        content_hash = DirectUploadService.hash_object(storage, key)
+
+        try:
+            with transaction.atomic():
+                # A concurrent finalize of the same key blocks on, then fails, the unique constraint.
+                claim = DirectUpload.objects.create(key=key, user=user)
+                document = DocumentService.create_document({
+                    'file': key,
+                    'file_format': payload['content_type'],
+                    'content_hash': content_hash,
+                    'file_size': size,
+                    'stored_size': size,
+                    'title': payload['title'],
+                    'doc_type': payload['doc_type'],
+                    'course': course,
+                    'academic_year': academic_year,
+                    'semester_number': payload['semester_number'],
+                }, user)
+                claim.document = document
+                claim.save(update_fields=['document', 'updated_at'])
+        except IntegrityError:
+            logger.info(f"Finalize for '{key}' by {user.email} lost to an earlier finalize.")
+            raise serializers.ValidationError({"upload_token": "This upload has already been finalized."})
+        return document
+
+    @staticmethod
+    def hash_object(storage, key: str) -> str:
+        """Returns the hex SHA-256 of a stored object, streaming it without buffering the whole file."""
+        client = storage.connection.meta.client
+        body = client.get_object(Bucket=storage.bucket_name, Key=storage._normalize_name(key))['Body']
+        digest = hashlib.sha256()
+        try:
+            for block in body.iter_chunks(HASH_CHUNK_SIZE):
+                digest.update(block)
+        finally:
+            body.close()
+        return digest.hexdigest()
+
+    @staticmethod
+    def is_finalized(key: str) -> bool:
+        """Whether a Document has already been created for this upload key."""
+        return DirectUpload.objects.filter(key=key).exists()
@@ -1,15 +1,32 @@
 # core/services/document_service.py
 
 import logging
+from collections import namedtuple
+from django.conf import settings
 from django.db import transaction, IntegrityError
+from django.utils import timezone
 from django.shortcuts import get_object_or_404
-from django.db.models import QuerySet # <--- ADD THIS IMPORT
+from django.db.models import F, OuterRef, QuerySet, Subquery # <--- ADD THIS IMPORT
 
-from core.models import Document, User # Import Document and User models
+from core.models import Document, DocumentOriginal, UploadLog, User # Import Document and User models
+from core.models.base import DocumentStatus
+from core.services.search_service import SearchService
+from core.services.facet_service import FacetService
+from core.services.storage_deletion_service import StorageDeletionService
+from core.services.extraction_service import TextExtractionService
+from core.services.preview_service import PreviewService
+from core.services.image_processing_service import ImageProcessingService
+from core.utils.compression import CompressingStorage, encoded_name, get_upload_encoding
+from core.utils.content_hashing import content_addressed_name, sha256_file
 from rest_framework import serializers # Make sure this is imported if you're raising serializers.ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Result of DocumentService.store_file; `encoding` is '' for files stored as received, and
+# `reused` is set when identical bytes were already stored.
+StoredFile = namedtuple('StoredFile', ['name', 'content_hash', 'encoding', 'size', 'stored_size', 'reused'],
+                        defaults=[False])
+
 class DocumentService:
     """
     A service layer for all document-related business logic.
@@ -32,17 +49,36 @@ class DocumentService:
         try:
             with transaction.atomic():
                 validated_data['uploader'] = uploader
-                validated_data['status'] = Document.DocumentStatus.PENDING # Default to pending
+                validated_data['status'] = DocumentStatus.PENDING # Default to pending
 
-                # Extract file object to get content_type for file_format
+                # Extract file object to get content_type for file_format, unless the caller
+                # already knows it (e.g. a direct upload that only passes a storage key).
                 uploaded_file = validated_data.get('file')
-                if uploaded_file:
-                    validated_data['file_format'] = uploaded_file.content_type
-                else:
-                    validated_data['file_format'] = None # Or handle as required
+                if 'file_format' not in validated_data:
+                    validated_data['file_format'] = getattr(uploaded_file, 'content_type', None) if uploaded_file else None
+
+                # Keys of files already in storage (direct uploads) are kept, with the hash and sizes
+                # the caller measured; received bytes are stored content-addressed so an identical
+                # file is kept only once.
+                if uploaded_file and not isinstance(uploaded_file, str):
+                    stored = DocumentService.store_file(uploaded_file, validated_data['file_format'])
+                    validated_data.update(DocumentService.get_stored_file_fields(stored))
+                validated_data['duplicate_of_id'] = DocumentService.find_original_id(validated_data.get('content_hash'))
 
+                validated_data['image_processing_status'] = ImageProcessingService.get_initial_status(
+                    validated_data['file_format'])
                 document = Document.objects.create(**validated_data)
+                SearchService.index_documents([document.id])
+                if document.image_processing_status:
+                    # Previews and text follow once the image has been re-encoded.
+                    ImageProcessingService.schedule([document.id])
+                else:
+                    TextExtractionService.schedule([document.id])
+                    PreviewService.schedule([document.id])
+                FacetService.invalidate_on_commit()
                 logger.info(f"Document '{document.title}' (ID: {document.id}) created by {uploader.email}.")
+                if document.duplicate_of_id:
+                    logger.info(f"Document {document.id} is an exact duplicate of document {document.duplicate_of_id}.")
                 return document
         except IntegrityError as e:
             logger.error(f"Integrity error creating document: {e}", exc_info=True)
@@ -51,6 +87,119 @@ class DocumentService:
             logger.error(f"Unexpected error creating document: {e}", exc_info=True)
             raise serializers.ValidationError({"detail": f"Failed to create document: {str(e)}"})
 
+    @staticmethod
+    def create_scan_document(validated_data, pages, uploader: User) -> Document:
+        """
+        Creates a PDF document from several page images. The pages are stored as the document's
+        originals and stitched into the PDF in the background; until then the document has no file.
+        Args:
+            validated_data (dict): Validated ScanUploadSerializer metadata.
+            pages (list[UploadedFile]): Page images (JPEG/PNG), in page order.
+            uploader (User): The user uploading the scan.
+        Returns:
+            Document: The newly created (pending) document.
+        """
+        try:
+            with transaction.atomic():
+                document = Document.objects.create(
+                    uploader=uploader, status=DocumentStatus.PENDING, file='', file_format='application/pdf',
+                    image_processing_status=Document.ImageProcessingStatus.PENDING, **validated_data,
+                )
+                originals = []
+                for position, page in enumerate(pages):
+                    stored = DocumentService.store_file(page)
+                    originals.append(DocumentOriginal(document=document, position=position, file=stored.name,
+                                                      file_format=page.content_type, file_size=stored.size))
+                DocumentOriginal.objects.bulk_create(originals)
+                SearchService.index_documents([document.id])
+                ImageProcessingService.schedule([document.id])
+                FacetService.invalidate_on_commit()
+                logger.info(f"Scan '{document.title}' (ID: {document.id}) of {len(pages)} page(s) "
+                            f"created by {uploader.email}.")
+                return document
+        except Exception as e:
+            logger.error(f"Unexpected error creating scan document: {e}", exc_info=True)
+            raise serializers.ValidationError({"detail": f"Failed to create document: {str(e)}"})
+
+    @staticmethod
+    def store_file(uploaded_file, content_type=None) -> StoredFile:
+        """
+        Saves a file under a name derived from its SHA-256, unless identical bytes are already stored.
+        The digest computed while the upload was received (`uploaded_file.sha256`) is reused when present.
+        Text-like formats are gzip-compressed at rest (see DOCUMENT_COMPRESSION_CONTENT_TYPES).
+        Call it inside the transaction that references the file: the storage deletion outbox
+        cannot delete the object until that transaction ends. Callers that store first and
+        reference later must re-check reused objects with StorageDeletionService.claim_stored.
+        Args:
+            uploaded_file (File): The received file.
+            content_type (str): The document's format; defaults to the upload's content type.
+        Returns:
+            StoredFile: Storage name, hex SHA-256 digest, content coding and original/stored sizes.
+        """
+        content_hash = getattr(uploaded_file, 'sha256', None) or sha256_file(uploaded_file)
+        content_type = content_type or getattr(uploaded_file, 'content_type', None)
+        storage = CompressingStorage(Document._meta.get_field('file').storage)
+        encoding = get_upload_encoding(content_type, uploaded_file.size) or ''
+        name = encoded_name(content_addressed_name(content_hash, uploaded_file.name), encoding)
+        StorageDeletionService.lock_for_reuse([name])
+        if storage.exists(name):
+            logger.info(f"Stored object '{name}' already exists; sharing it instead of uploading again.")
+            return StoredFile(name, content_hash, encoding, uploaded_file.size, storage.size(name), reused=True)
+
+        name, size, stored_size = storage.save_encoded(content_addressed_name(content_hash, uploaded_file.name),
+                                                       uploaded_file, encoding)
+        if encoding:
+            logger.info(f"Stored '{name}' {encoding}-compressed: {size} -> {stored_size} bytes "
+                        f"({size - stored_size} saved).")
+        return StoredFile(name, content_hash, encoding, size, stored_size)
+
+    @staticmethod
+    def get_stored_file_fields(stored: StoredFile) -> dict:
+        """Document field values describing a file saved by `store_file`."""
+        return {
+            'file': stored.name,
+            'content_hash': stored.content_hash,
+            'file_encoding': stored.encoding,
+            'file_size': stored.size,
+            'stored_size': stored.stored_size,
+        }
+
+    @staticmethod
+    def get_compression_stats() -> dict:
+        """
+        Bytes saved by at-rest compression, counting each stored object once
+        (content-addressed duplicates share their object).
+        """
+        objects = (Document.objects.exclude(file_encoding='').exclude(file_size=None).exclude(stored_size=None)
+                   .values_list('file', 'file_size', 'stored_size').distinct())
+        sizes = {name: (size, stored_size) for name, size, stored_size in objects}
+        original = sum(size for size, _ in sizes.values())
+        stored = sum(stored_size for _, stored_size in sizes.values())
+        return {'objects': len(sizes), 'original_bytes': original, 'stored_bytes': stored,
+                'saved_bytes': original - stored}
+
+    @staticmethod
+    def find_original_id(content_hash):
+        """Returns the ID of the earliest document with these exact contents, or None."""
+        if not content_hash:
+            return None
+        return Document.objects.filter(content_hash=content_hash).order_by('id').values_list('id', flat=True).first()
+
+    @staticmethod
+    def mark_duplicates(document_ids) -> int:
+        """
+        Points each of the given hashed documents at the earliest document sharing its hash.
+        Returns:
+            int: Number of documents flagged as duplicates.
+        """
+        earliest = Document.objects.filter(content_hash=OuterRef('content_hash')).order_by('id').values('id')[:1]
+        candidates = Document.objects.filter(id__in=list(document_ids), content_hash__isnull=False)
+        with transaction.atomic():
+            candidates.update(duplicate_of=Subquery(earliest))
+            # The earliest copy now points at itself; it is the original, not a duplicate.
+            Document.objects.filter(id__in=list(document_ids), duplicate_of=F('id')).update(duplicate_of=None)
+        return candidates.filter(duplicate_of__isnull=False).count()
+
     @staticmethod
     def update_document_metadata(document_id: int, validated_data) -> Document:
         """
@@ -72,6 +221,8 @@ class DocumentService:
                 for attr, value in validated_data.items():
                     setattr(document, attr, value)
                 document.save()
+                SearchService.index_documents([document.id])
+                FacetService.invalidate_on_commit()
                 logger.info(f"Document '{document.title}' (ID: {document.id}) metadata updated.")
                 return document
         except Exception as e:
@@ -95,19 +246,80 @@ class DocumentService:
         document = get_object_or_404(Document, id=document_id)
 
         # Basic validation for status choices
-        if new_status not in [choice[0] for choice in Document.DocumentStatus.choices]:
+        if new_status not in [choice[0] for choice in DocumentStatus.choices]:
             raise serializers.ValidationError({"new_status": "Invalid document status."})
 
         try:
             with transaction.atomic():
                 document.status = new_status
+                # A decision ends any review-queue claim on the document.
+                document.review_claimed_by = None
+                document.review_claim_expires_at = None
                 document.save()
+                FacetService.invalidate_on_commit()
                 logger.info(f"Document '{document.title}' (ID: {document.id}) status changed to '{new_status}' by {reviewer.email}.")
                 return document
         except Exception as e:
             logger.error(f"Error changing document status (ID: {document_id}) to {new_status}: {e}", exc_info=True)
             raise serializers.ValidationError({"detail": f"Failed to change document status: {str(e)}"})
 
+    @staticmethod
+    def bulk_change_status(changes, reviewer: User) -> dict:
+        """
+        Applies many review decisions at once. Statuses are written with one set-based UPDATE
+        per target status (per batch of IDs) inside a single transaction, and one UploadLog
+        row per changed document is written with bulk_create.
+        Args:
+            changes (iterable[tuple[int, str]]): (document ID, new status) pairs.
+            reviewer (User): The user performing the review.
+        Returns:
+            dict: Outcome per document ID: 'updated', 'unchanged', 'not_found' or
+            'conflict' (the same ID was given two different statuses).
+        """
+        targets, outcomes = {}, {}
+        for document_id, new_status in changes:
+            if targets.get(document_id, new_status) != new_status:
+                outcomes[document_id] = 'conflict'
+            targets[document_id] = new_status
+        for document_id in outcomes:
+            del targets[document_id]
+
+        batch_size = settings.DOCUMENT_BULK_BATCH_SIZE
+        ids = list(targets)
+        now = timezone.now()
+        with transaction.atomic():
+            current = {}
+            for start in range(0, len(ids), batch_size):
+                current.update(Document.objects.select_for_update()
+                               .filter(id__in=ids[start:start + batch_size]).values_list('id', 'status'))
+
+            by_status = {}
+            for document_id, new_status in targets.items():
+                if document_id not in current:
+                    outcomes[document_id] = 'not_found'
+                elif current[document_id] == new_status:
+                    outcomes[document_id] = 'unchanged'
+                else:
+                    outcomes[document_id] = 'updated'
+                    by_status.setdefault(new_status, []).append(document_id)
+
+            for new_status, status_ids in by_status.items():
+                for start in range(0, len(status_ids), batch_size):
+                    # update() bypasses auto_now, so updated_at is set explicitly.
+                    Document.objects.filter(id__in=status_ids[start:start + batch_size]).update(
+                        status=new_status, updated_at=now, review_claimed_by=None, review_claim_expires_at=None)
+
+            UploadLog.objects.bulk_create([
+                UploadLog(document_id=document_id, status=new_status, reviewer=reviewer, review_time=now)
+                for new_status, status_ids in by_status.items() for document_id in status_ids
+            ], batch_size=batch_size)
+            if by_status:
+                FacetService.invalidate_on_commit()
+
+        updated = sum(len(status_ids) for status_ids in by_status.values())
+        logger.info(f"{reviewer.email} bulk-reviewed {len(outcomes)} document(s); {updated} status change(s) applied.")
+        return outcomes
+
     @staticmethod
     def delete_document(document_id: int):
         """
@@ -122,19 +334,25 @@ class DocumentService:
         document_title = document.title
         try:
             with transaction.atomic():
-                # Deleting the model instance that has a FileField will
-                # automatically delete the associated file from S3-compatible storage
-                # if DEFAULT_FILE_STORAGE is set to S3Boto3Storage.
+                SearchService.remove_documents([document.id])
+                # The stored file and preview are queued in the same transaction and deleted by a
+                # background worker after commit, so no storage round trip holds the transaction
+                # open and a rollback never leaves the row pointing at a deleted object.
+                StorageDeletionService.enqueue([document.file.name, document.preview.name,
+                                                *document.originals.values_list('file', flat=True)])
                 document.delete()
+                FacetService.invalidate_on_commit()
                 logger.info(f"Document '{document_title}' (ID: {document.id}) deleted successfully.")
         except Exception as e:
             logger.error(f"Error deleting document (ID: {document_id}): {e}", exc_info=True)
             raise serializers.ValidationError({"detail": f"Failed to delete document: {str(e)}"})
 
     @staticmethod
-    def get_document(document_id: int) -> Document:
-        """Retrieves a single document by ID."""
-        return get_object_or_404(Document.objects.select_related('course', 'academic_year', 'uploader'), id=document_id)
+    def get_document(document_id: int, queryset: QuerySet = None) -> Document:
+        """Retrieves a single document by ID, optionally from a narrowed queryset."""
+        if queryset is None:
+            queryset = Document.objects.select_related('course', 'academic_year', 'uploader')
+        return get_object_or_404(queryset, id=document_id)
 
     @staticmethod
     def get_all_documents(filter_kwargs=None) -> QuerySet: # <--- QuerySet type hint now recognized
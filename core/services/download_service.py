@@ -0,0 +1,255 @@
+# core/services/download_service.py
+
+import os
+import sys
+import hashlib
+import logging
+import mimetypes
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from core.models import Document, User
+from core.utils.compression import decoded_name, open_decoded
+
+logger = logging.getLogger(__name__)
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header lies entirely outside the file."""
+
+
+class DocumentDownloadService:
+    """
+    Serves document bytes through the API so that downloads are access-controlled,
+    cacheable with validators and resumable with byte ranges.
+    - Local filesystem storage hands the file to the web server (X-Sendfile / X-Accel-Redirect)
+      when configured, or to FileResponse, which uses the WSGI server's zero-copy file wrapper.
+    - Remote storage is streamed in bounded chunks; S3 ranges are fetched with a ranged GET.
+    - Files compressed at rest are sent as stored with Content-Encoding to clients that accept
+      the coding, and decompressed on the fly (without range support) for those that do not.
+    """
+
+    @staticmethod
+    def get_etag(document: Document, encoding=None) -> str:
+        """
+        Strong validator: the content hash when known, else the immutable storage name and modification time.
+        A content-coded representation has different bytes, so it gets its own validator.
+        """
+        suffix = f"-{encoding}" if encoding else ''
+        if document.content_hash:
+            return f'"{document.content_hash}{suffix}"'
+        token = hashlib.sha256(f"{document.file.name}:{document.updated_at.isoformat()}".encode()).hexdigest()
+        return f'"{token[:32]}{suffix}"'
+
+    @staticmethod
+    def accepts_encoding(request, encoding) -> bool:
+        """Whether the Accept-Encoding header allows `encoding` (an explicit q=0 refuses it)."""
+        for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+            coding, _, params = item.partition(';')
+            if coding.strip().lower() in (encoding, '*'):
+                params = params.strip().replace(' ', '')
+                try:
+                    return not params.startswith('q=') or float(params[2:]) > 0
+                except ValueError:
+                    return True
+        return False
+
+    @staticmethod
+    def get_last_modified(document: Document) -> int:
+        return int(document.updated_at.timestamp())
+
+    @staticmethod
+    def parse_range(header, size):
+        """
+        Parses a single `bytes=` range.
+        Returns:
+            tuple | None: Inclusive (start, end) offsets, or None to serve the whole file
+            (no header, a malformed header or a multi-range request).
+        Raises:
+            RangeNotSatisfiable: If the range starts beyond the end of the file.
+        """
+        if not header or not header.startswith('bytes='):
+            return None
+        spec = header[len('bytes='):].strip()
+        if ',' in spec:
+            # multipart/byteranges is not supported; a full 200 response is a valid answer.
+            return None
+        first, separator, last = spec.partition('-')
+        if not separator:
+            return None
+        try:
+            if not first:
+                suffix_length = int(last)
+                if suffix_length <= 0 or size == 0:
+                    raise RangeNotSatisfiable()
+                return max(size - suffix_length, 0), size - 1
+            start = int(first)
+            end = int(last) if last else size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            raise RangeNotSatisfiable()
+        if end < start:
+            return None
+        return start, min(end, size - 1)
+
+    @staticmethod
+    def range_applies(request, etag, last_modified):
+        """Honours If-Range: a range is only served if the client's copy is still current."""
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if not if_range:
+            return True
+        if if_range.startswith('"'):
+            return if_range == etag
+        return parse_http_date_safe(if_range) == last_modified
+
+    @staticmethod
+    def get_local_path(storage, name):
+        try:
+            return storage.path(name)
+        except NotImplementedError:
+            return None
+
+    @staticmethod
+    def iter_file(file, start, length, chunk_size):
+        """Yields `length` bytes from `file` starting at `start`, at most `chunk_size` at a time."""
+        try:
+            if start:
+                file.seek(start)
+            remaining = length
+            while remaining > 0:
+                block = file.read(min(chunk_size, remaining))
+                if not block:
+                    break
+                remaining -= len(block)
+                yield block
+        finally:
+            file.close()
+
+    @staticmethod
+    def iter_s3_object(storage, name, byte_range, chunk_size):
+        """Streams an S3 object (or a range of it) without downloading it to a local buffer first."""
+        params = {'Bucket': storage.bucket_name, 'Key': storage._normalize_name(name)}
+        if byte_range:
+            params['Range'] = f"bytes={byte_range[0]}-{byte_range[1]}"
+        body = storage.connection.meta.client.get_object(**params)['Body']
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    @staticmethod
+    def open_stream(storage, name, byte_range, size, chunk_size):
+        start, end = byte_range or (0, size - 1)
+        if hasattr(storage, 'bucket_name') and hasattr(storage, 'connection'):
+            return DocumentDownloadService.iter_s3_object(storage, name, byte_range, chunk_size)
+        return DocumentDownloadService.iter_file(storage.open(name, 'rb'), start, end - start + 1, chunk_size)
+
+    @staticmethod
+    def set_headers(response, headers):
+        for header, value in headers.items():
+            response[header] = value
+
+    @staticmethod
+    def get_download_name(document: Document) -> str:
+        extension = os.path.splitext(decoded_name(document.file.name))[1]
+        return f"{document.title}{extension}"
+
+    @staticmethod
+    def build_response(request, document: Document, user: User):
+        """
+        Builds the download response for a document the user is allowed to access.
+        Args:
+            request: The incoming request (for Range and conditional headers).
+            document (Document): The document to serve.
+            user (User): The downloading user, for the access log.
+        Returns:
+            HttpResponse: 200, 206, 304, 412 or 416 response.
+        Raises:
+            FileNotFoundError: If the document has no stored file.
+        """
+        if not document.file:
+            raise FileNotFoundError(f"Document {document.id} has no stored file.")
+
+        storage, name = document.file.storage, document.file.name
+        encoding = document.file_encoding or None
+        decode = bool(encoding) and not DocumentDownloadService.accepts_encoding(request, encoding)
+        etag = DocumentDownloadService.get_etag(document, None if decode else encoding)
+        last_modified = DocumentDownloadService.get_last_modified(document)
+        validators = {
+            'ETag': etag,
+            'Last-Modified': http_date(last_modified),
+            # Downloads are access-controlled, so shared caches must not reuse them.
+            'Cache-Control': 'private, max-age=0, must-revalidate',
+        }
+        if encoding:
+            validators['Vary'] = 'Accept-Encoding'
+
+        conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if conditional is not None:
+            DocumentDownloadService.set_headers(conditional, validators)
+            return conditional
+
+        content_type = document.file_format or mimetypes.guess_type(decoded_name(name))[0] or 'application/octet-stream'
+        chunk_size = settings.DOCUMENT_DOWNLOAD_CHUNK_SIZE
+        if decode:
+            stream = DocumentDownloadService.iter_file(
+                open_decoded(storage, name), 0, document.file_size or sys.maxsize, chunk_size)
+            response = StreamingHttpResponse(stream, content_type=content_type)
+            if document.file_size is not None:
+                response['Content-Length'] = document.file_size
+            DocumentDownloadService.set_headers(response, validators)
+            # Offsets into the decompressed bytes cannot be served without decompressing up to them.
+            response['Accept-Ranges'] = 'none'
+            response['Content-Disposition'] = content_disposition_header(
+                as_attachment=True, filename=DocumentDownloadService.get_download_name(document))
+            logger.info(f"Document {document.id} downloaded by {user.email} (full file, decompressed).")
+            return response
+
+        size = storage.size(name)
+        byte_range = None
+        if DocumentDownloadService.range_applies(request, etag, last_modified):
+            try:
+                byte_range = DocumentDownloadService.parse_range(request.META.get('HTTP_RANGE'), size)
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                DocumentDownloadService.set_headers(response, validators)
+                response['Content-Range'] = f"bytes */{size}"
+                return response
+
+        local_path = DocumentDownloadService.get_local_path(storage, name)
+        sendfile_header = settings.DOCUMENT_DOWNLOAD_SENDFILE_HEADER
+
+        # Content-coded files stay in Django so the Content-Encoding header is guaranteed to be sent.
+        if local_path and sendfile_header and not encoding:
+            # The web server sends the bytes (and handles Range itself); Django only authorizes.
+            response = HttpResponse(content_type=content_type)
+            if sendfile_header.lower() == 'x-accel-redirect':
+                response[sendfile_header] = f"{settings.DOCUMENT_DOWNLOAD_ACCEL_PREFIX.rstrip('/')}/{name}"
+            else:
+                response[sendfile_header] = local_path
+        elif local_path and byte_range is None:
+            response = FileResponse(open(local_path, 'rb'), content_type=content_type)
+        else:
+            stream = DocumentDownloadService.open_stream(storage, name, byte_range, size, chunk_size)
+            response = StreamingHttpResponse(stream, content_type=content_type)
+            if byte_range:
+                start, end = byte_range
+                response.status_code = 206
+                response['Content-Range'] = f"bytes {start}-{end}/{size}"
+                response['Content-Length'] = end - start + 1
+            else:
+                response['Content-Length'] = size
+
+        DocumentDownloadService.set_headers(response, validators)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = content_disposition_header(
+            as_attachment=True, filename=DocumentDownloadService.get_download_name(document))
+        logger.info(f"Document {document.id} downloaded by {user.email} "
+                    f"({'bytes %d-%d' % byte_range if byte_range else 'full file'}).")
+        return response
@@ -0,0 +1,120 @@
+# core/services/export_service.py
+
+import csv
+import json
+import logging
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+}
+
+
+class EchoBuffer:
+    """File-like object whose write() returns the value, so csv.writer formats single rows."""
+
+    def write(self, value):
+        return value
+
+
+class DocumentExportService:
+    """
+    Streams the document catalog (with course, academic year, uploader and status) as
+    NDJSON or CSV in constant memory: rows are read as values_list() tuples through
+    QuerySet.iterator(chunk_size) (a server-side cursor on PostgreSQL) and encoded a chunk
+    at a time, so neither model instances nor the full result are ever held.
+    """
+    # (output column, database column); academic_year is rendered from its start and end years.
+    COLUMNS = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('doc_type', 'doc_type'),
+        ('status', 'status'),
+        ('semester_number', 'semester_number'),
+        ('file_format', 'file_format'),
+        ('course_id', 'course_id'),
+        ('course_code', 'course__code'),
+        ('course_name', 'course__name'),
+        ('academic_year_id', 'academic_year_id'),
+        ('academic_year', 'academic_year__year_start'),
+        ('uploader_id', 'uploader_id'),
+        ('uploader_email', 'uploader__email'),
+        ('content_hash', 'content_hash'),
+        ('duplicate_of_id', 'duplicate_of_id'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    )
+
+    @staticmethod
+    def get_column_names():
+        return [name for name, _ in DocumentExportService.COLUMNS]
+
+    @staticmethod
+    def iter_records(queryset: QuerySet, chunk_size=None):
+        """
+        Yields one tuple of JSON-compatible values per document, in ID order.
+        Args:
+            queryset (QuerySet): Filtered documents.
+            chunk_size (int): Rows fetched from the database at a time.
+        """
+        columns = [column for _, column in DocumentExportService.COLUMNS] + ['academic_year__year_end']
+        year_index = columns.index('academic_year__year_start')
+        datetime_indexes = [columns.index('created_at'), columns.index('updated_at')]
+        rows = (queryset.select_related(None).order_by('id').values_list(*columns)
+                .iterator(chunk_size=chunk_size or settings.DOCUMENT_EXPORT_CHUNK_SIZE))
+        for row in rows:
+            record = list(row[:-1])
+            if record[year_index] is not None:
+                record[year_index] = f"{record[year_index]}-{row[-1]}"
+            for index in datetime_indexes:
+                record[index] = record[index].isoformat()
+            yield record
+
+    @staticmethod
+    def iter_ndjson(records, chunk_size):
+        names = DocumentExportService.get_column_names()
+        lines = []
+        for record in records:
+            lines.append(json.dumps(dict(zip(names, record)), ensure_ascii=False, separators=(',', ':')))
+            if len(lines) >= chunk_size:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def iter_csv(records, chunk_size):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(DocumentExportService.get_column_names())
+        lines = []
+        for record in records:
+            lines.append(writer.writerow(record))
+            if len(lines) >= chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+    @staticmethod
+    def stream(queryset: QuerySet, export_format='ndjson', chunk_size=None):
+        """
+        Encodes the documents lazily; each yielded string holds up to `chunk_size` rows.
+        Args:
+            queryset (QuerySet): Filtered documents.
+            export_format (str): 'ndjson' or 'csv'.
+            chunk_size (int): Rows per database fetch and per yielded chunk.
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        chunk_size = chunk_size or settings.DOCUMENT_EXPORT_CHUNK_SIZE
+        records = DocumentExportService.iter_records(queryset, chunk_size)
+        if export_format == 'ndjson':
+            return DocumentExportService.iter_ndjson(records, chunk_size)
+        if export_format == 'csv':
+            return DocumentExportService.iter_csv(records, chunk_size)
+        raise ValueError(f"Unsupported export format '{export_format}'; use one of: {', '.join(EXPORT_FORMATS)}.")
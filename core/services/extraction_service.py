@@ -0,0 +1,118 @@
+# core/services/extraction_service.py
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import Document, DocumentContent
+from core.services.search_service import SearchService
+from core.utils.text_extraction import extract_stored_file_text
+from core.utils.workers import create_process_pool
+
+logger = logging.getLogger(__name__)
+
+ExtractionStatus = DocumentContent.ExtractionStatus
+
+
+class TextExtractionService:
+    """
+    Asynchronous pipeline that extracts text from uploaded PDF, DOCX and TXT files
+    into DocumentContent and indexes it for full-text search.
+    Uploads only schedule work; a single dispatcher thread feeds a process pool so
+    that extraction never runs on the request thread.
+    """
+    _lock = threading.Lock()
+    _dispatcher = None
+    _process_pool = None
+
+    @staticmethod
+    def get_process_pool():
+        with TextExtractionService._lock:
+            if TextExtractionService._process_pool is None:
+                TextExtractionService._process_pool = create_process_pool(settings.TEXT_EXTRACTION_WORKERS)
+            return TextExtractionService._process_pool
+
+    @staticmethod
+    def get_dispatcher():
+        with TextExtractionService._lock:
+            if TextExtractionService._dispatcher is None:
+                TextExtractionService._dispatcher = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='text-extraction'
+                )
+            return TextExtractionService._dispatcher
+
+    @staticmethod
+    def schedule(document_ids):
+        """
+        Queues extraction for the given documents once the current transaction commits.
+        Args:
+            document_ids (iterable[int]): IDs of the newly stored documents.
+        """
+        document_ids = list(document_ids)
+        if document_ids and settings.TEXT_EXTRACTION_ENABLED:
+            transaction.on_commit(lambda: TextExtractionService.submit(document_ids))
+
+    @staticmethod
+    def submit(document_ids):
+        """Hands the documents to the background dispatcher and returns immediately."""
+        return TextExtractionService.get_dispatcher().submit(TextExtractionService._run_in_background, document_ids)
+
+    @staticmethod
+    def _run_in_background(document_ids):
+        try:
+            TextExtractionService.process_documents(document_ids, TextExtractionService.get_process_pool())
+        except Exception as e:
+            logger.exception(f"Background text extraction failed for documents {document_ids}: {e}")
+        finally:
+            # Dispatcher threads own their connection; do not leak it between jobs.
+            connection.close()
+
+    @staticmethod
+    def process_documents(document_ids, executor=None) -> dict:
+        """
+        Extracts and stores the text of the given documents.
+        Args:
+            document_ids (iterable[int]): Documents to process.
+            executor (Executor): Pool to extract in; None extracts in the calling thread.
+        Returns:
+            dict: Number of documents per resulting extraction status.
+        """
+        jobs = list(Document.objects.filter(id__in=list(document_ids))
+                    .exclude(file='').values_list('id', 'file', 'file_format'))
+        if not jobs:
+            return {}
+
+        ids, names, formats = zip(*jobs)
+        max_chars = [settings.TEXT_EXTRACTION_MAX_CHARS] * len(jobs)
+        mapper = executor.map if executor is not None else map
+        results = list(mapper(extract_stored_file_text, ids, names, formats, max_chars))
+        return TextExtractionService.save_results(results)
+
+    @staticmethod
+    def save_results(results) -> dict:
+        """Upserts DocumentContent rows in one statement and indexes the extracted text."""
+        # A document may have been deleted while its file was being processed.
+        existing_ids = set(Document.objects.filter(id__in=[result[0] for result in results]).values_list('id', flat=True))
+        now = timezone.now()
+        contents = [
+            DocumentContent(document_id=document_id, status=status, text=text, error=error, extracted_at=now)
+            for document_id, status, text, error in results if document_id in existing_ids
+        ]
+        with transaction.atomic():
+            DocumentContent.objects.bulk_create(
+                contents, update_conflicts=True, unique_fields=['document'],
+                update_fields=['status', 'text', 'error', 'extracted_at', 'updated_at'],
+            )
+            SearchService.index_content(contents)
+
+        summary = {}
+        for content in contents:
+            summary[content.status] = summary.get(content.status, 0) + 1
+            if content.status == ExtractionStatus.FAILED:
+                logger.warning(f"Text extraction failed for document {content.document_id}: {content.error}")
+        logger.info(f"Stored extracted text for {len(contents)} document(s): {summary}.")
+        return summary
@@ -0,0 +1,113 @@
+# core/services/facet_service.py
+
+import json
+import time
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, QuerySet
+
+from core.models import Document
+from core.models.base import SemesterNumber
+
+logger = logging.getLogger(__name__)
+
+
+class FacetService:
+    """
+    Per-facet document counts for the browse UI (doc type, course, academic year, semester),
+    computed with one grouped aggregate query per facet instead of loading any rows.
+    Results are cached per filter combination. Every cache key embeds a version number;
+    any write through DocumentService bumps the version, which invalidates all cached
+    combinations at once without having to know which keys exist.
+    The version only reaches processes sharing the cache backend, so caching requires a shared
+    CACHE_URL; see DOCUMENT_FACETS_CACHE_ENABLED.
+    """
+    VERSION_KEY = 'documents:facets:version'
+    # Facet name -> (grouped column, extra columns used to build the label)
+    FACETS = {
+        'doc_type': ('doc_type', ()),
+        'course': ('course_id', ('course__code', 'course__name')),
+        'academic_year': ('academic_year_id', ('academic_year__year_start', 'academic_year__year_end')),
+        'semester_number': ('semester_number', ()),
+    }
+
+    @staticmethod
+    def get_version() -> int:
+        version = cache.get(FacetService.VERSION_KEY)
+        if version is None:
+            # Seeded from the clock so that an evicted version never restarts at a number
+            # whose entries may still be cached.
+            cache.add(FacetService.VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(FacetService.VERSION_KEY, time.time_ns())
+        return version
+
+    @staticmethod
+    def invalidate():
+        """Makes every cached facet result stale, in every process using the same cache backend."""
+        try:
+            cache.incr(FacetService.VERSION_KEY)
+        except ValueError:
+            cache.set(FacetService.VERSION_KEY, time.time_ns(), timeout=None)
+
+    @staticmethod
+    def invalidate_on_commit():
+        """Invalidates once the current transaction commits, so readers cannot re-cache pre-commit counts."""
+        transaction.on_commit(FacetService.invalidate)
+
+    @staticmethod
+    def get_cache_key(selection: dict) -> str:
+        normalized = {key: getattr(value, 'pk', value) for key, value in selection.items() if value not in (None, '')}
+        digest = hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+        return f"documents:facets:v{FacetService.get_version()}:{digest}"
+
+    @staticmethod
+    def get_label(facet, value, extra):
+        if value is None:
+            return None
+        if facet == 'doc_type':
+            return Document.DocumentType(value).label if value in Document.DocumentType.values else value
+        if facet == 'semester_number':
+            return SemesterNumber(value).label if value in SemesterNumber.values else value
+        if facet == 'course':
+            return f"{extra[0]} - {extra[1]}"
+        return f"{extra[0]}-{extra[1]}"
+
+    @staticmethod
+    def compute_facets(queryset: QuerySet) -> dict:
+        """Runs one GROUP BY query per facet over the filtered queryset."""
+        queryset = queryset.select_related(None).order_by()
+        facets = {}
+        for facet, (column, label_columns) in FacetService.FACETS.items():
+            rows = (queryset.values_list(column, *label_columns)
+                    .annotate(count=Count('id'))
+                    .order_by('-count', column))
+            facets[facet] = [
+                {'value': row[0], 'label': FacetService.get_label(facet, row[0], row[1:-1]), 'count': row[-1]}
+                for row in rows
+            ]
+        # Every document has exactly one doc type, so that facet also yields the total.
+        return {'total': sum(bucket['count'] for bucket in facets['doc_type']), 'facets': facets}
+
+    @staticmethod
+    def get_facets(queryset: QuerySet, selection: dict) -> dict:
+        """
+        Returns facet counts for the queryset, from the cache when possible.
+        Args:
+            queryset (QuerySet): Documents matching the visibility rules and filters.
+            selection (dict): Everything that determined the queryset (visibility kwargs and
+                filter values); it forms the cache key.
+        Returns:
+            dict: {'total': int, 'facets': {facet: [{'value', 'label', 'count'}, ...]}}.
+        """
+        if not settings.DOCUMENT_FACETS_CACHE_ENABLED:
+            return FacetService.compute_facets(queryset)
+        cache_key = FacetService.get_cache_key(selection)
+        facets = cache.get(cache_key)
+        if facets is None:
+            facets = FacetService.compute_facets(queryset)
+            cache.set(cache_key, facets, timeout=settings.DOCUMENT_FACETS_CACHE_TIMEOUT)
+        return facets
@@ -0,0 +1,88 @@
+# core/services/file_url_service.py
+
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class FileUrlService:
+    """
+    Caches presigned file URLs by storage key. A signed URL is valid for the storage's
+    `querystring_expire` seconds; it is cached for that long minus a safety margin, so a cached
+    URL always has at least DOCUMENT_URL_REFRESH_MARGIN_SECONDS left and is re-signed only when
+    it gets close to expiring. Storages that do not sign URLs are not cached: their `url()` is
+    already cheap. List responses resolve all their URLs with one `get_many` / `set_many`.
+    Access control happens before a URL is handed out, so URLs are shared between users.
+    """
+    _lock = threading.Lock()
+    _stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def get_cache_timeout(storage):
+        """Seconds a freshly signed URL may be served from the cache; None if the storage does not sign URLs."""
+        if not settings.DOCUMENT_URL_CACHE_ENABLED or not getattr(storage, 'querystring_auth', False):
+            return None
+        timeout = int(getattr(storage, 'querystring_expire', 0)) - settings.DOCUMENT_URL_REFRESH_MARGIN_SECONDS
+        return timeout if timeout > 0 else None
+
+    @staticmethod
+    def get_cache_key(storage, name):
+        digest = hashlib.sha256(name.encode('utf-8')).hexdigest()
+        return f"file-url:{getattr(storage, 'bucket_name', '')}:{digest}"
+
+    @staticmethod
+    def record(hits, misses):
+        with FileUrlService._lock:
+            FileUrlService._stats['hits'] += hits
+            FileUrlService._stats['misses'] += misses
+
+    @staticmethod
+    def get_stats() -> dict:
+        """Process-wide hit/miss counters since start-up (or the last `reset_stats`)."""
+        with FileUrlService._lock:
+            stats = dict(FileUrlService._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+        return stats
+
+    @staticmethod
+    def reset_stats():
+        with FileUrlService._lock:
+            FileUrlService._stats.update(hits=0, misses=0)
+
+    @staticmethod
+    def get_urls(storage, names) -> dict:
+        """
+        Resolves the URLs of many stored files at once.
+        Args:
+            storage (Storage): The storage holding the files.
+            names (iterable[str]): Storage keys; empty names are ignored.
+        Returns:
+            dict: {storage key: URL}.
+        """
+        names = {name for name in names if name}
+        timeout = FileUrlService.get_cache_timeout(storage)
+        if timeout is None:
+            return {name: storage.url(name) for name in names}
+
+        keys = {FileUrlService.get_cache_key(storage, name): name for name in names}
+        cached = cache.get_many(list(keys))
+        urls = {keys[key]: url for key, url in cached.items()}
+        signed = {key: storage.url(name) for key, name in keys.items() if key not in cached}
+        if signed:
+            cache.set_many(signed, timeout=timeout)
+            urls.update((keys[key], url) for key, url in signed.items())
+        FileUrlService.record(len(cached), len(signed))
+        return urls
+
+    @staticmethod
+    def get_url(storage, name):
+        """Returns the (possibly cached) URL of one stored file, or None for an empty name."""
+        if not name:
+            return None
+        return FileUrlService.get_urls(storage, [name])[name]
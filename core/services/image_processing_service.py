@@ -0,0 +1,174 @@
+# core/services/image_processing_service.py
+
+import logging
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import Document, DocumentOriginal
+from core.services.extraction_service import TextExtractionService
+from core.services.preview_service import PreviewService
+from core.services.storage_deletion_service import StorageDeletionService
+from core.utils.images import STATUS_DONE, STATUS_FAILED, process_stored_images
+from core.utils.previews import JPEG_MIME_TYPE, PNG_MIME_TYPE
+from core.utils.text_extraction import PDF_MIME_TYPE
+
+logger = logging.getLogger(__name__)
+
+ProcessingStatus = Document.ImageProcessingStatus
+
+IMAGE_MIME_TYPES = (JPEG_MIME_TYPE, PNG_MIME_TYPE)
+ORIGINALS_KEEP = 'keep'
+ORIGINALS_DISCARD = 'discard'
+
+
+class ImageProcessingService:
+    """
+    Post-processes scanned uploads in the background, on the text extraction dispatcher and
+    process pool:
+    - JPEG/PNG uploads are re-encoded without EXIF metadata, downscaled to DOCUMENT_IMAGE_DPI.
+    - A scan (several page images uploaded together) is stitched into a single PDF.
+    The uploaded files are recorded as DocumentOriginal rows and kept or deleted afterwards
+    according to DOCUMENT_ORIGINALS_POLICY. Previews and text extraction for these documents
+    run once the processed file is in place.
+    """
+
+    @staticmethod
+    def get_initial_status(file_format) -> str:
+        """Processing status for a new upload of `file_format`: pending for images, else not applicable."""
+        if settings.DOCUMENT_IMAGE_PROCESSING_ENABLED and file_format in IMAGE_MIME_TYPES:
+            return ProcessingStatus.PENDING
+        return ProcessingStatus.NONE
+
+    @staticmethod
+    def schedule(document_ids):
+        """
+        Queues processing for the given documents once the current transaction commits.
+        Args:
+            document_ids (iterable[int]): IDs of documents with a pending processing status.
+        """
+        document_ids = list(document_ids)
+        if document_ids:
+            transaction.on_commit(lambda: ImageProcessingService.submit(document_ids))
+
+    @staticmethod
+    def submit(document_ids):
+        """Hands the documents to the background dispatcher and returns immediately."""
+        return TextExtractionService.get_dispatcher().submit(ImageProcessingService._run_in_background, document_ids)
+
+    @staticmethod
+    def _run_in_background(document_ids):
+        try:
+            executor = TextExtractionService.get_process_pool()
+            ImageProcessingService.process_documents(document_ids, executor)
+            ImageProcessingService.run_follow_ups(document_ids, executor)
+        except Exception as e:
+            logger.exception(f"Background image processing failed for documents {document_ids}: {e}")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def run_follow_ups(document_ids, executor=None):
+        """Generates previews and extracts text once the processed files are in place."""
+        if settings.DOCUMENT_PREVIEWS_ENABLED:
+            PreviewService.process_documents(document_ids, executor)
+        if settings.TEXT_EXTRACTION_ENABLED:
+            TextExtractionService.process_documents(document_ids, executor)
+
+    @staticmethod
+    def process_documents(document_ids, executor=None) -> dict:
+        """
+        Re-encodes or stitches the given documents that are pending (or failed before).
+        Args:
+            document_ids (iterable[int]): Documents to process.
+            executor (Executor): Pool to process in; None processes in the calling thread.
+        Returns:
+            dict: Number of documents per outcome ('done', 'unchanged', 'failed').
+        """
+        documents = {
+            document.id: document for document in Document.objects.filter(
+                id__in=list(document_ids),
+                image_processing_status__in=[ProcessingStatus.PENDING, ProcessingStatus.FAILED],
+            )
+        }
+        if not documents:
+            return {}
+        pages = {}
+        for document_id, name in (DocumentOriginal.objects.filter(document_id__in=list(documents))
+                                  .order_by('position').values_list('document_id', 'file')):
+            pages.setdefault(document_id, []).append(name)
+
+        # Scans are created as PDF documents whose pages are their originals; images re-encode their own file.
+        jobs = [
+            (document.id, pages.get(document.id, []) if document.file_format == PDF_MIME_TYPE else [document.file.name],
+             document.file_format)
+            for document in documents.values()
+        ]
+        count = len(jobs)
+        ids, names, formats = zip(*jobs)
+        mapper = executor.map if executor is not None else map
+        results = list(mapper(
+            process_stored_images, ids, names, formats,
+            [settings.DOCUMENT_IMAGE_DPI] * count,
+            [settings.DOCUMENT_IMAGE_PAGE_INCHES] * count,
+            [settings.DOCUMENT_IMAGE_JPEG_QUALITY] * count,
+        ))
+        return ImageProcessingService.save_results(documents, results)
+
+    @staticmethod
+    def save_results(documents, results) -> dict:
+        """Points the documents at their processed files and applies the originals policy."""
+        # Imported here: DocumentService imports this module to schedule processing on upload.
+        from core.services.document_service import DocumentService
+
+        with transaction.atomic():
+            updated, originals, summary = [], [], {}
+            now = timezone.now()
+            # Processed files are stored by worker processes, outside this transaction; one shared
+            # with another document may have been deleted since.
+            deleted = StorageDeletionService.claim_stored(
+                default_storage, [name for _, outcome, name, _, _, _ in results if outcome == STATUS_DONE])
+            for document_id, outcome, name, content_hash, size, error in results:
+                if outcome == STATUS_DONE and name in deleted:
+                    outcome, error = STATUS_FAILED, f"Processed file '{name}' was removed concurrently."
+                summary[outcome] = summary.get(outcome, 0) + 1
+                document = documents[document_id]
+                if outcome == STATUS_FAILED:
+                    logger.warning(f"Image processing failed for document {document_id}: {error}")
+                    document.image_processing_status = ProcessingStatus.FAILED
+                else:
+                    document.image_processing_status = ProcessingStatus.DONE
+                if outcome == STATUS_DONE:
+                    if document.file_format != PDF_MIME_TYPE:
+                        originals.append(DocumentOriginal(document_id=document_id, file=document.file.name,
+                                                          file_format=document.file_format, file_size=document.file_size))
+                    document.file, document.content_hash = name, content_hash
+                    document.file_size = document.stored_size = size
+                    document.file_encoding = ''
+                # bulk_update skips auto_now; the file (and so its URL and validators) changed.
+                document.updated_at = now
+                updated.append(document)
+
+            # A document deleted mid-processing simply matches no row.
+            Document.objects.bulk_update(updated, ['file', 'content_hash', 'file_size', 'stored_size', 'file_encoding',
+                                                   'image_processing_status', 'updated_at'])
+            processed_ids = [document.id for document in updated
+                             if document.image_processing_status == ProcessingStatus.DONE]
+            # The upload's hash no longer matches anything once its copies are re-encoded; flag
+            # duplicates again by the processed file's hash.
+            DocumentService.mark_duplicates(processed_ids)
+            existing_ids = set(Document.objects.filter(id__in=[original.document_id for original in originals])
+                               .values_list('id', flat=True))
+            DocumentOriginal.objects.bulk_create(
+                [original for original in originals if original.document_id in existing_ids])
+            if settings.DOCUMENT_ORIGINALS_POLICY == ORIGINALS_DISCARD:
+                discarded = DocumentOriginal.objects.filter(document_id__in=processed_ids)
+                # Shared (content-addressed) originals are only deleted once nothing references them.
+                names = list(discarded.values_list('file', flat=True))
+                discarded.delete()
+                StorageDeletionService.enqueue(names)
+
+        logger.info(f"Image processing finished for {len(results)} document(s): {summary}.")
+        return summary
@@ -0,0 +1,98 @@
+# core/services/preview_service.py
+
+import logging
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import Document
+from core.services.extraction_service import TextExtractionService
+from core.services.storage_deletion_service import StorageDeletionService
+from core.utils.previews import STATUS_FAILED, generate_stored_preview
+
+logger = logging.getLogger(__name__)
+
+
+class PreviewService:
+    """
+    Generates small preview images for uploaded documents in the background: the first
+    page of a PDF, or a downscaled copy of a JPEG/PNG. Rendering shares the text extraction
+    dispatcher thread and its bounded process pool, so uploads never render on the request
+    path and CPU-heavy document work is capped by one worker setting.
+    """
+
+    @staticmethod
+    def schedule(document_ids):
+        """
+        Queues preview generation for the given documents once the current transaction commits.
+        Args:
+            document_ids (iterable[int]): IDs of the newly stored documents.
+        """
+        document_ids = list(document_ids)
+        if document_ids and settings.DOCUMENT_PREVIEWS_ENABLED:
+            transaction.on_commit(lambda: PreviewService.submit(document_ids))
+
+    @staticmethod
+    def submit(document_ids):
+        """Hands the documents to the background dispatcher and returns immediately."""
+        return TextExtractionService.get_dispatcher().submit(PreviewService._run_in_background, document_ids)
+
+    @staticmethod
+    def _run_in_background(document_ids):
+        try:
+            PreviewService.process_documents(document_ids, TextExtractionService.get_process_pool())
+        except Exception as e:
+            logger.exception(f"Background preview generation failed for documents {document_ids}: {e}")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def process_documents(document_ids, executor=None) -> dict:
+        """
+        Renders and stores previews, then records them on the documents.
+        Args:
+            document_ids (iterable[int]): Documents to process.
+            executor (Executor): Pool to render in; None renders in the calling thread.
+        Returns:
+            dict: Number of documents per outcome ('done', 'unsupported', 'failed').
+        """
+        jobs = list(Document.objects.filter(id__in=list(document_ids))
+                    .exclude(file='').values_list('id', 'file', 'file_format'))
+        if not jobs:
+            return {}
+
+        ids, names, formats = zip(*jobs)
+        count = len(jobs)
+        mapper = executor.map if executor is not None else map
+        results = list(mapper(
+            generate_stored_preview, ids, names, formats,
+            [settings.DOCUMENT_PREVIEW_MAX_SIZE] * count,
+            [settings.DOCUMENT_PREVIEW_FORMAT.upper()] * count,
+            [settings.DOCUMENT_PREVIEW_QUALITY] * count,
+        ))
+
+        # Unsupported formats get an empty preview so backfills skip them; failures stay NULL to be retried.
+        # updated_at moves too (bulk_update skips auto_now), since the preview URL is part of the document.
+        now = timezone.now()
+        with transaction.atomic():
+            # Previews are stored by worker processes, outside this transaction; one shared with
+            # another document may have been deleted since, which counts as a failure.
+            deleted = StorageDeletionService.claim_stored(
+                default_storage, [preview_name for _, outcome, preview_name, _ in results if outcome != STATUS_FAILED])
+            results = [(document_id, STATUS_FAILED, None, f"Preview '{preview_name}' was removed concurrently.")
+                       if preview_name in deleted else (document_id, outcome, preview_name, error)
+                       for document_id, outcome, preview_name, error in results]
+            rendered = [Document(id=document_id, preview=preview_name or '', updated_at=now)
+                        for document_id, outcome, preview_name, _ in results if outcome != STATUS_FAILED]
+            # A document deleted mid-render simply matches no row.
+            Document.objects.bulk_update(rendered, ['preview', 'updated_at'])
+
+        summary = {}
+        for document_id, outcome, _, error in results:
+            summary[outcome] = summary.get(outcome, 0) + 1
+            if outcome == STATUS_FAILED:
+                logger.warning(f"Preview generation failed for document {document_id}: {error}")
+        logger.info(f"Preview generation finished for {len(results)} document(s): {summary}.")
+        return summary
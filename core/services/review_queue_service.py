@@ -0,0 +1,92 @@
+# core/services/review_queue_service.py
+
+import logging
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import Document, User
+from core.models.base import DocumentStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewQueueService:
+    """
+    Hands pending documents out to concurrent reviewers, oldest first, without overlap.
+    A claim marks the document with the reviewer and a lease expiry; once the lease passes
+    (the reviewer left without deciding), the document is back in the queue. A review decision
+    clears the claim.
+    On PostgreSQL, candidates are read with SELECT ... FOR UPDATE SKIP LOCKED, so reviewers
+    claiming at the same moment take disjoint rows instead of waiting on each other. The claim
+    itself is a conditional UPDATE that re-checks availability, which keeps claims exclusive on
+    backends without SKIP LOCKED (SQLite), where a reviewer that loses a race takes the next rows.
+    """
+    MAX_CLAIM_ATTEMPTS = 3
+
+    @staticmethod
+    def get_available_filter(now):
+        return Q(status=DocumentStatus.PENDING) & (
+            Q(review_claim_expires_at__isnull=True) | Q(review_claim_expires_at__lte=now))
+
+    @staticmethod
+    def claim_available(reviewer: User, count: int, now, expires_at) -> list:
+        """Claims up to `count` unclaimed pending documents. Returns their IDs, oldest first."""
+        available = ReviewQueueService.get_available_filter(now)
+        skip_locked = connection.features.has_select_for_update_skip_locked
+        claimed = []
+        for _ in range(ReviewQueueService.MAX_CLAIM_ATTEMPTS):
+            wanted = count - len(claimed)
+            # Without SKIP LOCKED a read-then-write transaction only adds lock upgrades; each
+            # statement runs on its own and the conditional UPDATE arbitrates.
+            with transaction.atomic() if skip_locked else nullcontext():
+                candidates = list(Document.objects.filter(available).exclude(id__in=claimed)
+                                  .select_for_update(skip_locked=True)
+                                  .order_by('created_at', 'id').values_list('id', flat=True)[:wanted])
+                if not candidates:
+                    break
+                won = Document.objects.filter(available, id__in=candidates).update(
+                    review_claimed_by=reviewer, review_claim_expires_at=expires_at)
+            if won == len(candidates):
+                claimed.extend(candidates)
+            else:
+                claimed.extend(Document.objects.filter(id__in=candidates, review_claimed_by=reviewer,
+                                                       review_claim_expires_at=expires_at)
+                               .values_list('id', flat=True))
+            if len(claimed) >= count:
+                break
+        return claimed
+
+    @staticmethod
+    def claim_next(reviewer: User, count: int) -> tuple:
+        """
+        Claims pending documents for a reviewer. Claims the reviewer already holds are returned
+        (and renewed) first, so retrying a request never takes more documents than asked for.
+        Args:
+            reviewer (User): The staff member taking the documents.
+            count (int): Number of documents wanted.
+        Returns:
+            tuple: (claimed document IDs oldest first, lease expiry datetime).
+        """
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=settings.DOCUMENT_REVIEW_LEASE_SECONDS)
+        held = list(Document.objects.filter(status=DocumentStatus.PENDING, review_claimed_by=reviewer,
+                                            review_claim_expires_at__gt=now)
+                    .order_by('created_at', 'id').values_list('id', flat=True)[:count])
+        if held:
+            Document.objects.filter(id__in=held, review_claimed_by=reviewer).update(review_claim_expires_at=expires_at)
+        claimed = held
+        if len(held) < count:
+            claimed = held + ReviewQueueService.claim_available(reviewer, count - len(held), now, expires_at)
+        logger.info(f"{reviewer.email} holds {len(claimed)} review claim(s) until {expires_at.isoformat()} "
+                    f"({len(claimed) - len(held)} new).")
+        return claimed, expires_at
+
+    @staticmethod
+    def get_queue_size(now=None) -> int:
+        """Number of pending documents nobody holds a live claim on."""
+        return Document.objects.filter(ReviewQueueService.get_available_filter(now or timezone.now())).count()
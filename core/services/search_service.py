@@ -0,0 +1,231 @@
+# core/services/search_service.py
+
+import re
+import logging
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from core.models import Document
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of each indexed column, highest first.
+SEARCH_COLUMNS = ('title', 'course_code', 'course_name', 'program_name', 'doc_type')
+
+# Matches inside the extracted file text count for less than metadata matches.
+CONTENT_RANK_WEIGHT = 0.5
+
+
+class PostgresSearchBackend:
+    """
+    Keeps a weighted `tsvector` column (`core_document.search_vector`) up to date and
+    queries it through its GIN index.
+    """
+    vector_sql = (
+        "setweight(to_tsvector('english', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('english', %s), 'B') || "
+        "setweight(to_tsvector('english', %s), 'C') || "
+        "setweight(to_tsvector('english', %s), 'D')"
+    )
+
+    def index_rows(self, rows):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE core_document SET search_vector = {self.vector_sql} WHERE id = %s",
+                [tuple(row[column] for column in SEARCH_COLUMNS) + (row['id'],) for row in rows]
+            )
+
+    def index_content(self, rows):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "UPDATE core_documentcontent SET search_vector = to_tsvector('english', %s) WHERE document_id = %s",
+                [(text, document_id) for document_id, text in rows]
+            )
+
+    def remove(self, document_ids):
+        # Both vectors live on rows that are deleted along with the document.
+        pass
+
+    def search(self, queryset, query):
+        tsquery = "websearch_to_tsquery('english', %s)"
+        return queryset.filter(
+            Q(id__in=RawSQL(f"SELECT id FROM core_document WHERE search_vector @@ {tsquery}", [query])) |
+            Q(id__in=RawSQL(f"SELECT document_id FROM core_documentcontent WHERE search_vector @@ {tsquery}", [query]))
+        ).annotate(
+            rank=RawSQL(
+                f"COALESCE(ts_rank_cd(core_document.search_vector, {tsquery}), 0) + {CONTENT_RANK_WEIGHT} * COALESCE("
+                f"(SELECT ts_rank_cd(content.search_vector, {tsquery}) FROM core_documentcontent content "
+                f"WHERE content.document_id = core_document.id), 0)",
+                [query, query], output_field=FloatField()
+            )
+        )
+
+
+class SqliteSearchBackend:
+    """
+    Mirrors the searchable fields into the `core_document_fts` FTS5 table, keyed by the
+    document id as rowid, and ranks matches with bm25().
+    """
+    column_weights = (10.0, 10.0, 5.0, 2.0, 1.0)
+
+    def index_rows(self, rows):
+        with connection.cursor() as cursor:
+            self._delete(cursor, [row['id'] for row in rows])
+            cursor.executemany(
+                f"INSERT INTO core_document_fts (rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s)",
+                [(row['id'],) + tuple(row[column] for column in SEARCH_COLUMNS) for row in rows]
+            )
+
+    def index_content(self, rows):
+        with connection.cursor() as cursor:
+            cursor.executemany("DELETE FROM core_documentcontent_fts WHERE rowid = %s",
+                               [(document_id,) for document_id, _ in rows])
+            cursor.executemany("INSERT INTO core_documentcontent_fts (rowid, text) VALUES (%s, %s)", rows)
+
+    def remove(self, document_ids):
+        with connection.cursor() as cursor:
+            self._delete(cursor, document_ids)
+            cursor.executemany("DELETE FROM core_documentcontent_fts WHERE rowid = %s", [(pk,) for pk in document_ids])
+
+    def _delete(self, cursor, document_ids):
+        cursor.executemany("DELETE FROM core_document_fts WHERE rowid = %s", [(pk,) for pk in document_ids])
+
+    def to_match_expression(self, query):
+        # Quote every token so user input can never be parsed as FTS5 syntax; the
+        # trailing * turns each token into a prefix match.
+        tokens = re.findall(r'\w+', query, flags=re.UNICODE)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def search(self, queryset, query):
+        match = self.to_match_expression(query)
+        if not match:
+            return queryset.none()
+        weights = ', '.join(str(weight) for weight in self.column_weights)
+        return queryset.filter(
+            Q(id__in=RawSQL("SELECT rowid FROM core_document_fts WHERE core_document_fts MATCH %s", [match])) |
+            Q(id__in=RawSQL("SELECT rowid FROM core_documentcontent_fts WHERE core_documentcontent_fts MATCH %s", [match]))
+        ).annotate(
+            # bm25() is lower-is-better; negate it so both backends rank descending.
+            rank=RawSQL(
+                f"COALESCE((SELECT -bm25(core_document_fts, {weights}) FROM core_document_fts "
+                f"WHERE core_document_fts MATCH %s AND rowid = core_document.id), 0) + {CONTENT_RANK_WEIGHT} * "
+                f"COALESCE((SELECT -bm25(core_documentcontent_fts) FROM core_documentcontent_fts "
+                f"WHERE core_documentcontent_fts MATCH %s AND rowid = core_document.id), 0)",
+                [match, match], output_field=FloatField()
+            )
+        )
+
+
+class FallbackSearchBackend:
+    """Unranked substring search for databases without a native full-text engine."""
+
+    def index_rows(self, rows):
+        pass
+
+    def index_content(self, rows):
+        pass
+
+    def remove(self, document_ids):
+        pass
+
+    def search(self, queryset, query):
+        condition = Q()
+        for token in query.split():
+            condition &= (Q(title__icontains=token) | Q(course__code__icontains=token) |
+                          Q(course__name__icontains=token) | Q(course__program__name__icontains=token) |
+                          Q(doc_type__icontains=token) | Q(content__text__icontains=token))
+        return queryset.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+class SearchService:
+    """
+    A service layer for the document full-text index.
+    The index covers the document title, course code, course name, program name and
+    document type. It is maintained incrementally by DocumentService on every write.
+    Text extracted from the uploaded file (DocumentContent) is indexed separately
+    and contributes to the rank with a lower weight.
+    """
+    backends = {
+        'postgresql': PostgresSearchBackend,
+        'sqlite': SqliteSearchBackend,
+    }
+
+    @staticmethod
+    def get_backend():
+        return SearchService.backends.get(connection.vendor, FallbackSearchBackend)()
+
+    @staticmethod
+    def get_index_rows(document_ids):
+        """Collects the searchable text for each document in a single query."""
+        doc_type_labels = dict(Document.DocumentType.choices)
+        rows = Document.objects.filter(id__in=document_ids).values(
+            'id', 'title', 'doc_type', 'course__code', 'course__name', 'course__program__name'
+        )
+        return [
+            {
+                'id': row['id'],
+                'title': row['title'] or '',
+                'course_code': row['course__code'] or '',
+                'course_name': row['course__name'] or '',
+                'program_name': row['course__program__name'] or '',
+                'doc_type': f"{row['doc_type']} {doc_type_labels.get(row['doc_type'], '')}".strip(),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def index_documents(document_ids):
+        """
+        (Re)indexes the given documents. Call inside the transaction that wrote them.
+        Args:
+            document_ids (iterable[int]): IDs of the documents to index.
+        """
+        document_ids = list(document_ids)
+        if not document_ids:
+            return
+        rows = SearchService.get_index_rows(document_ids)
+        SearchService.get_backend().index_rows(rows)
+        logger.debug(f"Indexed {len(rows)} document(s) for search.")
+
+    @staticmethod
+    def index_content(contents):
+        """
+        (Re)indexes extracted file text.
+        Args:
+            contents (iterable[DocumentContent]): Content rows that were just saved.
+        """
+        rows = [(content.document_id, content.text) for content in contents]
+        if rows:
+            SearchService.get_backend().index_content(rows)
+
+    @staticmethod
+    def remove_documents(document_ids):
+        """Drops the given documents from the search index."""
+        document_ids = list(document_ids)
+        if document_ids:
+            SearchService.get_backend().remove(document_ids)
+
+    @staticmethod
+    def rebuild_index(batch_size=1000):
+        """Reindexes every document, batch by batch. Returns the number of documents indexed."""
+        total = 0
+        last_id = 0
+        while True:
+            ids = list(Document.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return total
+            SearchService.index_documents(ids)
+            total += len(ids)
+            last_id = ids[-1]
+
+    @staticmethod
+    def search(queryset, query):
+        """
+        Restricts `queryset` to documents matching `query`, ordered by relevance.
+        The caller's queryset carries the visibility rules, so they always apply.
+        Each returned document has a `rank` attribute (higher is more relevant).
+        """
+        return SearchService.get_backend().search(queryset, query).order_by('-rank', '-created_at', '-id')
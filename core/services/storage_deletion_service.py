@@ -0,0 +1,328 @@
+# core/services/storage_deletion_service.py
+
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import Document, DocumentOriginal, StorageDeletion
+
+logger = logging.getLogger(__name__)
+
+# S3 DeleteObjects accepts at most this many keys per request.
+S3_DELETE_OBJECTS_LIMIT = 1000
+
+
+class StorageDeletionService:
+    """
+    Deletes stored files asynchronously through a transactional outbox:
+    1. `enqueue` records the storage keys in the transaction that deletes their Document rows.
+    2. After commit, a background thread drains the outbox with batched deletes
+       (one S3 DeleteObjects call per batch); failures are retried with exponential backoff.
+    3. `reap_orphans` periodically finds stored objects that no Document references and
+       queues them for deletion the same way.
+    Content-addressed files (and their previews) can be shared by several documents, so a key
+    is only deleted once no Document row references it any more. Code that starts referencing
+    an object that is already stored takes `lock_for_reuse` in the transaction that writes the
+    reference; a batch re-checks references under `lock_for_deletion`, so it either sees the new
+    reference or finishes deleting before the object is found missing and stored again.
+    """
+    _lock = threading.Lock()
+    _worker = None
+
+    @staticmethod
+    def is_s3(storage):
+        return hasattr(storage, 'bucket_name') and hasattr(storage, 'connection')
+
+    @staticmethod
+    def enqueue(names):
+        """
+        Queues storage keys for deletion as part of the current transaction.
+        Args:
+            names (iterable[str]): Storage keys; empty names are ignored.
+        """
+        names = sorted({name for name in names if name})
+        if not names:
+            return
+        StorageDeletion.objects.bulk_create([StorageDeletion(name=name) for name in names])
+        if settings.STORAGE_DELETION_DRAIN_ON_COMMIT:
+            transaction.on_commit(StorageDeletionService.submit)
+
+    @staticmethod
+    def get_worker():
+        with StorageDeletionService._lock:
+            if StorageDeletionService._worker is None:
+                StorageDeletionService._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='storage-deletion')
+            return StorageDeletionService._worker
+
+    @staticmethod
+    def submit():
+        """Drains the outbox on the background worker thread and returns immediately."""
+        return StorageDeletionService.get_worker().submit(StorageDeletionService._run_in_background)
+
+    @staticmethod
+    def _run_in_background():
+        try:
+            StorageDeletionService.drain()
+        except Exception as e:
+            logger.exception(f"Background storage deletion failed: {e}")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def get_referenced_names(names) -> set:
+        """Returns the subset of `names` that a Document still uses as its file, preview or a retained original."""
+        names = list(names)
+        referenced = set()
+        for start in range(0, len(names), S3_DELETE_OBJECTS_LIMIT):
+            batch = names[start:start + S3_DELETE_OBJECTS_LIMIT]
+            for file_name, preview_name in (Document.objects.filter(Q(file__in=batch) | Q(preview__in=batch))
+                                            .values_list('file', 'preview')):
+                referenced.update((file_name, preview_name))
+            referenced.update(DocumentOriginal.objects.filter(file__in=batch).values_list('file', flat=True))
+        return referenced & set(names)
+
+    @staticmethod
+    def get_lock_key(name) -> int:
+        """Signed 64-bit PostgreSQL advisory lock key for a storage name."""
+        return int.from_bytes(hashlib.sha256(name.encode('utf-8')).digest()[:8], 'big', signed=True)
+
+    @staticmethod
+    def lock_for_reuse(names):
+        """
+        Keeps the outbox from deleting these objects until the current transaction ends; call it
+        before checking whether an object exists and keep the reference in the same transaction.
+        On PostgreSQL these are shared advisory locks, so uploads never wait on each other. Other
+        backends (SQLite) have one database-wide write lock, which any write statement holds
+        until commit; it serializes this transaction with the deletion batch.
+        """
+        names = sorted({name for name in names if name})
+        # Outside a transaction the lock would end with the statement; such callers reference
+        # the objects later and re-check them with `claim_stored`.
+        if not names or not connection.in_atomic_block:
+            return
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for name in names:
+                    cursor.execute("SELECT pg_advisory_xact_lock_shared(%s)",
+                                   [StorageDeletionService.get_lock_key(name)])
+        else:
+            StorageDeletion.objects.filter(name__in=names).update(available_at=F('available_at'))
+
+    @staticmethod
+    def lock_for_deletion(names) -> set:
+        """
+        Exclusively locks the names a batch is about to delete, until its transaction ends.
+        It never waits (so it cannot deadlock with uploads holding several names); names that an
+        upload is reusing right now are left out and retried later.
+        Returns:
+            set: The names that were locked.
+        """
+        names = sorted(names)
+        if connection.vendor != 'postgresql':
+            StorageDeletionService.lock_for_reuse(names)
+            return set(names)
+        locked = set()
+        with connection.cursor() as cursor:
+            for name in names:
+                cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [StorageDeletionService.get_lock_key(name)])
+                if cursor.fetchone()[0]:
+                    locked.add(name)
+        return locked
+
+    @staticmethod
+    def claim_stored(storage, names) -> set:
+        """
+        For objects stored before the transaction that references them (by worker threads or
+        processes): takes the reuse lock and reports which of them a batch deleted in between.
+        Call it inside the referencing transaction.
+        Returns:
+            set: The names no longer in storage.
+        """
+        names = {name for name in names if name}
+        StorageDeletionService.lock_for_reuse(names)
+        return {name for name in names if not storage.exists(name)}
+
+    @staticmethod
+    def delete_objects(storage, names) -> dict:
+        """
+        Deletes stored objects in bulk.
+        Returns:
+            dict: {storage key: error message} for the objects that could not be deleted.
+        """
+        failures = {}
+        if not StorageDeletionService.is_s3(storage):
+            for name in names:
+                try:
+                    storage.delete(name)
+                except Exception as e:
+                    failures[name] = f"{type(e).__name__}: {e}"
+            return failures
+
+        client = storage.connection.meta.client
+        for start in range(0, len(names), S3_DELETE_OBJECTS_LIMIT):
+            batch = names[start:start + S3_DELETE_OBJECTS_LIMIT]
+            keys = {storage._normalize_name(name): name for name in batch}
+            try:
+                # Deleting a missing key succeeds, so retries are idempotent.
+                response = client.delete_objects(
+                    Bucket=storage.bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True},
+                )
+            except Exception as e:
+                failures.update((name, f"{type(e).__name__}: {e}") for name in batch)
+                continue
+            for error in response.get('Errors', []):
+                failures[keys.get(error['Key'], error['Key'])] = f"{error.get('Code')}: {error.get('Message')}"
+        return failures
+
+    @staticmethod
+    def get_retry_delay(attempts):
+        return timedelta(seconds=min(settings.STORAGE_DELETION_RETRY_SECONDS * 2 ** (attempts - 1), 6 * 60 * 60))
+
+    @staticmethod
+    def process_batch(storage=None, batch_size=None):
+        """
+        Claims and processes one batch of due outbox rows.
+        Returns:
+            dict | None: Counts of 'deleted', 'kept' (still referenced), 'deferred' (being reused
+            by an upload right now) and 'failed' keys, or None if nothing was due.
+        """
+        storage = storage or default_storage
+        batch_size = min(batch_size or settings.STORAGE_DELETION_BATCH_SIZE, S3_DELETE_OBJECTS_LIMIT)
+        now = timezone.now()
+        with transaction.atomic():
+            entries = list(StorageDeletion.objects.select_for_update(skip_locked=True)
+                           .filter(available_at__lte=now, attempts__lt=settings.STORAGE_DELETION_MAX_ATTEMPTS)
+                           .order_by('available_at', 'id')[:batch_size])
+            if not entries:
+                return None
+            # Lease the rows: concurrent workers skip them, and a crashed worker's batch is retried later.
+            StorageDeletion.objects.filter(id__in=[entry.id for entry in entries]).update(
+                available_at=now + timedelta(seconds=settings.STORAGE_DELETION_LEASE_SECONDS))
+
+        names = {entry.name for entry in entries}
+        # References are checked and the objects deleted under the lock that reuse also takes.
+        with transaction.atomic():
+            locked = StorageDeletionService.lock_for_deletion(names)
+            referenced = StorageDeletionService.get_referenced_names(locked)
+            failures = StorageDeletionService.delete_objects(storage, sorted(locked - referenced))
+
+            StorageDeletion.objects.filter(id__in=[entry.id for entry in entries
+                                                   if entry.name in locked and entry.name not in failures]).delete()
+            StorageDeletion.objects.filter(id__in=[entry.id for entry in entries if entry.name not in locked]).update(
+                available_at=now + timedelta(seconds=settings.STORAGE_DELETION_RETRY_SECONDS))
+            for entry in entries:
+                if entry.name in failures:
+                    attempts = entry.attempts + 1
+                    StorageDeletion.objects.filter(id=entry.id).update(
+                        attempts=F('attempts') + 1, last_error=failures[entry.name][:2000],
+                        available_at=now + StorageDeletionService.get_retry_delay(attempts))
+                    log = logger.error if attempts >= settings.STORAGE_DELETION_MAX_ATTEMPTS else logger.warning
+                    log(f"Could not delete stored file '{entry.name}' (attempt {attempts}): {failures[entry.name]}")
+
+        summary = {'deleted': len(locked - referenced - set(failures)), 'kept': len(referenced),
+                   'deferred': len(names - locked), 'failed': len(failures)}
+        logger.info(f"Storage deletion batch processed: {summary}.")
+        return summary
+
+    @staticmethod
+    def drain(storage=None, batch_size=None) -> dict:
+        """Processes due outbox rows until none are left. Returns the summed batch counts."""
+        totals = {'deleted': 0, 'kept': 0, 'deferred': 0, 'failed': 0}
+        while True:
+            summary = StorageDeletionService.process_batch(storage, batch_size)
+            if summary is None:
+                return totals
+            for outcome, count in summary.items():
+                totals[outcome] += count
+
+    @staticmethod
+    def get_exhausted():
+        """Outbox rows that reached STORAGE_DELETION_MAX_ATTEMPTS and are no longer retried on their own."""
+        return StorageDeletion.objects.filter(attempts__gte=settings.STORAGE_DELETION_MAX_ATTEMPTS)
+
+    @staticmethod
+    def retry_exhausted(names=None) -> int:
+        """
+        Makes exhausted outbox rows due again with a fresh attempt budget.
+        Args:
+            names (iterable[str]): Only rows for these keys; None for all of them.
+        Returns:
+            int: Number of rows requeued.
+        """
+        exhausted = StorageDeletionService.get_exhausted()
+        if names is not None:
+            exhausted = exhausted.filter(name__in=list(names))
+        return exhausted.update(attempts=0, available_at=timezone.now())
+
+    @staticmethod
+    def iter_stored_files(storage, prefix):
+        """Yields (storage key, last modified) for every object under `prefix`."""
+        if StorageDeletionService.is_s3(storage):
+            # Keys include the storage's location (key prefix); storage names do not.
+            location = f"{storage.location.strip('/')}/" if storage.location else ''
+            paginator = storage.connection.meta.client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=storage.bucket_name, Prefix=storage._normalize_name(prefix)):
+                for item in page.get('Contents', []):
+                    yield item['Key'][len(location):], item['LastModified']
+            return
+        if not storage.exists(prefix):
+            return
+        directories, files = storage.listdir(prefix)
+        for file_name in files:
+            name = f"{prefix.rstrip('/')}/{file_name}"
+            yield name, storage.get_modified_time(name)
+        for directory in directories:
+            yield from StorageDeletionService.iter_stored_files(storage, f"{prefix.rstrip('/')}/{directory}")
+
+    @staticmethod
+    def reap_orphans(storage=None, prefix='documents/', min_age=None, dry_run=False) -> dict:
+        """
+        Queues every stored object under `prefix` that no Document references and that is
+        older than `min_age`. The age guard (never shorter than the direct upload finalize
+        window) protects files whose Document row is not written yet. Orphans whose outbox row
+        ran out of attempts are requeued with a fresh attempt budget.
+        Returns:
+            dict: Number of objects 'scanned' and 'orphaned'.
+        """
+        storage = storage or default_storage
+        min_age = max(min_age if min_age is not None else timedelta(seconds=settings.STORAGE_ORPHAN_MIN_AGE_SECONDS),
+                      timedelta(seconds=settings.DIRECT_UPLOAD_FINALIZE_WINDOW_SECONDS))
+        cutoff = timezone.now() - min_age
+        scanned = orphaned = 0
+        page = []
+
+        def flush(page):
+            names = {name for name, modified in page if modified <= cutoff}
+            names -= StorageDeletionService.get_referenced_names(names)
+            queued = StorageDeletion.objects.filter(name__in=names)
+            exhausted = set(queued.filter(attempts__gte=settings.STORAGE_DELETION_MAX_ATTEMPTS)
+                            .values_list('name', flat=True))
+            names -= set(queued.values_list('name', flat=True))
+            if not dry_run:
+                StorageDeletion.objects.bulk_create([StorageDeletion(name=name) for name in sorted(names)])
+                StorageDeletionService.retry_exhausted(exhausted)
+            return len(names) + len(exhausted)
+
+        for name, modified in StorageDeletionService.iter_stored_files(storage, prefix):
+            if timezone.is_naive(modified):
+                modified = timezone.make_aware(modified)
+            page.append((name, modified))
+            scanned += 1
+            if len(page) == S3_DELETE_OBJECTS_LIMIT:
+                orphaned += flush(page)
+                page = []
+        if page:
+            orphaned += flush(page)
+
+        logger.info(f"Orphan reaper scanned {scanned} object(s) under '{prefix}' and "
+                    f"{'found' if dry_run else 'queued'} {orphaned} orphan(s).")
+        return {'scanned': scanned, 'orphaned': orphaned}
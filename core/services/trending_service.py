@@ -0,0 +1,136 @@
+# core/services/trending_service.py
+
+import math
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BooleanField, ExpressionWrapper, F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import Document, DocumentTrendingScore
+from core.models.base import DocumentStatus
+from core.serializers.document_serializers import DocumentValuesSerializer
+
+logger = logging.getLogger(__name__)
+
+# Scores are decayed towards this fixed instant, so that stored scores never need rewriting.
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class TrendingService:
+    """
+    Ranks approved documents by time-decayed view and download activity.
+    A document's score is sum(weight * 2 ** (-age / half-life)) over its views and downloads.
+    Multiplying every term by the same growth factor does not change the ranking, so the rollup
+    stores ln(sum(weight * 2 ** ((event time - epoch) / half-life))), which only changes when a
+    document gets new activity:
+    1. `refresh` (run periodically by `update_trending_scores`, outside the web processes) adds
+       the activity recorded in the document counters since its previous run to the affected
+       rows only, with one upsert.
+    2. Top-K queries are an index range scan over the rollup; the current score is recovered by
+       subtracting the epoch offset, and rows below DOCUMENT_TRENDING_MIN_SCORE are not returned.
+    Results are cached per (program, course, limit) for DOCUMENT_TRENDING_CACHE_TIMEOUT seconds.
+    """
+    @staticmethod
+    def get_offset(now=None) -> float:
+        """ln of the factor by which activity at `now` is weighted relative to activity at the epoch."""
+        age = ((now or timezone.now()) - TRENDING_EPOCH).total_seconds()
+        return age * math.log(2) / (settings.DOCUMENT_TRENDING_HALF_LIFE_HOURS * 3600)
+
+    @staticmethod
+    def add_log_scores(a, b):
+        """ln(e**a + e**b) without overflowing; either side may be None (no activity)."""
+        if a is None or b is None:
+            return b if a is None else a
+        high, low = max(a, b), min(a, b)
+        return high + math.log1p(math.exp(low - high))
+
+    @staticmethod
+    def refresh(now=None) -> int:
+        """
+        Folds new document activity into the rollup. Only documents whose counters, status or
+        course changed since the last refresh are written; activity counts while a document is
+        approved. Concurrent runs are harmless: each writes absolute values, and activity a run
+        misses is picked up by the next one.
+        Returns:
+            int: Number of rollup rows written.
+        """
+        now = now or timezone.now()
+        offset = TrendingService.get_offset(now)
+        approved = Q(status=DocumentStatus.APPROVED)
+        no_course = -1
+        changed = (
+            Document.objects
+            .filter(Q(trending_score__isnull=False) | Q(view_count__gt=0) | Q(download_count__gt=0))
+            .annotate(is_approved=ExpressionWrapper(approved, output_field=BooleanField()),
+                      seen_views=Coalesce('trending_score__views_seen', Value(0)),
+                      seen_downloads=Coalesce('trending_score__downloads_seen', Value(0)),
+                      seen_course=Coalesce('trending_score__course_id', Value(no_course)),
+                      current_course=Coalesce('course_id', Value(no_course)))
+            .exclude(view_count=F('seen_views'), download_count=F('seen_downloads'),
+                     seen_course=F('current_course'), trending_score__approved=F('is_approved'))
+            .values_list('id', 'is_approved', 'course_id', 'course__program_id', 'view_count', 'download_count',
+                         'seen_views', 'seen_downloads', 'trending_score__log_score')
+        )
+
+        scores = []
+        for document_id, is_approved, course_id, program_id, views, downloads, seen_views, seen_downloads, \
+                log_score in changed.iterator(chunk_size=settings.DOCUMENT_BULK_BATCH_SIZE):
+            activity = (settings.DOCUMENT_TRENDING_VIEW_WEIGHT * max(0, views - seen_views) +
+                        settings.DOCUMENT_TRENDING_DOWNLOAD_WEIGHT * max(0, downloads - seen_downloads))
+            if is_approved and activity > 0:
+                log_score = TrendingService.add_log_scores(log_score, math.log(activity) + offset)
+            scores.append(DocumentTrendingScore(
+                document_id=document_id, approved=is_approved, program_id=program_id, course_id=course_id,
+                log_score=log_score, views_seen=views, downloads_seen=downloads))
+
+        DocumentTrendingScore.objects.bulk_create(
+            scores, batch_size=settings.DOCUMENT_BULK_BATCH_SIZE, update_conflicts=True,
+            unique_fields=['document'],
+            update_fields=['approved', 'program', 'course', 'log_score', 'views_seen', 'downloads_seen'])
+        logger.info(f"Trending refresh updated {len(scores)} document score(s).")
+        return len(scores)
+
+    @staticmethod
+    def get_top(program_id=None, course_id=None, limit=20, now=None) -> list:
+        """
+        The highest-scoring approved documents, best first.
+        Returns:
+            list: (document ID, current decayed score) tuples.
+        """
+        offset = TrendingService.get_offset(now)
+        queryset = DocumentTrendingScore.objects.filter(
+            approved=True, log_score__gte=math.log(settings.DOCUMENT_TRENDING_MIN_SCORE) + offset)
+        if program_id is not None:
+            queryset = queryset.filter(program_id=program_id)
+        if course_id is not None:
+            queryset = queryset.filter(course_id=course_id)
+        top = queryset.order_by('-log_score', 'document_id').values_list('document_id', 'log_score')[:limit]
+        return [(document_id, math.exp(log_score - offset)) for document_id, log_score in top]
+
+    @staticmethod
+    def get_trending(program_id=None, course_id=None, limit=20) -> list:
+        """
+        Serialized trending documents (DocumentRetrieveSerializer output plus 'trending_score'),
+        cached briefly per selection. Only approved documents are ranked, so the result is the
+        same for every user.
+        """
+        cache_key = f"documents:trending:{program_id}:{course_id}:{limit}"
+        results = cache.get(cache_key)
+        if results is not None:
+            return results
+
+        top = TrendingService.get_top(program_id, course_id, limit)
+        serializer = DocumentValuesSerializer()
+        rows = serializer.serialize(serializer.get_rows(
+            Document.objects.filter(id__in=[pk for pk, _ in top], status=DocumentStatus.APPROVED)))
+        by_id = {row['id']: row for row in rows}
+        results = []
+        for document_id, score in top:
+            if document_id in by_id:
+                results.append({**by_id[document_id], 'trending_score': round(score, 4)})
+        cache.set(cache_key, results, timeout=settings.DOCUMENT_TRENDING_CACHE_TIMEOUT)
+        return results
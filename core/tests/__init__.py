@@ -1,2 +1,26 @@
 from .test_auth_api import *
-from .test_document_views import *
\ No newline at end of file
+from .test_document_views import *
+from .test_document_filters import *
+from .test_document_search import *
+from .test_text_extraction import *
+from .test_direct_upload import *
+from .test_chunked_upload import *
+from .test_content_dedup import *
+from .test_document_download import *
+from .test_bulk_review import *
+from .test_bulk_ingest import *
+from .test_document_previews import *
+from .test_document_fields import *
+from .test_document_values_serializer import *
+from .test_document_facets import *
+from .test_conditional_requests import *
+from .test_file_url_cache import *
+from .test_storage_deletion import *
+from .test_compression import *
+from .test_image_processing import *
+from .test_document_export import *
+from .test_document_bundle import *
+from .test_document_counters import *
+from .test_document_trending import *
+from .test_review_queue import *
+from .test_user_roles import *
\ No newline at end of file
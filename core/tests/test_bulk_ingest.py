@@ -0,0 +1,115 @@
+import io
+import json
+import os
+import zipfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+
+
+def make_zip(entries):
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return output.getvalue()
+
+
+class BulkIngestTests(TempMediaRootMixin, DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.client.force_authenticate(self.staff)
+        self.course = self.create_course(code="CS201", name="Data Structures")
+        self.academic_year = AcademicYear.objects.get(year_start=2023)
+        self.url = reverse('document-bulk-ingest')
+
+    def row(self, file, title, **extra):
+        return dict({'file': file, 'title': title, 'doc_type': 'endsem', 'course': 'CS201',
+                     'academic_year': '2023-2024', 'semester_number': '3'}, **extra)
+
+    def test_zip_with_embedded_manifest(self):
+        manifest = [
+            self.row('papers/endsem.txt', "DS Endsem"),
+            self.row('papers/insem.txt', "DS Insem", doc_type='insem', course=self.course.id,
+                     academic_year=self.academic_year.id),
+            self.row('papers/copy.txt', "DS Endsem (copy)"),
+            self.row('papers/endsem.txt', "Listed twice"),
+            self.row('papers/missing.pdf', "Missing"),
+            self.row('papers/bad.txt', "Bad metadata", course='NOPE', semester_number='99'),
+        ]
+        archive = make_zip({
+            'manifest.json': json.dumps(manifest),
+            'papers/endsem.txt': b"Trees and graphs",
+            'papers/insem.txt': b"Stacks and queues",
+            'papers/copy.txt': b"Trees and graphs",
+            'papers/bad.txt': b"Whatever",
+            'papers/extra.txt': b"Not in the manifest",
+        })
+        response = self.client.post(self.url, {'archive': SimpleUploadedFile('sem3.zip', archive)}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        report = response.data['data']
+        self.assertEqual(report['summary'], {'created': 3, 'invalid': 3, 'skipped': 1})
+        outcomes = [(result['file'], result['status']) for result in report['results']]
+        self.assertEqual(outcomes, [
+            ('papers/endsem.txt', 'created'), ('papers/insem.txt', 'created'), ('papers/copy.txt', 'created'),
+            ('papers/endsem.txt', 'invalid'), ('papers/missing.pdf', 'invalid'), ('papers/bad.txt', 'invalid'),
+            ('papers/extra.txt', 'skipped'),
+        ])
+        self.assertEqual(set(report['results'][5]['errors']), {'course', 'semester_number'})
+
+        endsem, insem, copy = (Document.objects.get(id=result['document_id']) for result in report['results'][:3])
+        self.assertEqual((insem.doc_type, insem.course, insem.academic_year), ('insem', self.course, self.academic_year))
+        self.assertEqual(endsem.file_format, 'text/plain')
+        self.assertEqual(endsem.status, 'pending')
+        self.assertEqual(endsem.uploader, self.staff)
+        self.assertEqual(copy.file.name, endsem.file.name)
+        self.assertEqual(copy.duplicate_of, endsem)
+        with insem.file.open('rb') as stored:
+            self.assertEqual(stored.read(), b"Stacks and queues")
+
+    def test_individual_files_with_csv_manifest(self):
+        manifest = "file,title,doc_type,course,academic_year,semester_number\n" \
+                   "a.txt,Paper A,notes,CS201,2023-2024,3\n"
+        response = self.client.post(self.url, {
+            'files': [SimpleUploadedFile('a.txt', b"Heaps", content_type='text/plain')],
+            'manifest': SimpleUploadedFile('manifest.csv', manifest.encode()),
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['summary'], {'created': 1})
+        self.assertEqual(Document.objects.get().title, "Paper A")
+
+    def test_rejects_bad_input_and_non_staff(self):
+        response = self.client.post(self.url, {'archive': SimpleUploadedFile('x.zip', b"not a zip")}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {'archive': SimpleUploadedFile('x.zip', make_zip({'a.txt': b"x"}))},
+                                    format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.create_user("student@example.com", "student"))
+        response = self.client.post(self.url, {'archive': SimpleUploadedFile('x.zip', make_zip({'a.txt': b"x"}))},
+                                    format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command_ingests_a_folder(self):
+        folder = os.path.join(self.media_root, 'incoming')
+        os.makedirs(os.path.join(folder, 'sem3'))
+        with open(os.path.join(folder, 'sem3', 'paper.txt'), 'wb') as paper:
+            paper.write(b"Hash tables")
+        with open(os.path.join(folder, 'manifest.json'), 'w') as manifest:
+            json.dump([self.row('sem3/paper.txt', "Hashing")], manifest)
+        report_path = os.path.join(self.media_root, 'report.json')
+
+        call_command('ingest_documents', folder, uploader=self.staff.email, workers=2, report=report_path,
+                     stdout=io.StringIO())
+        self.assertEqual(Document.objects.get().title, "Hashing")
+        with open(report_path) as report_file:
+            self.assertEqual(json.load(report_file)['summary'], {'created': 1})
@@ -0,0 +1,76 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Document, UploadLog
+from core.models.base import DocumentStatus
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class BulkStatusChangeTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        self.url = reverse('document-bulk-status-change')
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.student = self.create_user("student@example.com", "student")
+        self.pending = [self.create_document(self.student, title=f"Pending {i}", doc_status=DocumentStatus.PENDING)
+                        for i in range(4)]
+        self.client.force_authenticate(self.staff)
+
+    def outcomes(self, response):
+        return {item['id']: item['outcome'] for item in response.data['data']['results']}
+
+    def test_applies_mixed_decisions_and_logs_changes(self):
+        first, second, third, fourth = self.pending
+        response = self.client.post(self.url, {
+            'items': [
+                {'id': first.id, 'new_status': 'approved'},
+                {'id': second.id, 'new_status': 'rejected'},
+                {'id': third.id, 'new_status': 'pending'},
+                {'id': fourth.id, 'new_status': 'approved'},
+                {'id': fourth.id, 'new_status': 'rejected'},
+                {'id': 999999, 'new_status': 'approved'},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.outcomes(response), {
+            first.id: 'updated', second.id: 'updated', third.id: 'unchanged',
+            fourth.id: 'conflict', 999999: 'not_found',
+        })
+        self.assertEqual(response.data['data']['summary'],
+                         {'updated': 2, 'unchanged': 1, 'conflict': 1, 'not_found': 1})
+
+        statuses = dict(Document.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[first.id], 'approved')
+        self.assertEqual(statuses[second.id], 'rejected')
+        self.assertEqual(statuses[fourth.id], 'pending')
+        self.assertEqual(
+            sorted(UploadLog.objects.values_list('document_id', 'status', 'reviewer_id')),
+            [(first.id, 'approved', self.staff.id), (second.id, 'rejected', self.staff.id)],
+        )
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        documents = Document.objects.bulk_create([
+            Document(uploader=self.student, title=f"Bulk {i}", doc_type='notes', file=f"documents/{i}.pdf",
+                     status=DocumentStatus.PENDING)
+            for i in range(1000)
+        ])
+        ids = [document.id for document in documents]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'ids': ids, 'new_status': 'approved'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['summary'], {'updated': 1000})
+        self.assertEqual(Document.objects.filter(id__in=ids, status='approved').count(), 1000)
+        self.assertEqual(UploadLog.objects.count(), 1000)
+        # Role lookups plus a few batched statements, never one query per document.
+        self.assertLess(len(queries), 20)
+
+    def test_requires_staff_and_valid_payload(self):
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(self.url, {'ids': [self.pending[0].id]}, format='json').status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.student)
+        response = self.client.post(self.url, {'ids': [self.pending[0].id], 'new_status': 'approved'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,138 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document, UploadSession
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+
+CHUNK_SIZE = 16
+
+
+class ChunkedUploadTests(TempMediaRootMixin, DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.chunk_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.chunk_root, ignore_errors=True)
+        settings_override = override_settings(CHUNKED_UPLOAD_TEMP_DIR=self.chunk_root,
+                                              CHUNKED_UPLOAD_MIN_CHUNK_SIZE=CHUNK_SIZE)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.student = self.create_user("student@example.com", "student")
+        self.client.force_authenticate(self.student)
+        self.payload = b"Scanned exam paper, page after page. " * 2
+        self.chunks = [self.payload[i:i + CHUNK_SIZE] for i in range(0, len(self.payload), CHUNK_SIZE)]
+        self.metadata = {
+            'file_name': "Endsem 2024.txt",
+            'content_type': 'text/plain',
+            'total_size': len(self.payload),
+            'chunk_size': CHUNK_SIZE,
+            'sha256': hashlib.sha256(self.payload).hexdigest(),
+            'title': "Endsem 2024",
+            'doc_type': 'endsem',
+            'course': self.create_course().id,
+            'academic_year': AcademicYear.objects.first().id,
+            'semester_number': '5',
+        }
+
+    def create_session(self):
+        response = self.client.post(reverse('upload-session-create'), self.metadata, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['data']['session_id']
+
+    def put_chunk(self, session_id, index, data=None, checksum=None):
+        data = self.chunks[index] if data is None else data
+        return self.client.put(
+            reverse('upload-session-chunk', args=[session_id, index]), data,
+            content_type='application/octet-stream',
+            HTTP_X_CHUNK_SHA256=checksum or hashlib.sha256(data).hexdigest(),
+        )
+
+    def progress(self, session_id):
+        return self.client.get(reverse('upload-session-detail', args=[session_id])).data['data']
+
+    def complete(self, session_id):
+        return self.client.post(reverse('upload-session-complete', args=[session_id]))
+
+    def test_out_of_order_chunks_resume_and_complete(self):
+        session_id = self.create_session()
+        self.assertEqual(self.put_chunk(session_id, 2).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.put_chunk(session_id, 0).status_code, status.HTTP_200_OK)
+
+        progress = self.progress(session_id)
+        self.assertEqual(progress['received_chunks'], [0, 2])
+        self.assertEqual(progress['missing_chunks'], [1, 3, 4])
+        self.assertEqual(progress['received_ranges'], [[0, 16], [32, 48]])
+        self.assertEqual(self.complete(session_id).status_code, status.HTTP_400_BAD_REQUEST)
+
+        for index in (1, 3, 4):
+            self.assertEqual(self.put_chunk(session_id, index).status_code, status.HTTP_200_OK)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.complete(session_id)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        document = Document.objects.get(id=response.data['data']['document_id'])
+        self.assertEqual(document.uploader, self.student)
+        self.assertEqual(document.file_format, 'text/plain')
+        with document.file.open('rb') as stored:
+            self.assertEqual(stored.read(), self.payload)
+        self.assertEqual(self.progress(session_id)['status'], UploadSession.SessionStatus.COMPLETED)
+        self.assertFalse(os.path.exists(os.path.join(self.chunk_root, session_id)))
+        # Completing twice must not create a second document.
+        self.assertEqual(self.complete(session_id).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_bad_checksum_and_wrong_size(self):
+        session_id = self.create_session()
+        self.assertEqual(self.put_chunk(session_id, 0, checksum='0' * 64).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.put_chunk(session_id, 0, data=b'short').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.put_chunk(session_id, 9, data=self.chunks[0]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.progress(session_id)['received_chunks'], [])
+
+    def test_whole_file_checksum_is_verified(self):
+        self.metadata['sha256'] = 'a' * 64
+        session_id = self.create_session()
+        for index in range(len(self.chunks)):
+            self.put_chunk(session_id, index)
+        self.assertEqual(self.complete(session_id).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Document.objects.exists())
+
+    def test_sessions_are_private(self):
+        session_id = self.create_session()
+        self.client.force_authenticate(self.create_user("other@example.com", "student"))
+        self.assertEqual(self.put_chunk(session_id, 0).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.complete(session_id).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purge_removes_expired_sessions_and_chunks(self):
+        session_id = self.create_session()
+        self.put_chunk(session_id, 0)
+        live_id = self.create_session()
+        UploadSession.objects.filter(id=session_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        call_command('purge_upload_sessions', stdout=io.StringIO())
+        self.assertEqual(list(UploadSession.objects.values_list('id', flat=True)), [UploadSession.objects.get().id])
+        self.assertEqual(str(UploadSession.objects.get().id), live_id)
+        self.assertFalse(os.path.exists(os.path.join(self.chunk_root, session_id)))
+        self.assertTrue(os.path.exists(os.path.join(self.chunk_root, live_id)))
+
+    def test_purge_only_removes_stale_orphan_directories(self):
+        stale, fresh = os.path.join(self.chunk_root, 'stale'), os.path.join(self.chunk_root, 'fresh')
+        os.makedirs(stale)
+        os.makedirs(fresh)
+        # The orphan sweep can race a session being created; only old directories are orphans.
+        with self.settings(CHUNKED_UPLOAD_SESSION_TTL_SECONDS=60):
+            old = time.time() - 120
+            os.utime(stale, (old, old))
+            call_command('purge_upload_sessions', stdout=io.StringIO())
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(fresh))
@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import io
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Document
+from core.services.document_service import DocumentService
+from core.tests.test_document_download import DocumentDownloadTestMixin
+from core.tests.test_document_views import TempMediaRootMixin
+from core.utils.compression import GzipCompressingStream, decoded_name, get_upload_encoding, open_decoded
+from core.utils.content_hashing import hash_stored_file
+from core.utils.text_extraction import extract_stored_file_text
+
+NOTES = b"Dynamic programming trades memory for time. " * 200
+
+
+@override_settings(DOCUMENT_COMPRESSION_ENABLED=True, DOCUMENT_COMPRESSION_CONTENT_TYPES=['text/plain'],
+                   DOCUMENT_COMPRESSION_MIN_SIZE=1024)
+class AtRestCompressionTests(TempMediaRootMixin, DocumentDownloadTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.client.force_authenticate(self.create_user("student@example.com", "student"))
+
+    def create_text_document(self, data=NOTES):
+        stored = DocumentService.store_file(SimpleUploadedFile("notes.txt", data, content_type='text/plain'))
+        document = self.create_document(self.staff, title="Algorithms Notes")
+        Document.objects.filter(id=document.id).update(
+            file_format='text/plain', **DocumentService.get_stored_file_fields(stored))
+        return Document.objects.get(id=document.id)
+
+    def test_stream_round_trips(self):
+        stream = GzipCompressingStream(io.BytesIO(NOTES))
+        compressed = stream.read()
+        self.assertEqual(gzip.decompress(compressed), NOTES)
+        self.assertEqual((stream.bytes_in, stream.bytes_out), (len(NOTES), len(compressed)))
+
+    def test_eligibility_is_decided_from_the_format(self):
+        self.assertEqual(get_upload_encoding('text/plain', 4096), 'gzip')
+        self.assertIsNone(get_upload_encoding('text/plain', 100))
+        for content_type in ('application/pdf', 'image/jpeg', 'image/png'):
+            self.assertIsNone(get_upload_encoding(content_type, 4096))
+
+    def test_text_upload_is_stored_compressed(self):
+        document = self.create_text_document()
+        self.assertTrue(document.file.name.endswith('.txt.gz'))
+        self.assertEqual(document.file_encoding, 'gzip')
+        self.assertEqual(document.file_size, len(NOTES))
+        self.assertEqual(document.stored_size, default_storage.size(document.file.name))
+        self.assertLess(document.stored_size, document.file_size // 10)
+        with open_decoded(default_storage, document.file.name) as stored_file:
+            self.assertEqual(stored_file.read(), NOTES)
+        self.assertEqual(document.content_hash, hashlib.sha256(NOTES).hexdigest())
+
+    def test_pdf_upload_is_stored_as_is(self):
+        stored = DocumentService.store_file(SimpleUploadedFile("a.pdf", b"%PDF-1.4" * 500, content_type='application/pdf'))
+        self.assertEqual(stored.encoding, '')
+        self.assertEqual(decoded_name(stored.name), stored.name)
+        self.assertEqual(stored.size, stored.stored_size)
+
+    def test_identical_upload_shares_the_compressed_object(self):
+        first = self.create_text_document()
+        second = DocumentService.store_file(SimpleUploadedFile("copy.txt", NOTES, content_type='text/plain'))
+        self.assertEqual(second.name, first.file.name)
+        self.assertEqual(second.stored_size, first.stored_size)
+
+    def test_download_sends_stored_bytes_to_gzip_clients(self):
+        document = self.create_text_document()
+        response = self.download(document, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/plain')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], f'"{document.content_hash}-gzip"')
+        self.assertIn('filename="Algorithms Notes.txt"', response['Content-Disposition'])
+        self.assertEqual(gzip.decompress(self.body(response)), NOTES)
+
+    def test_download_decompresses_for_other_clients(self):
+        document = self.create_text_document()
+        for accept_encoding in ('', 'identity', 'gzip;q=0'):
+            response = self.download(document, HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('Content-Encoding', response)
+            self.assertEqual(response['Accept-Ranges'], 'none')
+            self.assertEqual(response['ETag'], f'"{document.content_hash}"')
+            self.assertEqual(int(response['Content-Length']), len(NOTES))
+            self.assertEqual(self.body(response), NOTES)
+
+    def test_workers_read_the_original_bytes(self):
+        document = self.create_text_document()
+        _, outcome, text, _ = extract_stored_file_text(document.id, document.file.name, 'text/plain', 100)
+        self.assertEqual((outcome, text), ('done', NOTES[:100].decode()))
+        self.assertEqual(hash_stored_file(document.id, document.file.name)[1], document.content_hash)
+
+    def test_report_counts_shared_objects_once(self):
+        document = self.create_text_document()
+        copy = self.create_document(self.staff, title="Copy", file_encoding='gzip', file_size=document.file_size,
+                                    stored_size=document.stored_size)
+        Document.objects.filter(id=copy.id).update(file=document.file.name)
+        stats = DocumentService.get_compression_stats()
+        self.assertEqual(stats['objects'], 1)
+        self.assertEqual(stats['saved_bytes'], document.file_size - document.stored_size)
+
+        output = io.StringIO()
+        call_command('compression_report', stdout=output)
+        self.assertIn(f"{stats['saved_bytes']} saved", output.getvalue())
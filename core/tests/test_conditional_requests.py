@@ -0,0 +1,84 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models.base import DocumentStatus
+from core.services.document_service import DocumentService
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class DocumentConditionalGetTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        self.list_url = reverse('document-list')
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.student = self.create_user("student@example.com", "student")
+        self.approved = self.create_document(self.staff, title="Approved")
+        self.pending = self.create_document(self.staff, title="Pending", doc_status=DocumentStatus.PENDING)
+        self.detail_url = reverse('document-detail', kwargs={'id': self.approved.id})
+
+    def get(self, user, url, **headers):
+        self.client.force_authenticate(user)
+        return self.client.get(url, headers=headers)
+
+    def test_list_returns_304_without_serializing(self):
+        first = self.get(self.student, self.list_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertTrue(first['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', first)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get(self.student, self.list_url, if_none_match=first['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second['ETag'], first['ETag'])
+        document_queries = [query['sql'] for query in queries if 'core_document' in query['sql']]
+        self.assertEqual(len(document_queries), 1)
+        self.assertIn('MAX(', document_queries[0])
+
+    def test_list_etag_changes_with_visible_data(self):
+        etag = self.get(self.student, self.list_url)['ETag']
+        DocumentService.change_document_status(self.pending.id, DocumentStatus.APPROVED, self.staff)
+        response = self.get(self.student, self.list_url, if_none_match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['results']), 2)
+
+        etag = response['ETag']
+        DocumentService.delete_document(self.pending.id)
+        response = self.get(self.student, self.list_url, if_none_match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['results']), 1)
+
+    def test_list_etag_depends_on_query_parameters(self):
+        etag = self.get(self.student, self.list_url)['ETag']
+        response = self.get(self.student, f"{self.list_url}?fields=id", if_none_match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_roles_and_users_never_share_validators(self):
+        staff_etag = self.get(self.staff, self.list_url)['ETag']
+        response = self.get(self.student, self.list_url, if_none_match=staff_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], staff_etag)
+
+        other_student = self.create_user("other@example.com", "student")
+        response = self.get(other_student, self.detail_url, if_none_match=self.get(self.student, self.detail_url)['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_conditional_get(self):
+        first = self.get(self.student, self.detail_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get(self.student, self.detail_url, if_none_match=first['ETag']).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.get(self.student, self.detail_url, if_modified_since=first['Last-Modified']).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+        DocumentService.update_document_metadata(self.approved.id, {'title': "Renamed"})
+        response = self.get(self.student, self.detail_url, if_none_match=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['title'], "Renamed")
+
+    def test_access_check_precedes_conditional_response(self):
+        url = reverse('document-detail', kwargs={'id': self.pending.id})
+        etag = self.get(self.staff, url)['ETag']
+        response = self.get(self.student, url, if_none_match=etag, if_modified_since='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,74 @@
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.services import document_service
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+
+
+class ContentDeduplicationTests(TempMediaRootMixin, DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.course = self.create_course()
+        self.academic_year = AcademicYear.objects.first()
+        self.payload = b"Operating Systems endsem 2023"
+        self.digest = hashlib.sha256(self.payload).hexdigest()
+
+    def upload(self, user, name="paper.txt"):
+        self.client.force_authenticate(user)
+        response = self.client.post(reverse('document-upload'), {
+            'file': SimpleUploadedFile(name, self.payload, content_type='text/plain'),
+            'title': "OS Endsem", 'doc_type': 'endsem', 'course': self.course.id,
+            'academic_year': self.academic_year.id, 'semester_number': '4',
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['data']
+
+    def test_identical_uploads_share_one_object_and_are_flagged(self):
+        # The digest comes from the upload handler, not from a second pass over the file.
+        with mock.patch.object(document_service, 'sha256_file', side_effect=AssertionError("re-hashed")):
+            first = self.upload(self.create_user("a@example.com", "student"))
+            second = self.upload(self.create_user("b@example.com", "student"), name="copy.TXT")
+
+        self.assertIsNone(first['duplicate_of'])
+        self.assertEqual(second['duplicate_of'], first['document_id'])
+        original, duplicate = Document.objects.get(id=first['document_id']), Document.objects.get(id=second['document_id'])
+        self.assertEqual(original.content_hash, self.digest)
+        self.assertEqual(duplicate.file.name, original.file.name)
+        self.assertEqual(original.file.name, f"documents/sha256/{self.digest[:2]}/{self.digest[2:4]}/{self.digest}.txt")
+
+        stored = [name for _, _, files in os.walk(self.media_root) for name in files]
+        self.assertEqual(stored, [f"{self.digest}.txt"])
+
+    def test_backfill_command_hashes_existing_documents(self):
+        uploader = self.create_user("staff@example.com", "staff")
+        names = [default_storage.save(f"documents/legacy_{i}.txt", ContentFile(self.payload)) for i in range(2)]
+        other = default_storage.save("documents/other.txt", ContentFile(b"Different paper"))
+        documents = [self.create_document(uploader, title=f"Legacy {i}") for i in range(3)]
+        for document, name in zip(documents, names + [other]):
+            Document.objects.filter(id=document.id).update(file=name)
+
+        # Threads instead of spawned processes so the workers see the test settings.
+        with mock.patch('core.management.commands.backfill_content_hashes.create_process_pool',
+                               side_effect=lambda workers: ThreadPoolExecutor(workers)):
+            call_command('backfill_content_hashes', workers=2, batch_size=2, stdout=io.StringIO())
+
+        first, second, third = Document.objects.filter(id__in=[d.id for d in documents]).order_by('id')
+        self.assertEqual(first.content_hash, self.digest)
+        self.assertEqual(second.content_hash, self.digest)
+        self.assertEqual(third.content_hash, hashlib.sha256(b"Different paper").hexdigest())
+        self.assertIsNone(first.duplicate_of_id)
+        self.assertEqual(second.duplicate_of_id, first.id)
+        self.assertIsNone(third.duplicate_of_id)
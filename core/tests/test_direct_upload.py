@@ -0,0 +1,150 @@
+import hashlib
+import unittest
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, DirectUpload, Document
+from core.services.direct_upload_service import DirectUploadService
+from core.tests.test_document_views import DocumentTestDataMixin
+
+try:
+    import boto3
+    import requests
+    from moto import mock_aws
+except ImportError:  # moto is a test-only dependency
+    mock_aws = None
+
+BUCKET_NAME = 'archivus-test'
+
+S3_STORAGES = {
+    'default': {
+        'BACKEND': 'storages.backends.s3boto3.S3Boto3Storage',
+        'OPTIONS': {
+            'bucket_name': BUCKET_NAME,
+            'region_name': 'us-east-1',
+            'access_key': 'testing',
+            'secret_key': 'testing',
+        },
+    },
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@unittest.skipIf(mock_aws is None, "moto is not installed")
+@override_settings(STORAGES=S3_STORAGES, DIRECT_UPLOAD_MAX_SIZE=1024)
+class DirectUploadTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        self.s3 = boto3.client('s3', region_name='us-east-1',
+                               aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.s3.create_bucket(Bucket=BUCKET_NAME)
+
+        self.student = self.create_user("student@example.com", "student")
+        self.client.force_authenticate(self.student)
+        self.metadata = {
+            'file_name': "Endsem 2024.pdf",
+            'content_type': 'application/pdf',
+            'title': "Endsem 2024",
+            'doc_type': 'endsem',
+            'course': self.create_course().id,
+            'academic_year': AcademicYear.objects.first().id,
+            'semester_number': '5',
+        }
+
+    def presign(self):
+        response = self.client.post(reverse('document-upload-presign'), self.metadata, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['data']
+
+    def finalize(self, upload_token):
+        return self.client.post(reverse('document-upload-finalize'), {'upload_token': upload_token}, format='json')
+
+    def test_presigned_post_then_finalize_creates_document(self):
+        upload = self.presign()
+        self.assertRegex(upload['key'], r'^documents/[0-9a-f]{32}/Endsem_2024\.pdf$')
+        self.assertEqual(upload['fields']['key'], upload['key'])
+
+        posted = requests.post(upload['url'], data=upload['fields'],
+                               files={'file': ('paper.pdf', b'%PDF-1.4 direct', 'application/pdf')})
+        self.assertLess(posted.status_code, 300)
+
+        response = self.finalize(upload['upload_token'])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        document = Document.objects.get(id=response.data['data']['document_id'])
+        self.assertEqual(document.file.name, upload['key'])
+        self.assertEqual(document.file_format, 'application/pdf')
+        self.assertEqual(document.uploader, self.student)
+
+        # The same token cannot create a second document.
+        self.assertEqual(self.finalize(upload['upload_token']).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_finalize_is_a_single_claim(self):
+        upload = self.presign()
+        self.s3.put_object(Bucket=BUCKET_NAME, Key=upload['key'], Body=b'%PDF-1.4 direct')
+        self.assertEqual(self.finalize(upload['upload_token']).status_code, status.HTTP_201_CREATED)
+
+        # A second finalize that got past the early check (as a concurrent one would) still
+        # loses on the claim, within the same transaction.
+        with mock.patch.object(DirectUploadService, 'is_finalized', return_value=False):
+            response = self.finalize(upload['upload_token'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Document.objects.count(), 1)
+        self.assertEqual(DirectUpload.objects.get(key=upload['key']).document, Document.objects.get())
+
+    def test_identical_direct_uploads_are_hashed_and_flagged_as_duplicates(self):
+        content = b'%PDF-1.4 same paper'
+        documents = []
+        for _ in range(2):
+            upload = self.presign()
+            self.s3.put_object(Bucket=BUCKET_NAME, Key=upload['key'], Body=content)
+            response = self.finalize(upload['upload_token'])
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            documents.append(Document.objects.get(id=response.data['data']['document_id']))
+
+        original, duplicate = documents
+        self.assertEqual(original.content_hash, hashlib.sha256(content).hexdigest())
+        self.assertEqual((original.file_size, original.stored_size), (len(content), len(content)))
+        self.assertIsNone(original.duplicate_of_id)
+        self.assertEqual(duplicate.content_hash, original.content_hash)
+        self.assertEqual(duplicate.duplicate_of_id, original.id)
+
+    def test_finalize_requires_uploaded_object(self):
+        upload = self.presign()
+        self.assertEqual(self.finalize(upload['upload_token']).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Document.objects.exists())
+
+    def test_finalize_rejects_oversized_object(self):
+        upload = self.presign()
+        self.s3.put_object(Bucket=BUCKET_NAME, Key=upload['key'], Body=b'x' * 2048)
+        self.assertEqual(self.finalize(upload['upload_token']).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.s3.list_objects_v2(Bucket=BUCKET_NAME).get('KeyCount'), 0)
+
+    def test_finalize_rejects_other_users_and_tampered_tokens(self):
+        upload = self.presign()
+        self.s3.put_object(Bucket=BUCKET_NAME, Key=upload['key'], Body=b'%PDF')
+        self.assertEqual(self.finalize(upload['upload_token'] + 'x').status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.create_user("other@example.com", "student"))
+        self.assertEqual(self.finalize(upload['upload_token']).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_unsupported_content_type(self):
+        self.metadata['content_type'] = 'application/zip'
+        response = self.client.post(reverse('document-upload-presign'), self.metadata, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DirectUploadUnsupportedStorageTests(DocumentTestDataMixin, APITestCase):
+    def test_filesystem_storage_is_rejected(self):
+        self.client.force_authenticate(self.create_user("student@example.com", "student"))
+        response = self.client.post(reverse('document-upload-presign'), {
+            'file_name': "notes.txt", 'content_type': 'text/plain', 'title': "Notes", 'doc_type': 'notes',
+            'course': self.create_course().id, 'academic_year': AcademicYear.objects.first().id,
+            'semester_number': '1',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
@@ -0,0 +1,139 @@
+import io
+import unittest
+import zipfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.models.base import DocumentStatus
+from core.services.bundle_service import DocumentBundleService
+from core.services.document_service import DocumentService
+from core.tests.test_direct_upload import BUCKET_NAME, S3_STORAGES, mock_aws
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+
+PDF_BYTES = b"%PDF-1.4 endsem paper " * 200
+NOTES = b"Normalization removes update anomalies. " * 100
+
+
+class DocumentBundleTestMixin(DocumentTestDataMixin):
+    def create_bundle_documents(self):
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.course = self.create_course()
+        self.academic_year = AcademicYear.objects.get(year_start=2023)
+        common = {'course': self.course, 'academic_year': self.academic_year, 'semester_number': '4'}
+        self.paper = self.create_document(self.staff, title="DBMS Endsem", **common)
+        Document.objects.filter(id=self.paper.id).update(
+            file=default_storage.save("documents/dbms.pdf", ContentFile(PDF_BYTES)), file_size=len(PDF_BYTES))
+        # Stored gzip-compressed at rest; the bundle must contain the original text.
+        stored = DocumentService.store_file(SimpleUploadedFile("notes.txt", NOTES, content_type='text/plain'))
+        self.notes = self.create_document(self.staff, title="DBMS Notes", doc_type='notes', **common)
+        Document.objects.filter(id=self.notes.id).update(
+            file_format='text/plain', **DocumentService.get_stored_file_fields(stored))
+        self.create_document(self.staff, title="DBMS Draft", doc_status=DocumentStatus.PENDING, **common)
+
+    def bundle(self, **params):
+        return self.client.get(reverse('document-bundle'), params)
+
+    def open_archive(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+
+@override_settings(DOCUMENT_COMPRESSION_ENABLED=True, DOCUMENT_COMPRESSION_CONTENT_TYPES=['text/plain'],
+                   DOCUMENT_COMPRESSION_MIN_SIZE=1024)
+class DocumentBundleTests(TempMediaRootMixin, DocumentBundleTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.create_bundle_documents()
+        self.student = self.create_user("student@example.com", "student")
+        self.client.force_authenticate(self.student)
+
+    def test_bundle_contains_approved_documents(self):
+        response = self.bundle(course=self.course.id)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertIn(f'filename="papers-course-{self.course.id}.zip"', response['Content-Disposition'])
+        archive = self.open_archive(response)
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.namelist(), ["DBMS Endsem.pdf", "DBMS Notes.txt"])
+        self.assertEqual(archive.read("DBMS Endsem.pdf"), PDF_BYTES)
+        self.assertEqual(archive.read("DBMS Notes.txt"), NOTES)
+        # PDFs are stored as is; text is deflated.
+        self.assertEqual(archive.getinfo("DBMS Endsem.pdf").compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.getinfo("DBMS Notes.txt").compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_identical_bundles_share_a_stable_etag(self):
+        first = self.bundle(course=self.course.id)
+        body = b''.join(first.streaming_content)
+        self.client.force_authenticate(self.create_user("other@example.com", "student"))
+        second = self.bundle(course=self.course.id)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(body, b''.join(second.streaming_content))
+
+        not_modified = self.client.get(reverse('document-bundle'), {'course': self.course.id},
+                                       HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.assertNotEqual(self.bundle(academic_year=self.academic_year.id, semester_number='4')['ETag'],
+                            first['ETag'])
+        Document.objects.filter(title="DBMS Draft").update(status=DocumentStatus.APPROVED)
+        self.assertNotEqual(self.bundle(course=self.course.id)['ETag'], first['ETag'])
+
+    def test_clashing_titles_get_unique_names(self):
+        duplicate = self.create_document(self.staff, title="DBMS Endsem", course=self.course)
+        Document.objects.filter(id=duplicate.id).update(file=Document.objects.get(id=self.paper.id).file.name)
+        archive = self.open_archive(self.bundle(course=self.course.id))
+        self.assertIn(f"DBMS Endsem ({duplicate.id}).pdf", archive.namelist())
+
+    def test_stream_uses_bounded_chunks(self):
+        documents = DocumentBundleService.get_documents({'course_id': self.course.id})
+        chunks = list(DocumentBundleService.stream(documents, chunk_size=512))
+        self.assertLess(max(len(chunk) for chunk in chunks), 1024)
+        self.assertEqual(zipfile.ZipFile(io.BytesIO(b''.join(chunks))).read("DBMS Endsem.pdf"), PDF_BYTES)
+
+    def test_storage_read_error_aborts_the_stream(self):
+        documents = DocumentBundleService.get_documents({'course_id': self.course.id})
+        chunks = []
+        with mock.patch.object(DocumentBundleService, 'iter_content', side_effect=OSError("storage unavailable")):
+            with self.assertRaises(OSError):
+                for chunk in DocumentBundleService.stream(documents):
+                    chunks.append(chunk)
+        # What was sent is not a complete archive.
+        with self.assertRaises(zipfile.BadZipFile):
+            zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+    def test_invalid_and_oversized_selections(self):
+        self.assertEqual(self.bundle().status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.bundle(academic_year=self.academic_year.id).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.bundle(course=999999).status_code, status.HTTP_404_NOT_FOUND)
+        with override_settings(DOCUMENT_BUNDLE_MAX_FILES=1):
+            self.assertEqual(self.bundle(course=self.course.id).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@unittest.skipIf(mock_aws is None, "moto is not installed")
+@override_settings(STORAGES=S3_STORAGES, DOCUMENT_COMPRESSION_ENABLED=True,
+                   DOCUMENT_COMPRESSION_CONTENT_TYPES=['text/plain'], DOCUMENT_COMPRESSION_MIN_SIZE=1024)
+class RemoteDocumentBundleTests(DocumentBundleTestMixin, APITestCase):
+    def setUp(self):
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        import boto3
+        boto3.client('s3', region_name='us-east-1', aws_access_key_id='testing',
+                     aws_secret_access_key='testing').create_bucket(Bucket=BUCKET_NAME)
+
+        self.create_bundle_documents()
+        self.client.force_authenticate(self.staff)
+
+    def test_streams_objects_from_s3(self):
+        archive = self.open_archive(self.bundle(course=self.course.id))
+        self.assertEqual(archive.read("DBMS Endsem.pdf"), PDF_BYTES)
+        self.assertEqual(archive.read("DBMS Notes.txt"), NOTES)
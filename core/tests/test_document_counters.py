@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Document
+from core.services.counter_service import DocumentCounterService
+from core.tests.test_document_download import DocumentDownloadTestMixin
+from core.tests.test_document_views import TempMediaRootMixin
+
+VIEWS = DocumentCounterService.VIEWS
+DOWNLOADS = DocumentCounterService.DOWNLOADS
+
+
+class DocumentCounterTests(TempMediaRootMixin, DocumentDownloadTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        # Flushes are driven by the tests, never by the background thread.
+        flusher = mock.patch.object(DocumentCounterService, 'start_flusher')
+        flusher.start()
+        self.addCleanup(flusher.stop)
+        DocumentCounterService.take_pending()
+        self.addCleanup(DocumentCounterService.take_pending)
+
+        self.student = self.create_user("student@example.com", "student")
+        self.client.force_authenticate(self.student)
+        staff = self.create_user("staff@example.com", "staff")
+        self.document = self.create_stored_document(staff)
+        self.others = [self.create_document(staff, title=f"Paper {index}") for index in range(2)]
+
+    def test_increments_stay_in_memory_until_flushed(self):
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                DocumentCounterService.increment(self.document.id, VIEWS)
+            DocumentCounterService.increment(self.document.id, DOWNLOADS, 2)
+        self.document.refresh_from_db()
+        self.assertEqual((self.document.view_count, self.document.download_count), (0, 0))
+
+        DocumentCounterService.flush()
+        self.document.refresh_from_db()
+        self.assertEqual((self.document.view_count, self.document.download_count), (5, 2))
+        self.assertEqual(DocumentCounterService.flush(), 0)
+
+    def test_flush_is_one_set_based_update_per_batch(self):
+        updated_at = Document.objects.get(id=self.document.id).updated_at
+        for index, document in enumerate([self.document, *self.others]):
+            DocumentCounterService.increment(document.id, VIEWS, index + 1)
+        DocumentCounterService.increment(self.others[0].id, DOWNLOADS)
+        with self.assertNumQueries(1):
+            self.assertEqual(DocumentCounterService.flush(), 3)
+        counts = dict(Document.objects.filter(id__in=[self.document.id, self.others[0].id, self.others[1].id])
+                      .values_list('id', 'view_count'))
+        self.assertEqual(counts, {self.document.id: 1, self.others[0].id: 2, self.others[1].id: 3})
+        self.assertEqual(Document.objects.get(id=self.others[0].id).download_count, 1)
+        # Counting does not move updated_at, so conditional requests keep working.
+        self.assertEqual(Document.objects.get(id=self.document.id).updated_at, updated_at)
+
+        for document in [self.document, *self.others]:
+            DocumentCounterService.increment(document.id, VIEWS)
+        with self.settings(DOCUMENT_COUNTERS_BATCH_SIZE=2), self.assertNumQueries(2):
+            DocumentCounterService.flush()
+
+    def test_failed_write_is_retried_by_next_flush(self):
+        DocumentCounterService.increment(self.document.id, VIEWS, 3)
+        with mock.patch.object(DocumentCounterService, 'write_counts', side_effect=RuntimeError("database down")):
+            with self.assertRaises(RuntimeError):
+                DocumentCounterService.flush()
+        DocumentCounterService.flush()
+        self.assertEqual(Document.objects.get(id=self.document.id).view_count, 3)
+
+    def test_detail_views_and_downloads_are_counted(self):
+        url = reverse('document-detail', args=[self.document.id])
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(self.body(self.download(self.document)), b"0123456789abcdefghij")
+        self.download(self.document, HTTP_RANGE='bytes=0-4')
+        # Resuming an interrupted download is not another download.
+        self.download(self.document, HTTP_RANGE='bytes=5-')
+        DocumentCounterService.flush()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['view_count'], 2)
+        self.assertEqual(response.data['data']['download_count'], 2)
+
+    def test_not_modified_revalidations_are_not_counted(self):
+        url = reverse('document-detail', args=[self.document.id])
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(DocumentCounterService.take_pending(), {(VIEWS, self.document.id): 1})
+
+    def test_inaccessible_documents_are_not_counted(self):
+        other_student = self.create_user("other@example.com", "student")
+        draft = self.create_document(other_student, title="Draft", doc_status='pending')
+        response = self.client.get(reverse('document-detail', args=[draft.id]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(DocumentCounterService.take_pending(), {})
+
+    @override_settings(DOCUMENT_COUNTERS_ENABLED=False)
+    def test_disabled(self):
+        self.client.get(reverse('document-detail', args=[self.document.id]))
+        self.assertEqual(DocumentCounterService.take_pending(), {})
+
+    @override_settings(DOCUMENT_COUNTERS_BACKEND='cache')
+    def test_shared_cache_backend(self):
+        self.addCleanup(cache.clear)
+        DocumentCounterService.increment(self.document.id, VIEWS)
+        DocumentCounterService.increment(self.document.id, VIEWS)
+        self.assertEqual(cache.get(DocumentCounterService.get_cache_key(VIEWS, self.document.id)), 2)
+
+        # Another process holds the flush lock: nothing is taken, the keys are kept for later.
+        cache.add(DocumentCounterService.FLUSH_LOCK_KEY, True)
+        self.assertEqual(DocumentCounterService.flush(), 0)
+        cache.delete(DocumentCounterService.FLUSH_LOCK_KEY)
+
+        self.assertEqual(DocumentCounterService.flush(), 1)
+        self.assertEqual(Document.objects.get(id=self.document.id).view_count, 2)
+        self.assertEqual(cache.get(DocumentCounterService.get_cache_key(VIEWS, self.document.id)), 0)
@@ -0,0 +1,120 @@
+import unittest
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models.base import DocumentStatus
+from core.tests.test_direct_upload import BUCKET_NAME, S3_STORAGES, mock_aws
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+
+PAYLOAD = b"0123456789abcdefghij"
+
+
+class DocumentDownloadTestMixin(DocumentTestDataMixin):
+    def create_stored_document(self, uploader, doc_status=DocumentStatus.APPROVED):
+        document = self.create_document(uploader, title="Compilers Endsem", doc_status=doc_status)
+        document.file.name = default_storage.save("documents/compilers.pdf", ContentFile(PAYLOAD))
+        document.save()
+        return document
+
+    def download(self, document, **headers):
+        return self.client.get(reverse('document-download', args=[document.id]), **headers)
+
+    def body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+class DocumentDownloadTests(TempMediaRootMixin, DocumentDownloadTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.student = self.create_user("student@example.com", "student")
+        self.client.force_authenticate(self.student)
+        self.document = self.create_stored_document(self.create_user("staff@example.com", "staff"))
+
+    def test_full_download_with_validators(self):
+        response = self.download(self.document)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.body(response), PAYLOAD)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('attachment; filename="Compilers Endsem.pdf"', response['Content-Disposition'])
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+
+    def test_byte_ranges(self):
+        response = self.download(self.document, HTTP_RANGE='bytes=5-9')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(self.body(response), b"56789")
+        self.assertEqual(response['Content-Range'], f"bytes 5-9/{len(PAYLOAD)}")
+        self.assertEqual(response['Content-Length'], '5')
+
+        self.assertEqual(self.body(self.download(self.document, HTTP_RANGE='bytes=-3')), b"hij")
+        self.assertEqual(self.body(self.download(self.document, HTTP_RANGE='bytes=18-')), b"ij")
+
+        response = self.download(self.document, HTTP_RANGE='bytes=100-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response['Content-Range'], f"bytes */{len(PAYLOAD)}")
+
+    def test_stale_if_range_serves_whole_file(self):
+        response = self.download(self.document, HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.body(response), PAYLOAD)
+
+    def test_conditional_requests(self):
+        etag = self.download(self.document)['ETag']
+        response = self.download(self.document, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        last_modified = http_date(self.document.updated_at.timestamp())
+        response = self.download(self.document, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.download(self.document, HTTP_IF_NONE_MATCH='"other"').status_code, status.HTTP_200_OK)
+
+    def test_visibility_rules(self):
+        pending = self.create_stored_document(self.create_user("other@example.com", "student"),
+                                              doc_status=DocumentStatus.PENDING)
+        self.assertEqual(self.download(pending).status_code, status.HTTP_403_FORBIDDEN)
+        own = self.create_stored_document(self.student, doc_status=DocumentStatus.PENDING)
+        self.assertEqual(self.download(own).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(reverse('document-download', args=[0])).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    @override_settings(DOCUMENT_DOWNLOAD_SENDFILE_HEADER='X-Accel-Redirect',
+                       DOCUMENT_DOWNLOAD_ACCEL_PREFIX='/protected-media/')
+    def test_sendfile_offload(self):
+        response = self.download(self.document)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Accel-Redirect'], f"/protected-media/{self.document.file.name}")
+        self.assertEqual(response.content, b'')
+
+
+@unittest.skipIf(mock_aws is None, "moto is not installed")
+@override_settings(STORAGES=S3_STORAGES)
+class RemoteDocumentDownloadTests(DocumentDownloadTestMixin, APITestCase):
+    def setUp(self):
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        import boto3
+        boto3.client('s3', region_name='us-east-1', aws_access_key_id='testing',
+                     aws_secret_access_key='testing').create_bucket(Bucket=BUCKET_NAME)
+
+        staff = self.create_user("staff@example.com", "staff")
+        self.client.force_authenticate(staff)
+        self.document = self.create_stored_document(staff)
+
+    def test_streams_full_object_and_ranges(self):
+        response = self.download(self.document)
+        self.assertTrue(response.streaming)
+        self.assertEqual(self.body(response), PAYLOAD)
+
+        response = self.download(self.document, HTTP_RANGE='bytes=10-')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(self.body(response), b"abcdefghij")
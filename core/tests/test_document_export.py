@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.models.base import DocumentStatus
+from core.services.export_service import DocumentExportService
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class DocumentExportTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        self.admin = self.create_user("admin@example.com", "admin")
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.course = self.create_course()
+        self.academic_year = AcademicYear.objects.get(year_start=2023)
+        self.approved = self.create_document(self.staff, title="Compilers Endsem", course=self.course,
+                                             academic_year=self.academic_year, semester_number='5')
+        self.pending = self.create_document(self.staff, title="Networks Insem", doc_status=DocumentStatus.PENDING,
+                                            doc_type='insem')
+        self.client.force_authenticate(self.admin)
+
+    def export(self, **params):
+        response = self.client.get(reverse('document-export'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_includes_related_details(self):
+        lines = self.export().splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record['id'] for record in records], [self.approved.id, self.pending.id])
+        first = records[0]
+        self.assertEqual(first['course_code'], "CS101")
+        self.assertEqual(first['academic_year'], "2023-2024")
+        self.assertEqual(first['uploader_email'], "staff@example.com")
+        self.assertEqual(first['status'], DocumentStatus.APPROVED)
+        self.assertIsNone(records[1]['course_id'])
+        self.assertIsNone(records[1]['academic_year'])
+
+    def test_csv_export_applies_list_filters(self):
+        response = self.client.get(reverse('document-export'), {'output': 'csv', 'status': 'pending'})
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment; filename="documents-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['title'] for row in rows], ["Networks Insem"])
+
+        rows = list(csv.DictReader(io.StringIO(self.export(output='csv', doc_type='endsem', course=self.course.id))))
+        self.assertEqual([row['id'] for row in rows], [str(self.approved.id)])
+
+    def test_only_admins_can_export(self):
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.get(reverse('document-export')).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rejects_unknown_format_and_invalid_filters(self):
+        self.assertEqual(self.client.get(reverse('document-export'), {'output': 'xml'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('document-export'), {'doc_type': 'nope'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+    def test_export_is_chunked(self):
+        for index in range(5):
+            self.create_document(self.staff, title=f"Extra {index}")
+        with self.assertNumQueries(1):
+            chunks = list(DocumentExportService.stream(Document.objects.all(), 'ndjson', chunk_size=2))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(sum(chunk.count('\n') for chunk in chunks), 7)
+
+    def test_management_command_writes_a_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, 'catalog.csv')
+        call_command('export_documents', '--format', 'csv', '--output', path, '--filter', 'status=approved',
+                     stderr=io.StringIO())
+        with open(path, encoding='utf-8') as exported:
+            rows = list(csv.DictReader(exported))
+        self.assertEqual([row['title'] for row in rows], ["Compilers Endsem"])
+
+        output = io.StringIO()
+        call_command('export_documents', '--filter', 'doc_type=insem', stdout=output)
+        self.assertEqual([json.loads(line)['id'] for line in output.getvalue().splitlines()], [self.pending.id])
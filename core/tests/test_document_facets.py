@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.models.base import DocumentStatus
+from core.services.document_service import DocumentService
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+@override_settings(DOCUMENT_FACETS_CACHE_ENABLED=True)
+class DocumentFacetsTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('document-facets')
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.student = self.create_user("student@example.com", "student")
+        self.course = self.create_course()
+        self.other_course = self.create_course(code="MA101", name="Calculus")
+        self.year = AcademicYear.objects.first()
+        self.create_document(self.staff, title="A", course=self.course, academic_year=self.year, semester_number='1',
+                             doc_type=Document.DocumentType.INSEM)
+        self.create_document(self.staff, title="B", course=self.course, academic_year=self.year, semester_number='2',
+                             doc_type=Document.DocumentType.ENDSEM)
+        self.create_document(self.staff, title="C", course=self.other_course, academic_year=self.year,
+                             semester_number='1', doc_type=Document.DocumentType.ENDSEM)
+        self.pending = self.create_document(self.staff, title="D", course=self.course, doc_status=DocumentStatus.PENDING,
+                                            doc_type=Document.DocumentType.NOTES)
+
+    def get_facets(self, user, params=None):
+        self.client.force_authenticate(user)
+        response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data['data']
+
+    def counts(self, data, facet):
+        return {bucket['value']: bucket['count'] for bucket in data['facets'][facet]}
+
+    def test_student_counts_cover_approved_documents(self):
+        data = self.get_facets(self.student)
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(self.counts(data, 'doc_type'), {'endsem': 2, 'insem': 1})
+        self.assertEqual(self.counts(data, 'course'), {self.course.id: 2, self.other_course.id: 1})
+        self.assertEqual(self.counts(data, 'semester_number'), {'1': 2, '2': 1})
+        self.assertEqual(data['facets']['course'][0]['label'], f"{self.course.code} - {self.course.name}")
+        self.assertEqual(data['facets']['academic_year'][0]['label'], str(self.year))
+
+    def test_counts_follow_filters(self):
+        data = self.get_facets(self.staff, {'course': self.course.id})
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(self.counts(data, 'doc_type'), {'insem': 1, 'endsem': 1, 'notes': 1})
+        self.assertEqual(self.counts(data, 'academic_year'), {self.year.id: 2, None: 1})
+
+    def test_counts_use_grouped_queries(self):
+        self.client.force_authenticate(self.student)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        document_queries = [query['sql'] for query in queries if 'core_document' in query['sql']]
+        self.assertEqual(len(document_queries), 4)
+        self.assertTrue(all('GROUP BY' in sql and 'COUNT(' in sql for sql in document_queries))
+
+    def test_results_are_cached_per_filter_combination(self):
+        self.get_facets(self.student)
+        self.client.force_authenticate(self.student)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse([query for query in queries if 'core_document' in query['sql']])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'doc_type': 'endsem'})
+        self.assertTrue([query for query in queries if 'core_document' in query['sql']])
+
+    @override_settings(DOCUMENT_FACETS_CACHE_ENABLED=False)
+    def test_caching_can_be_disabled(self):
+        self.get_facets(self.student)
+        self.client.force_authenticate(self.student)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertTrue([query for query in queries if 'core_document' in query['sql']])
+
+    def test_document_writes_invalidate_cached_counts(self):
+        self.assertEqual(self.get_facets(self.student)['total'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            DocumentService.change_document_status(self.pending.id, DocumentStatus.APPROVED, self.staff)
+        self.assertEqual(self.get_facets(self.student)['total'], 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            DocumentService.update_document_metadata(self.pending.id, {'doc_type': Document.DocumentType.INSEM})
+        self.assertEqual(self.counts(self.get_facets(self.student), 'doc_type'), {'endsem': 2, 'insem': 2})
+        with self.captureOnCommitCallbacks(execute=True):
+            DocumentService.delete_document(self.pending.id)
+        self.assertEqual(self.get_facets(self.student)['total'], 3)
+
+    def test_invalid_filter_is_rejected(self):
+        self.client.force_authenticate(self.student)
+        response = self.client.get(self.url, {'doc_type': 'poster'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
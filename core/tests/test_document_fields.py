@@ -0,0 +1,69 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class DocumentFieldSelectionTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        self.list_url = reverse('document-list')
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.course = self.create_course()
+        self.document = self.create_document(self.staff, title="Sparse", course=self.course,
+                                             academic_year=AcademicYear.objects.first())
+        self.detail_url = reverse('document-detail', kwargs={'id': self.document.id})
+        self.client.force_authenticate(self.staff)
+
+    def get_results(self, params, url=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url or self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        document_queries = [query['sql'] for query in queries if 'core_document' in query['sql']]
+        return response, document_queries
+
+    def test_default_response_is_unchanged(self):
+        response, _ = self.get_results({})
+        item = response.data['data']['results'][0]
+        self.assertEqual(item['course']['code'], self.course.code)
+        self.assertEqual(item['uploader'], self.staff.email)
+        self.assertIn('file_url', item)
+
+    def test_fields_limit_payload_and_columns(self):
+        full, _ = self.get_results({})
+        sparse, document_queries = self.get_results({'fields': 'id,title,status'})
+        item = sparse.data['data']['results'][0]
+        self.assertEqual(set(item), {'id', 'title', 'status'})
+        self.assertLess(len(json.dumps(sparse.data)), len(json.dumps(full.data)))
+        page_query = document_queries[-1]
+        self.assertNotIn('JOIN', page_query)
+        self.assertNotIn('"file_format"', page_query)
+        self.assertNotIn('"content_hash"', page_query)
+
+    def test_unexpanded_relations_are_ids_without_joins(self):
+        response, document_queries = self.get_results({'expand': 'course'})
+        item = response.data['data']['results'][0]
+        self.assertEqual(item['course']['code'], self.course.code)
+        self.assertEqual(item['academic_year'], self.document.academic_year_id)
+        self.assertEqual(item['uploader'], self.staff.id)
+        self.assertIn('core_course', document_queries[-1])
+        self.assertNotIn('core_academicyear', document_queries[-1])
+        self.assertNotIn('core_user', document_queries[-1])
+
+    def test_detail_supports_field_selection(self):
+        response, document_queries = self.get_results({'fields': 'id,course', 'expand': ''}, url=self.detail_url)
+        self.assertEqual(response.data['data'], {'id': self.document.id, 'course': self.course.id})
+        self.assertNotIn('JOIN', document_queries[-1])
+
+    def test_unknown_field_is_rejected(self):
+        for url in (self.list_url, self.detail_url):
+            response = self.client.get(url, {'fields': 'id,secret'})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('fields', response.data['errors'])
+        response = self.client.get(self.list_url, {'expand': 'status'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
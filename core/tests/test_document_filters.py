@@ -0,0 +1,98 @@
+import datetime
+
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.models.base import DocumentStatus
+from core.services.document_service import DocumentService
+from core.filters.document_filters import DocumentFilter
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class DocumentFilterTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        self.list_url = reverse('document-list')
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.course = self.create_course()
+        self.other_course = self.create_course(code="MA101", name="Calculus")
+        self.year, self.other_year = AcademicYear.objects.all()[:2]
+
+        self.match = self.create_document(self.staff, title="Match", course=self.course, academic_year=self.year,
+                                          semester_number='3', doc_type=Document.DocumentType.INSEM)
+        self.create_document(self.staff, title="Other Course", course=self.other_course, academic_year=self.year,
+                             semester_number='3', doc_type=Document.DocumentType.INSEM)
+        self.create_document(self.staff, title="Other Year", course=self.course, academic_year=self.other_year,
+                             semester_number='3', doc_type=Document.DocumentType.INSEM)
+        self.create_document(self.staff, title="Other Type", course=self.course, academic_year=self.year,
+                             semester_number='3', doc_type=Document.DocumentType.NOTES)
+        self.client.force_authenticate(self.staff)
+
+    def list_ids(self, params):
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['id'] for item in response.data['data']['results']}
+
+    def test_combined_filters(self):
+        ids = self.list_ids({'course': self.course.id, 'academic_year': self.year.id,
+                             'semester_number': '3', 'doc_type': 'insem'})
+        self.assertEqual(ids, {self.match.id})
+
+    def test_file_format_filter(self):
+        Document.objects.filter(id=self.match.id).update(file_format='image/png')
+        self.assertEqual(self.list_ids({'file_format': 'image/png'}), {self.match.id})
+
+    def test_created_at_range(self):
+        Document.objects.filter(id=self.match.id).update(
+            created_at=timezone.make_aware(datetime.datetime(2020, 5, 1, 12, 0)))
+        self.assertEqual(self.list_ids({'created_at_before': '2020-05-01'}), {self.match.id})
+        self.assertNotIn(self.match.id, self.list_ids({'created_at_after': '2020-05-02'}))
+
+    def test_invalid_filter_value(self):
+        response = self.client.get(self.list_url, {'doc_type': 'poster'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DocumentFilterQueryPlanTests(DocumentTestDataMixin, APITestCase):
+    """
+    Asserts that the common filter combinations of the document list are served
+    by the composite indexes on Document instead of a sequential scan.
+    """
+
+    def query_plan(self, params, visibility):
+        queryset = DocumentFilter(params, queryset=DocumentService.get_all_documents(visibility)).qs
+        queryset = queryset.order_by('-created_at', '-id')[:26]
+        sql, sql_params = queryset.query.sql_with_params()
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny test tables always favour a seq scan; ask the planner what it would use otherwise.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN {sql}", sql_params)
+            else:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", sql_params)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+    def assertUsesIndex(self, plan, index_name):
+        self.assertIn(index_name, plan)
+        self.assertNotIn("Seq Scan on core_document", plan)
+        self.assertNotRegex(plan, r"SCAN core_document(?! USING)")
+
+    def test_course_year_semester_uses_status_course_index(self):
+        plan = self.query_plan({'course': '1', 'academic_year': '2', 'semester_number': '3'},
+                               {'status': DocumentStatus.APPROVED.value})
+        self.assertUsesIndex(plan, 'doc_status_course_year_sem_idx')
+
+    def test_course_only_uses_status_course_index(self):
+        plan = self.query_plan({'course': '1'}, {'status': DocumentStatus.APPROVED.value})
+        self.assertUsesIndex(plan, 'doc_status_course_year_sem_idx')
+
+    def test_my_uploads_uses_uploader_index(self):
+        plan = self.query_plan({}, {'status': DocumentStatus.APPROVED.value, 'uploader_id': 1})
+        self.assertUsesIndex(plan, 'doc_upl_status_created_idx')
+
+    def test_doc_type_uses_status_type_index(self):
+        plan = self.query_plan({'doc_type': 'endsem'}, {'status': DocumentStatus.APPROVED.value})
+        self.assertUsesIndex(plan, 'doc_status_type_created_idx')
@@ -0,0 +1,87 @@
+import io
+import shutil
+from unittest import mock
+
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.services.document_service import DocumentService
+from core.services.preview_service import PreviewService
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+from core.tests.test_text_extraction import make_pdf
+
+
+def make_image(image_format, size=(1200, 900), color=(200, 30, 30)):
+    output = io.BytesIO()
+    Image.new('RGB', size, color).save(output, format=image_format)
+    return output.getvalue()
+
+
+@override_settings(DOCUMENT_PREVIEW_MAX_SIZE=120, DOCUMENT_PREVIEW_FORMAT='WEBP')
+class DocumentPreviewTests(TempMediaRootMixin, DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.course = self.create_course()
+        self.academic_year = AcademicYear.objects.first()
+
+    def upload(self, name, data, content_type):
+        return DocumentService.create_document({
+            'file': SimpleUploadedFile(name, data, content_type=content_type),
+            'title': "Question Paper", 'doc_type': 'endsem', 'course': self.course,
+            'academic_year': self.academic_year, 'semester_number': '2',
+        }, self.staff)
+
+    def assert_preview(self, document):
+        document.refresh_from_db()
+        self.assertEqual(document.preview.name, document.file.name.rsplit('.', 1)[0] + '.preview.webp')
+        with document.preview.open('rb') as preview_file:
+            with Image.open(preview_file) as preview:
+                self.assertEqual(preview.format, 'WEBP')
+                self.assertLessEqual(max(preview.size), 120)
+
+    def test_upload_schedules_previews_after_commit(self):
+        with mock.patch.object(PreviewService, 'submit') as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                # Image uploads are previewed after re-encoding (see test_image_processing).
+                document = self.upload("scan.pdf", make_image('PDF'), 'application/pdf')
+        submit.assert_called_once_with([document.id])
+
+    def test_renders_images_and_scanned_pdfs(self):
+        photo = self.upload("photo.jpg", make_image('JPEG'), 'image/jpeg')
+        scanned = self.upload("scan.pdf", make_image('PDF'), 'application/pdf')
+        text_only = self.upload("notes.txt", b"Plain notes", 'text/plain')
+
+        summary = PreviewService.process_documents([photo.id, scanned.id, text_only.id])
+        self.assertEqual(summary, {'done': 2, 'unsupported': 1})
+        self.assert_preview(photo)
+        self.assert_preview(scanned)
+        text_only.refresh_from_db()
+        self.assertEqual(text_only.preview.name, '')
+
+        # Duplicates share the original's preview without re-rendering it.
+        duplicate = self.upload("again.jpg", make_image('JPEG'), 'image/jpeg')
+        with mock.patch('core.utils.previews.render_preview') as render:
+            PreviewService.process_documents([duplicate.id])
+        render.assert_not_called()
+        duplicate.refresh_from_db()
+        self.assertEqual(duplicate.preview.name, Document.objects.get(id=photo.id).preview.name)
+
+    def test_serializers_expose_preview_url(self):
+        photo = self.upload("photo.png", make_image('PNG'), 'image/png')
+        PreviewService.process_documents([photo.id])
+        self.client.force_authenticate(self.staff)
+        data = self.client.get(reverse('document-detail', args=[photo.id])).data['data']
+        self.assertTrue(data['preview_url'].endswith('.preview.webp'))
+        listed = self.client.get(reverse('document-list')).data['data']['results']
+        self.assertEqual(listed[0]['preview_url'], data['preview_url'])
+
+    def test_text_pdf_without_rasterizer_is_unsupported(self):
+        document = self.upload("paper.pdf", make_pdf("Only text"), 'application/pdf')
+        with mock.patch('core.utils.previews.shutil.which', return_value=None):
+            self.assertEqual(PreviewService.process_documents([document.id]), {'unsupported': 1})
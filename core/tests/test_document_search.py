@@ -0,0 +1,79 @@
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.models.base import DocumentStatus
+from core.services.document_service import DocumentService
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+
+
+class DocumentSearchTests(TempMediaRootMixin, DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.search_url = reverse('document-search')
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.student = self.create_user("student@example.com", "student")
+        self.course = self.create_course(code="CS204", name="Operating Systems")
+        self.academic_year = AcademicYear.objects.first()
+
+    def upload(self, title, doc_type=Document.DocumentType.ENDSEM):
+        document = DocumentService.create_document({
+            'file': SimpleUploadedFile(f"{title}.pdf", b"%PDF-1.4", content_type='application/pdf'),
+            'title': title,
+            'doc_type': doc_type,
+            'course': self.course,
+            'academic_year': self.academic_year,
+            'semester_number': '4',
+        }, self.student)
+        return document
+
+    def approve(self, *documents):
+        Document.objects.filter(id__in=[d.id for d in documents]).update(status=DocumentStatus.APPROVED)
+
+    def search_ids(self, query, user=None):
+        self.client.force_authenticate(user or self.staff)
+        response = self.client.get(self.search_url, {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['data']['results']]
+
+    def test_matches_title_course_and_program(self):
+        document = self.upload("Scheduling and Deadlocks")
+        self.assertEqual(self.search_ids("deadlock"), [document.id])
+        self.assertEqual(self.search_ids("cs204"), [document.id])
+        self.assertEqual(self.search_ids("operating"), [document.id])
+        self.assertEqual(self.search_ids("computer science"), [document.id])
+        self.assertEqual(self.search_ids("final exam"), [document.id])
+
+    def test_title_match_ranks_above_weaker_match(self):
+        strong = self.upload("Operating Systems Endsem")
+        weak = self.upload("Memory Management")
+        self.assertEqual(self.search_ids("operating systems"), [strong.id, weak.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        document = self.upload("Virtual Memory")
+        DocumentService.update_document_metadata(document.id, {'title': "Paging Techniques"})
+        self.assertEqual(self.search_ids("virtual"), [])
+        self.assertEqual(self.search_ids("paging"), [document.id])
+
+        DocumentService.delete_document(document.id)
+        self.assertEqual(self.search_ids("paging"), [])
+
+    def test_respects_role_visibility(self):
+        approved = self.upload("Deadlock Avoidance")
+        self.upload("Deadlock Detection")
+        self.approve(approved)
+        self.assertEqual(self.search_ids("deadlock", user=self.student), [approved.id])
+
+    def test_query_syntax_is_escaped(self):
+        self.upload("Threads")
+        self.assertEqual(self.search_ids('"threads" OR ('), [])
+        self.assertEqual(len(self.search_ids('thread*')), 1)
+
+    def test_query_is_required(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(self.search_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
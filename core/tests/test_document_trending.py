@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Document, DocumentTrendingScore
+from core.models.base import DocumentStatus
+from core.services.trending_service import TrendingService
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class TrendingTestDataMixin(DocumentTestDataMixin):
+    def set_counts(self, document, views=0, downloads=0):
+        Document.objects.filter(id=document.id).update(view_count=views, download_count=downloads)
+
+
+class TrendingServiceTests(TrendingTestDataMixin, TestCase):
+    def setUp(self):
+        self.uploader = self.create_user("staff@example.com", "staff")
+        self.course = self.create_course()
+        self.documents = [self.create_document(self.uploader, title=f"Paper {index}", course=self.course)
+                          for index in range(3)]
+        self.now = timezone.now()
+
+    def scores(self, **selection):
+        return dict(TrendingService.get_top(now=self.now, **selection))
+
+    def test_refresh_only_writes_documents_with_new_activity(self):
+        self.set_counts(self.documents[0], views=4, downloads=2)
+        self.set_counts(self.documents[1], views=1)
+        self.assertEqual(TrendingService.refresh(self.now), 2)
+        # Views weigh 1 and downloads 3 by default.
+        scores = self.scores()
+        self.assertAlmostEqual(scores[self.documents[0].id], 10)
+        self.assertAlmostEqual(scores[self.documents[1].id], 1)
+        self.assertNotIn(self.documents[2].id, scores)
+
+        self.assertEqual(TrendingService.refresh(self.now), 0)
+        self.set_counts(self.documents[1], views=3)
+        self.assertEqual(TrendingService.refresh(self.now), 1)
+        self.assertAlmostEqual(self.scores()[self.documents[1].id], 3)
+
+    def test_scores_decay_with_the_half_life(self):
+        self.set_counts(self.documents[0], views=8)
+        TrendingService.refresh(self.now - timedelta(hours=48))
+        self.set_counts(self.documents[1], views=3)
+        TrendingService.refresh(self.now)
+
+        scores = self.scores()
+        self.assertAlmostEqual(scores[self.documents[0].id], 2)
+        # Fewer but more recent views rank higher.
+        self.assertEqual([pk for pk, _ in TrendingService.get_top(now=self.now)],
+                         [self.documents[1].id, self.documents[0].id])
+
+        # Activity older than the minimum score allows is no longer trending.
+        self.assertNotIn(self.documents[0].id, dict(TrendingService.get_top(now=self.now + timedelta(days=7))))
+
+    def test_only_approved_activity_is_ranked(self):
+        self.set_counts(self.documents[0], views=5)
+        TrendingService.refresh(self.now)
+        Document.objects.filter(id=self.documents[0].id).update(status=DocumentStatus.REJECTED)
+        self.assertEqual(TrendingService.refresh(self.now), 1)
+        self.assertEqual(self.scores(), {})
+
+        # Views while rejected do not count once the document is approved again.
+        self.set_counts(self.documents[0], views=50)
+        TrendingService.refresh(self.now)
+        Document.objects.filter(id=self.documents[0].id).update(status=DocumentStatus.APPROVED)
+        TrendingService.refresh(self.now)
+        self.assertAlmostEqual(self.scores()[self.documents[0].id], 5)
+
+    def test_filters_by_program_and_course(self):
+        other_course = self.create_course(code="CS202", name="Compilers")
+        Document.objects.filter(id=self.documents[1].id).update(course=other_course)
+        for document in self.documents[:2]:
+            self.set_counts(document, views=1)
+        TrendingService.refresh(self.now)
+
+        self.assertEqual(set(self.scores(course_id=other_course.id)), {self.documents[1].id})
+        self.assertEqual(set(self.scores(program_id=other_course.program_id)),
+                         {self.documents[0].id, self.documents[1].id})
+
+        # Moving a document to another course is picked up without new activity.
+        Document.objects.filter(id=self.documents[0].id).update(course=other_course)
+        self.assertEqual(TrendingService.refresh(self.now), 1)
+        self.assertEqual(set(self.scores(course_id=other_course.id)), {self.documents[0].id, self.documents[1].id})
+        self.assertEqual(DocumentTrendingScore.objects.get(document=self.documents[0]).course_id, other_course.id)
+
+
+class DocumentTrendingViewTests(TrendingTestDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.student = self.create_user("student@example.com", "student")
+        self.client.force_authenticate(self.student)
+        uploader = self.create_user("staff@example.com", "staff")
+        self.course = self.create_course()
+        self.hot = self.create_document(uploader, title="Hot Paper", course=self.course)
+        self.warm = self.create_document(uploader, title="Warm Paper")
+        self.set_counts(self.hot, views=10, downloads=5)
+        self.set_counts(self.warm, views=2)
+        TrendingService.refresh()
+
+    def test_ranked_results_are_cached(self):
+        response = self.client.get(reverse('document-trending'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['data']
+        self.assertEqual([result['id'] for result in results], [self.hot.id, self.warm.id])
+        self.assertEqual(results[0]['title'], "Hot Paper")
+        self.assertGreater(results[0]['trending_score'], results[1]['trending_score'])
+
+        self.set_counts(self.warm, views=200)
+        TrendingService.refresh()
+        self.assertEqual([result['id'] for result in self.client.get(reverse('document-trending')).data['data']],
+                         [self.hot.id, self.warm.id])
+        cache.clear()
+        self.assertEqual([result['id'] for result in self.client.get(reverse('document-trending')).data['data']],
+                         [self.warm.id, self.hot.id])
+
+    def test_course_filter_and_limit(self):
+        response = self.client.get(reverse('document-trending'), {'course': self.course.id})
+        self.assertEqual([result['id'] for result in response.data['data']], [self.hot.id])
+        response = self.client.get(reverse('document-trending'), {'limit': 1})
+        self.assertEqual([result['id'] for result in response.data['data']], [self.hot.id])
+        response = self.client.get(reverse('document-trending'), {'program': self.course.program_id + 1000})
+        self.assertEqual(response.data['data'], [])
+
+    def test_invalid_parameters(self):
+        response = self.client.get(reverse('document-trending'), {'limit': 1000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,62 @@
+from itertools import product
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document
+from core.models.base import DocumentStatus
+from core.serializers.document_serializers import DocumentRetrieveSerializer, DocumentValuesSerializer
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class DocumentValuesSerializerParityTests(DocumentTestDataMixin, APITestCase):
+    """The values_list() fast path must render exactly what DocumentRetrieveSerializer renders."""
+
+    def setUp(self):
+        self.staff = self.create_user("staff@example.com", "staff")
+        course = self.create_course()
+        year = AcademicYear.objects.first()
+        original = self.create_document(self.staff, title="Original", course=course, academic_year=year,
+                                        semester_number='3', content_hash='a' * 64)
+        self.create_document(self.staff, title="Duplicate", course=course, academic_year=year,
+                             content_hash='a' * 64, duplicate_of=original,
+                             preview='documents/duplicate.preview.webp')
+        bare = self.create_document(self.staff, title="Bare", doc_status=DocumentStatus.PENDING)
+        Document.objects.filter(id=bare.id).update(file_format=None)
+        Document.objects.create(uploader=self.staff, file='', title="No File", doc_type=Document.DocumentType.OTHER,
+                                preview='')
+
+    def assertParity(self, fields=None, expand=None):
+        queryset = Document.objects.order_by('id')
+        expected = DocumentRetrieveSerializer(
+            queryset.select_related('course', 'academic_year', 'uploader'),
+            many=True, fields=fields, expand=expand).data
+        fast = DocumentValuesSerializer(fields=fields, expand=expand)
+        self.assertEqual(fast.serialize(fast.get_rows(queryset)), [dict(item) for item in expected])
+
+    def test_default_output(self):
+        self.assertParity()
+
+    def test_field_and_expand_combinations(self):
+        field_choices = [None, ['id', 'title'], ['course', 'uploader', 'created_at', 'file_url'],
+                         ['academic_year', 'preview_url', 'duplicate_of', 'status']]
+        expand_choices = [None, [], ['course'], ['academic_year', 'uploader']]
+        for fields, expand in product(field_choices, expand_choices):
+            with self.subTest(fields=fields, expand=expand):
+                self.assertParity(fields, expand)
+
+    def test_list_endpoint_matches_drf_serializer(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(reverse('document-list'), {'ordering': 'title'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = DocumentRetrieveSerializer(Document.objects.order_by('title', 'id'), many=True).data
+        self.assertEqual(response.data['data']['results'], [dict(item) for item in expected])
+
+    def test_extra_columns_are_readable(self):
+        fast = DocumentValuesSerializer(fields=['title'])
+        row = fast.get_rows(Document.objects.order_by('id'), extra_fields=['id', 'created_at']).first()
+        first = Document.objects.order_by('id').first()
+        self.assertEqual(fast.get_value(row, 'id'), first.id)
+        self.assertEqual(fast.get_value(row, 'created_at'), first.created_at)
+        self.assertEqual(fast.to_representation(row), {'title': first.title})
@@ -0,0 +1,149 @@
+import json
+import base64
+import shutil
+import tempfile
+
+from django.contrib.auth.models import Group
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Course, DegreeLevel, Document, Program, User
+from core.models.base import DocumentStatus
+
+
+class DocumentTestDataMixin(object):
+    """Shared fixtures for the document endpoint tests."""
+
+    def create_user(self, email, role):
+        user = User.objects.create_user(email=email, password="strongpassword123")
+        group, _ = Group.objects.get_or_create(name=role)
+        user.groups.set([group])
+        return user
+
+    def create_course(self, code="CS101", name="Intro to Computing"):
+        degree_level, _ = DegreeLevel.objects.get_or_create(code=DegreeLevel.Code.UG, defaults={"name": "Undergraduate"})
+        program, _ = Program.objects.get_or_create(name="Computer Science", code="CS", degree_level=degree_level)
+        return Course.objects.create(program=program, code=code, name=name)
+
+    def create_document(self, uploader, title="Paper", doc_status=DocumentStatus.APPROVED, **extra):
+        extra.setdefault('doc_type', Document.DocumentType.ENDSEM)
+        return Document.objects.create(
+            uploader=uploader,
+            file=f"documents/{title.replace(' ', '_').lower()}.pdf",
+            title=title,
+            status=doc_status,
+            file_format='application/pdf',
+            **extra
+        )
+
+
+class TempMediaRootMixin(object):
+    """Stores the files a test writes in a temporary MEDIA_ROOT that is removed afterwards."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+
+class DocumentListPaginationTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        self.list_url = reverse('document-list')
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.student = self.create_user("student@example.com", "student")
+        self.course = self.create_course()
+        self.academic_year = AcademicYear.objects.first()
+
+        self.documents = [
+            self.create_document(self.student, title=f"Paper {i:02d}", course=self.course,
+                                 academic_year=self.academic_year)
+            for i in range(7)
+        ]
+        # Force ties on created_at so the id tie-breaker is exercised.
+        Document.objects.update(created_at=timezone.now())
+
+    def walk(self, params):
+        seen, cursor = [], None
+        while True:
+            query = dict(params, **({'cursor': cursor} if cursor else {}))
+            response = self.client.get(self.list_url, query)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.data['data']
+            seen.extend(item['id'] for item in page['results'])
+            cursor = page['next_cursor']
+            if not cursor:
+                return seen, page
+
+    def test_walks_every_document_once(self):
+        self.client.force_authenticate(self.staff)
+        seen, last_page = self.walk({'page_size': 3})
+        expected = sorted((d.id for d in self.documents), reverse=True)
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(last_page['results']), 1)
+
+    def test_page_size_is_capped(self):
+        self.client.force_authenticate(self.staff)
+        with self.settings(DOCUMENT_MAX_PAGE_SIZE=2):
+            response = self.client.get(self.list_url, {'page_size': 50})
+        self.assertEqual(len(response.data['data']['results']), 2)
+
+    def test_previous_cursor_returns_prior_page(self):
+        self.client.force_authenticate(self.staff)
+        first = self.client.get(self.list_url, {'page_size': 3}).data['data']
+        second = self.client.get(self.list_url, {'page_size': 3, 'cursor': first['next_cursor']}).data['data']
+        back = self.client.get(self.list_url, {'page_size': 3, 'cursor': second['previous_cursor']}).data['data']
+        self.assertEqual([d['id'] for d in back['results']], [d['id'] for d in first['results']])
+        self.assertIsNone(back['previous_cursor'])
+
+    def test_ordering_by_title(self):
+        self.client.force_authenticate(self.staff)
+        seen, _ = self.walk({'page_size': 2, 'ordering': 'title'})
+        titles = list(Document.objects.filter(id__in=seen).order_by('title').values_list('id', flat=True))
+        self.assertEqual(seen, titles)
+
+    def test_invalid_ordering_and_cursor_are_rejected(self):
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.get(self.list_url, {'ordering': 'file'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.list_url, {'cursor': 'not-a-cursor'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_well_formed_cursor_with_bad_values_is_rejected(self):
+        self.client.force_authenticate(self.staff)
+
+        def encode(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+        valid = {"v": timezone.now().isoformat(), "id": 1, "o": "-created_at", "r": False}
+        for override in ({"v": "x"}, {"v": ["a"]}, {"v": {"a": 1}}, {"v": None}, {"id": "abc"},
+                         {"id": [1]}, {"r": "yes"}):
+            with self.subTest(**override):
+                response = self.client.get(self.list_url, {'cursor': encode(dict(valid, **override))})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for value in ([1], {"a": 1}):
+            response = self.client.get(self.list_url, {'ordering': 'title',
+                                                       'cursor': encode(dict(valid, v=value, o='title'))})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.list_url, {'cursor': encode(valid)}).status_code, status.HTTP_200_OK)
+
+    def test_cursor_is_bound_to_ordering(self):
+        self.client.force_authenticate(self.staff)
+        cursor = self.client.get(self.list_url, {'page_size': 2}).data['data']['next_cursor']
+        response = self.client.get(self.list_url, {'cursor': cursor, 'ordering': 'title'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_student_only_sees_approved_documents(self):
+        pending = self.create_document(self.staff, title="Pending Paper", doc_status=DocumentStatus.PENDING)
+        self.client.force_authenticate(self.student)
+        seen, _ = self.walk({'page_size': 4})
+        self.assertNotIn(pending.id, seen)
+        self.assertEqual(len(seen), len(self.documents))
+
+    def test_student_cannot_list_other_uploader(self):
+        self.client.force_authenticate(self.student)
+        response = self.client.get(self.list_url, {'uploader_id': self.staff.id})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from core.models import Document
+from core.serializers.document_serializers import DocumentRetrieveSerializer, DocumentValuesSerializer
+from core.services.file_url_service import FileUrlService
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+@override_settings(DOCUMENT_URL_CACHE_ENABLED=True, DOCUMENT_URL_REFRESH_MARGIN_SECONDS=300)
+class FileUrlCacheTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        FileUrlService.reset_stats()
+        # Signing is local, so no S3 endpoint is contacted.
+        self.storage = S3Boto3Storage(bucket_name='archivus-test', access_key='test', secret_key='test',
+                                      region_name='us-east-1', querystring_expire=3600)
+
+    def test_urls_are_signed_once_and_reused(self):
+        with mock.patch.object(self.storage, 'url', wraps=self.storage.url) as sign:
+            first = FileUrlService.get_urls(self.storage, ['documents/a.pdf', 'documents/b.pdf', ''])
+            second = FileUrlService.get_urls(self.storage, ['documents/a.pdf', 'documents/b.pdf'])
+        self.assertEqual(first, second)
+        self.assertIn('Signature', first['documents/a.pdf'])
+        self.assertEqual(sign.call_count, 2)
+        self.assertEqual(FileUrlService.get_stats(), {'hits': 2, 'misses': 2, 'hit_rate': 0.5})
+
+    def test_cached_urls_expire_before_the_signature(self):
+        with mock.patch.object(cache, 'set_many', wraps=cache.set_many) as set_many:
+            FileUrlService.get_url(self.storage, 'documents/a.pdf')
+        self.assertEqual(set_many.call_args.kwargs['timeout'], 3600 - 300)
+
+        short_lived = S3Boto3Storage(bucket_name='archivus-test', access_key='test', secret_key='test',
+                                     region_name='us-east-1', querystring_expire=120)
+        self.assertIsNone(FileUrlService.get_cache_timeout(short_lived))
+
+    def test_unsigned_storages_are_not_cached(self):
+        storage = FileSystemStorage(location='/tmp', base_url='/media/')
+        with mock.patch.object(cache, 'get_many') as get_many:
+            self.assertEqual(FileUrlService.get_url(storage, 'documents/a.pdf'), '/media/documents/a.pdf')
+        get_many.assert_not_called()
+        self.assertEqual(FileUrlService.get_stats()['hits'] + FileUrlService.get_stats()['misses'], 0)
+
+    def test_list_serialization_resolves_urls_in_one_batch(self):
+        staff = self.create_user("staff@example.com", "staff")
+        for index in range(5):
+            self.create_document(staff, title=f"Paper {index}")
+        file_field = Document._meta.get_field('file')
+        with mock.patch.object(file_field, 'storage', self.storage), \
+                mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            fast = DocumentValuesSerializer(fields=['id', 'file_url'])
+            data = fast.serialize(fast.get_rows(Document.objects.order_by('id')))
+            expected = DocumentRetrieveSerializer(Document.objects.order_by('id'), many=True,
+                                                  fields=['id', 'file_url']).data
+        self.assertEqual(get_many.call_count, 1 + 5)
+        self.assertEqual(data, [dict(item) for item in expected])
+        self.assertEqual(FileUrlService.get_stats()['misses'], 5)
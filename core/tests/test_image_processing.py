@@ -0,0 +1,173 @@
+import io
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from pypdf import PdfReader
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, Document, DocumentOriginal, StorageDeletion
+from core.services.image_processing_service import ImageProcessingService
+from core.services.preview_service import PreviewService
+from core.services.storage_deletion_service import StorageDeletionService
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+
+ProcessingStatus = Document.ImageProcessingStatus
+
+EXIF_ORIENTATION = 0x0112
+EXIF_MAKE = 0x010F
+
+
+def make_photo(size=(2400, 1800), image_format='JPEG', orientation=None):
+    """A noisy image (so it does not compress to nothing) carrying camera EXIF data."""
+    image = Image.effect_noise(size, 64).convert('RGB')
+    exif = Image.Exif()
+    exif[EXIF_MAKE] = "PhoneCam"
+    if orientation:
+        exif[EXIF_ORIENTATION] = orientation
+    output = io.BytesIO()
+    image.save(output, format=image_format, quality=95, exif=exif.tobytes())
+    return output.getvalue()
+
+
+@override_settings(DOCUMENT_IMAGE_PROCESSING_ENABLED=True, DOCUMENT_IMAGE_DPI=100, DOCUMENT_IMAGE_PAGE_INCHES=10,
+                   DOCUMENT_IMAGE_JPEG_QUALITY=70, DOCUMENT_ORIGINALS_POLICY='keep',
+                   STORAGE_DELETION_DRAIN_ON_COMMIT=False)
+class ImageProcessingTests(TempMediaRootMixin, DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.course = self.create_course()
+        self.academic_year = AcademicYear.objects.first()
+        self.client.force_authenticate(self.create_user("student@example.com", "student"))
+
+    def metadata(self):
+        return {'title': "DBMS Endsem", 'doc_type': 'endsem', 'course': self.course.id,
+                'academic_year': self.academic_year.id, 'semester_number': '4'}
+
+    def upload_photo(self, data, name="photo.jpg", content_type='image/jpeg'):
+        response = self.client.post(reverse('document-upload'), {
+            'file': SimpleUploadedFile(name, data, content_type=content_type), **self.metadata(),
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Document.objects.get(id=response.data['data']['document_id'])
+
+    def upload_scan(self, pages):
+        return self.client.post(reverse('document-upload-scan'), {
+            'pages': [SimpleUploadedFile(f"page{index}.jpg", data, content_type='image/jpeg')
+                      for index, data in enumerate(pages)],
+            **self.metadata(),
+        }, format='multipart')
+
+    def open_image(self, name):
+        with default_storage.open(name, 'rb') as stored_file:
+            image = Image.open(io.BytesIO(stored_file.read()))
+            image.load()
+            return image
+
+    def test_upload_schedules_processing_before_previews(self):
+        with mock.patch.object(ImageProcessingService, 'submit') as submit, \
+                mock.patch.object(PreviewService, 'submit') as preview_submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                document = self.upload_photo(make_photo((300, 200)))
+        submit.assert_called_once_with([document.id])
+        preview_submit.assert_not_called()
+
+        ImageProcessingService.process_documents([document.id])
+        ImageProcessingService.run_follow_ups([document.id])
+        document.refresh_from_db()
+        self.assertTrue(document.preview.name)
+        self.assertEqual(self.open_image(document.preview.name).size[0], 300)
+
+    def test_photo_is_reencoded_without_exif(self):
+        photo = make_photo(orientation=6)  # rotated 90 degrees: stored landscape, shown portrait
+        document = self.upload_photo(photo)
+        self.assertEqual(document.image_processing_status, ProcessingStatus.PENDING)
+        original_name = document.file.name
+
+        self.assertEqual(ImageProcessingService.process_documents([document.id]), {'done': 1})
+        document.refresh_from_db()
+        self.assertEqual(document.image_processing_status, ProcessingStatus.DONE)
+        self.assertNotEqual(document.file.name, original_name)
+        self.assertLess(document.file_size, len(photo))
+
+        image = self.open_image(document.file.name)
+        self.assertTrue(document.file.name.endswith('.jpg'))
+        self.assertEqual(image.format, 'JPEG')
+        self.assertEqual(image.size, (750, 1000))  # orientation applied, long edge = 100 dpi x 10 in
+        self.assertEqual(len(image.getexif()), 0)
+        self.assertEqual(list(document.originals.values_list('file', 'file_format')), [(original_name, 'image/jpeg')])
+
+    def test_discard_policy_deletes_the_original(self):
+        document = self.upload_photo(make_photo())
+        original_name = document.file.name
+        with override_settings(DOCUMENT_ORIGINALS_POLICY='discard'):
+            ImageProcessingService.process_documents([document.id])
+        self.assertFalse(DocumentOriginal.objects.exists())
+        self.assertEqual(list(StorageDeletion.objects.values_list('name', flat=True)), [original_name])
+        StorageDeletionService.drain()
+        self.assertFalse(default_storage.exists(original_name))
+
+    def test_processed_copies_of_one_photo_are_flagged_as_duplicates(self):
+        photo = make_photo()
+        first = self.upload_photo(photo)
+        ImageProcessingService.process_documents([first.id])
+        # The first copy now carries the processed file's hash, which the second upload does not match.
+        second = self.upload_photo(photo)
+        ImageProcessingService.process_documents([second.id])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.content_hash, second.content_hash)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertIsNone(first.duplicate_of_id)
+        self.assertEqual(second.duplicate_of_id, first.id)
+
+    def test_image_that_would_grow_is_left_alone(self):
+        output = io.BytesIO()
+        Image.new('L', (40, 30), 255).save(output, format='PNG')
+        document = self.upload_photo(output.getvalue(), name="tiny.png", content_type='image/png')
+        original_name = document.file.name
+
+        self.assertEqual(ImageProcessingService.process_documents([document.id]), {'unchanged': 1})
+        document.refresh_from_db()
+        self.assertEqual((document.file.name, document.image_processing_status), (original_name, ProcessingStatus.DONE))
+        self.assertFalse(document.originals.exists())
+
+    def test_scan_pages_are_stitched_into_one_pdf(self):
+        response = self.upload_scan([make_photo((1200, 1600)), make_photo((1600, 1200)), make_photo((1200, 1600))])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        document = Document.objects.get(id=response.data['data']['document_id'])
+        self.assertEqual((document.file.name, document.file_format), ('', 'application/pdf'))
+        self.assertEqual(list(document.originals.values_list('position', flat=True)), [0, 1, 2])
+
+        self.assertEqual(ImageProcessingService.process_documents([document.id]), {'done': 1})
+        document.refresh_from_db()
+        self.assertTrue(document.file.name.endswith('.pdf'))
+        with default_storage.open(document.file.name, 'rb') as stored_file:
+            reader = PdfReader(io.BytesIO(stored_file.read()))
+        self.assertEqual(len(reader.pages), 3)
+        # 1000 px on the long edge at 100 dpi is a 10 inch (720 pt) page.
+        self.assertEqual(round(float(reader.pages[1].mediabox.width)), 720)
+        self.assertEqual(document.originals.count(), 3)
+        # Retained originals are referenced, so the orphan reaper leaves them alone.
+        names = set(document.originals.values_list('file', flat=True))
+        self.assertEqual(StorageDeletionService.get_referenced_names(names), names)
+
+    def test_scan_rejects_non_image_pages(self):
+        response = self.client.post(reverse('document-upload-scan'), {
+            'pages': [SimpleUploadedFile("notes.txt", b"not an image", content_type='text/plain')],
+            **self.metadata(),
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Document.objects.exists())
+
+    def test_failed_processing_is_retried(self):
+        document = self.upload_photo(b"not really a jpeg")
+        self.assertEqual(ImageProcessingService.process_documents([document.id]), {'failed': 1})
+        document.refresh_from_db()
+        self.assertEqual(document.image_processing_status, ProcessingStatus.FAILED)
+        self.assertEqual(ImageProcessingService.process_documents([document.id]), {'failed': 1})
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Document
+from core.models.base import DocumentStatus
+from core.services.review_queue_service import ReviewQueueService
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class ReviewQueueTests(DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        self.url = reverse('document-review-queue-next')
+        self.reviewers = [self.create_user(f"staff{index}@example.com", "staff") for index in range(2)]
+        self.student = self.create_user("student@example.com", "student")
+        self.pending = [self.create_document(self.student, title=f"Pending {index}", doc_status=DocumentStatus.PENDING)
+                        for index in range(5)]
+        self.create_document(self.student, title="Approved")
+
+    def claim(self, reviewer, count):
+        self.client.force_authenticate(reviewer)
+        response = self.client.post(self.url, {'count': count}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [document['id'] for document in response.data['data']['documents']]
+
+    def test_reviewers_get_disjoint_batches_oldest_first(self):
+        ids = [document.id for document in self.pending]
+        self.assertEqual(self.claim(self.reviewers[0], 2), ids[:2])
+        self.assertEqual(self.claim(self.reviewers[1], 2), ids[2:4])
+        self.assertEqual(ReviewQueueService.get_queue_size(), 1)
+        self.assertEqual(Document.objects.get(id=ids[2]).review_claimed_by, self.reviewers[1])
+
+    def test_retry_returns_held_claims_and_renews_the_lease(self):
+        first = self.claim(self.reviewers[0], 2)
+        Document.objects.filter(id__in=first).update(review_claim_expires_at=timezone.now() + timedelta(seconds=5))
+        self.assertEqual(self.claim(self.reviewers[0], 2), first)
+        self.assertGreater(Document.objects.get(id=first[0]).review_claim_expires_at,
+                           timezone.now() + timedelta(minutes=10))
+        # Asking for more tops the held claims up with new ones.
+        self.assertEqual(self.claim(self.reviewers[0], 3), first + [self.pending[2].id])
+
+    def test_expired_claims_return_to_the_queue(self):
+        abandoned = self.claim(self.reviewers[0], 2)
+        Document.objects.filter(id__in=abandoned).update(review_claim_expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.claim(self.reviewers[1], 2), abandoned)
+
+    def test_decisions_release_claims(self):
+        claimed = self.claim(self.reviewers[0], 3)
+        self.client.patch(reverse('document-status-change', args=[claimed[0]]), {'new_status': 'approved'},
+                          format='json')
+        self.client.post(reverse('document-bulk-status-change'), {
+            'items': [{'id': claimed[1], 'new_status': 'rejected'}],
+        }, format='json')
+        for document in Document.objects.filter(id__in=claimed[:2]):
+            self.assertIsNone(document.review_claimed_by)
+            self.assertIsNone(document.review_claim_expires_at)
+        # Decided documents are no longer pending, so they are never handed out again.
+        self.assertEqual(self.claim(self.reviewers[1], 5), [document.id for document in self.pending[3:]])
+
+    def test_only_staff_may_claim_and_count_is_validated(self):
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(self.reviewers[0])
+        response = self.client.post(self.url, {'count': 0}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ReviewQueueService.get_queue_size(), 5)
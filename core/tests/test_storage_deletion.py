@@ -0,0 +1,200 @@
+import io
+import os
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.models import Document, StorageDeletion
+from core.services.document_service import DocumentService
+from core.services.storage_deletion_service import StorageDeletionService
+from core.tests.test_direct_upload import BUCKET_NAME
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+
+try:
+    import boto3
+    from moto import mock_aws
+    from storages.backends.s3boto3 import S3Boto3Storage
+except ImportError:  # moto is a test-only dependency
+    mock_aws = None
+
+
+@override_settings(STORAGE_DELETION_DRAIN_ON_COMMIT=False, STORAGE_ORPHAN_MIN_AGE_SECONDS=3600,
+                   DIRECT_UPLOAD_FINALIZE_WINDOW_SECONDS=3600)
+class StorageDeletionTests(TempMediaRootMixin, DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.staff = self.create_user("staff@example.com", "staff")
+
+    def store(self, name, age=None):
+        name = default_storage.save(name, ContentFile(b"stored bytes"))
+        if age is not None:
+            timestamp = time.time() - age.total_seconds()
+            os.utime(default_storage.path(name), (timestamp, timestamp))
+        return name
+
+    def create_stored_document(self, file_name, preview_name=None):
+        document = self.create_document(self.staff, title=os.path.basename(file_name))
+        Document.objects.filter(id=document.id).update(file=file_name, preview=preview_name)
+        return document
+
+    def test_delete_queues_objects_and_worker_removes_them(self):
+        file_name, preview_name = self.store("documents/a.pdf"), self.store("documents/a.preview.webp")
+        document = self.create_stored_document(file_name, preview_name)
+
+        DocumentService.delete_document(document.id)
+        self.assertEqual(set(StorageDeletion.objects.values_list('name', flat=True)), {file_name, preview_name})
+        # Nothing touched the storage inside the transaction.
+        self.assertTrue(default_storage.exists(file_name))
+
+        self.assertEqual(StorageDeletionService.drain(), {'deleted': 2, 'kept': 0, 'deferred': 0, 'failed': 0})
+        self.assertFalse(default_storage.exists(file_name))
+        self.assertFalse(default_storage.exists(preview_name))
+        self.assertFalse(StorageDeletion.objects.exists())
+
+    def test_rolled_back_delete_keeps_the_object(self):
+        document = self.create_stored_document(self.store("documents/b.pdf"))
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            DocumentService.delete_document(document.id)
+            raise RuntimeError("rollback")
+        self.assertTrue(Document.objects.filter(id=document.id).exists())
+        self.assertFalse(StorageDeletion.objects.exists())
+
+    def test_shared_content_addressed_object_is_kept(self):
+        shared = self.store("documents/sha256/ab/cd/abcd.pdf")
+        original = self.create_stored_document(shared)
+        self.create_stored_document(shared)
+
+        DocumentService.delete_document(original.id)
+        self.assertEqual(StorageDeletionService.drain(), {'deleted': 0, 'kept': 1, 'deferred': 0, 'failed': 0})
+        self.assertTrue(default_storage.exists(shared))
+        self.assertFalse(StorageDeletion.objects.exists())
+
+    def test_failed_deletions_are_retried_with_backoff(self):
+        StorageDeletionService.enqueue(["documents/c.pdf"])
+        with mock.patch.object(default_storage, 'delete', side_effect=OSError("storage unavailable")):
+            self.assertEqual(StorageDeletionService.drain(), {'deleted': 0, 'kept': 0, 'deferred': 0, 'failed': 1})
+        entry = StorageDeletion.objects.get()
+        self.assertEqual(entry.attempts, 1)
+        self.assertIn("storage unavailable", entry.last_error)
+        self.assertGreater(entry.available_at, timezone.now())
+        # Not due yet, so a second pass leaves it alone.
+        self.assertEqual(StorageDeletionService.drain(), {'deleted': 0, 'kept': 0, 'deferred': 0, 'failed': 0})
+
+        StorageDeletion.objects.update(available_at=timezone.now())
+        self.assertEqual(StorageDeletionService.drain()['deleted'], 1)
+        self.assertFalse(StorageDeletion.objects.exists())
+
+    def test_objects_being_reused_are_deferred(self):
+        name = self.store("documents/sha256/12/34/1234.pdf")
+        StorageDeletionService.enqueue([name])
+        # An upload holds the reuse lock on the name, so the batch cannot take it.
+        with mock.patch.object(StorageDeletionService, 'lock_for_deletion', return_value=set()):
+            self.assertEqual(StorageDeletionService.drain(), {'deleted': 0, 'kept': 0, 'deferred': 1, 'failed': 0})
+        self.assertTrue(default_storage.exists(name))
+        entry = StorageDeletion.objects.get()
+        self.assertEqual(entry.attempts, 0)
+        self.assertGreater(entry.available_at, timezone.now())
+
+    def test_store_file_locks_the_name_before_reusing_it(self):
+        upload = ContentFile(b"shared bytes", name="paper.pdf")
+        first = DocumentService.store_file(upload, 'application/pdf')
+        with mock.patch.object(StorageDeletionService, 'lock_for_reuse',
+                               wraps=StorageDeletionService.lock_for_reuse) as lock, transaction.atomic():
+            second = DocumentService.store_file(upload, 'application/pdf')
+        lock.assert_called_once_with([first.name])
+        self.assertEqual(second.name, first.name)
+        self.assertTrue(second.reused)
+
+        # Once a batch has deleted the shared object, the next upload stores the bytes again.
+        default_storage.delete(first.name)
+        third = DocumentService.store_file(upload, 'application/pdf')
+        self.assertFalse(third.reused)
+        self.assertTrue(default_storage.exists(third.name))
+
+    def test_claim_stored_reports_objects_deleted_in_between(self):
+        kept, deleted = self.store("documents/kept.pdf"), self.store("documents/gone.pdf")
+        default_storage.delete(deleted)
+        with transaction.atomic():
+            self.assertEqual(StorageDeletionService.claim_stored(default_storage, [kept, deleted]), {deleted})
+
+    def test_exhausted_deletions_are_reported_and_requeued(self):
+        name = self.store("documents/stuck.pdf", age=timedelta(hours=2))
+        with self.settings(STORAGE_DELETION_MAX_ATTEMPTS=1):
+            StorageDeletionService.enqueue([name])
+            with mock.patch.object(default_storage, 'delete', side_effect=OSError("storage unavailable")):
+                StorageDeletionService.drain()
+            StorageDeletion.objects.update(available_at=timezone.now())
+            self.assertEqual(StorageDeletionService.drain()['failed'], 0)
+
+            output = io.StringIO()
+            call_command('process_storage_deletions', stdout=output)
+            self.assertIn("1 file(s) ran out of attempts", output.getvalue())
+            self.assertIn(name, output.getvalue())
+
+            # The reaper finds the orphan again and gives its row a fresh attempt budget.
+            call_command('reap_orphaned_files', stdout=io.StringIO())
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(StorageDeletion.objects.exists())
+
+    def test_reaper_removes_old_unreferenced_files_only(self):
+        old = timedelta(hours=2)
+        orphan = self.store("documents/orphan.pdf", age=old)
+        nested_orphan = self.store("documents/sha256/ef/01/ef01.pdf", age=old)
+        young_orphan = self.store("documents/young.pdf")
+        referenced = self.store("documents/kept.pdf", age=old)
+        self.create_stored_document(referenced)
+
+        self.assertEqual(StorageDeletionService.reap_orphans(dry_run=True), {'scanned': 4, 'orphaned': 2})
+        self.assertFalse(StorageDeletion.objects.exists())
+
+        call_command('reap_orphaned_files', stdout=io.StringIO())
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertFalse(default_storage.exists(nested_orphan))
+        self.assertTrue(default_storage.exists(young_orphan))
+        self.assertTrue(default_storage.exists(referenced))
+
+
+@unittest.skipIf(mock_aws is None, "moto is not installed")
+@override_settings(STORAGE_DELETION_DRAIN_ON_COMMIT=False)
+class S3StorageDeletionTests(APITestCase):
+    def setUp(self):
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        self.s3 = boto3.client('s3', region_name='us-east-1',
+                               aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.s3.create_bucket(Bucket=BUCKET_NAME)
+        self.storage = S3Boto3Storage(bucket_name=BUCKET_NAME, region_name='us-east-1',
+                                      access_key='testing', secret_key='testing')
+
+    def test_batches_use_delete_objects(self):
+        names = [f"documents/{index}.pdf" for index in range(5)]
+        for name in names:
+            self.s3.put_object(Bucket=BUCKET_NAME, Key=name, Body=b"x")
+        StorageDeletionService.enqueue(names)
+
+        client = self.storage.connection.meta.client
+        with mock.patch.object(client, 'delete_objects', wraps=client.delete_objects) as delete_objects:
+            totals = StorageDeletionService.drain(storage=self.storage, batch_size=2)
+        self.assertEqual(totals, {'deleted': 5, 'kept': 0, 'deferred': 0, 'failed': 0})
+        self.assertEqual(delete_objects.call_count, 3)
+        self.assertNotIn('Contents', self.s3.list_objects_v2(Bucket=BUCKET_NAME))
+
+    def test_reaper_lists_the_bucket(self):
+        self.s3.put_object(Bucket=BUCKET_NAME, Key="documents/orphan.pdf", Body=b"x")
+        result = StorageDeletionService.reap_orphans(storage=self.storage, min_age=timedelta(0), dry_run=True)
+        self.assertEqual(result, {'scanned': 1, 'orphaned': 0})
+        with override_settings(DIRECT_UPLOAD_FINALIZE_WINDOW_SECONDS=0):
+            result = StorageDeletionService.reap_orphans(storage=self.storage, min_age=timedelta(0))
+        self.assertEqual(result, {'scanned': 1, 'orphaned': 1})
+        StorageDeletionService.drain(storage=self.storage)
+        self.assertNotIn('Contents', self.s3.list_objects_v2(Bucket=BUCKET_NAME))
@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import AcademicYear, DocumentContent
+from core.services.document_service import DocumentService
+from core.services.extraction_service import TextExtractionService
+from core.tests.test_document_views import DocumentTestDataMixin, TempMediaRootMixin
+from core.utils.text_extraction import (
+    DOCX_MIME_TYPE, PDF_MIME_TYPE, TXT_MIME_TYPE, UnsupportedFormatError, extract_text,
+)
+
+
+def make_pdf(text):
+    """Builds a minimal single-page PDF that draws `text` with a standard font."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+def make_docx(*paragraphs):
+    """Builds a minimal DOCX archive containing the given paragraphs."""
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as archive:
+        archive.writestr('word/document.xml',
+                         '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                         f'<w:body>{body}</w:body></w:document>')
+    return output.getvalue()
+
+
+class TextExtractorTests(APITestCase):
+    def test_extracts_supported_formats(self):
+        self.assertEqual(extract_text(make_pdf("Dijkstra shortest paths"), PDF_MIME_TYPE), "Dijkstra shortest paths")
+        self.assertEqual(extract_text(make_docx("Heaps", "Tries"), DOCX_MIME_TYPE), "Heaps\nTries")
+        self.assertEqual(extract_text("Graphs\x00".encode('utf-8'), TXT_MIME_TYPE), "Graphs")
+
+    def test_falls_back_to_file_extension(self):
+        self.assertEqual(extract_text(b"Queues", None, "documents/notes.txt"), "Queues")
+
+    def test_docx_document_xml_size_is_capped(self):
+        data = make_docx("A" * 5000)
+        self.assertEqual(extract_text(data, DOCX_MIME_TYPE, max_docx_xml_size=10_000), "A" * 5000)
+        with self.assertRaises(ValueError):
+            extract_text(data, DOCX_MIME_TYPE, max_docx_xml_size=1000)
+
+    def test_rejects_images(self):
+        with self.assertRaises(UnsupportedFormatError):
+            extract_text(b"\x89PNG", 'image/png', 'documents/scan.png')
+
+
+class TextExtractionPipelineTests(TempMediaRootMixin, DocumentTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.course = self.create_course()
+        self.academic_year = AcademicYear.objects.first()
+
+    def upload(self, name, data, content_type):
+        return DocumentService.create_document({
+            'file': SimpleUploadedFile(name, data, content_type=content_type),
+            'title': "Exam Paper",
+            'doc_type': 'endsem',
+            'course': self.course,
+            'academic_year': self.academic_year,
+            'semester_number': '2',
+        }, self.staff)
+
+    def test_upload_schedules_extraction_after_commit(self):
+        with mock.patch.object(TextExtractionService, 'submit') as submit:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                document = self.upload("paper.pdf", make_pdf("Kruskal"), PDF_MIME_TYPE)
+            self.assertFalse(DocumentContent.objects.filter(document=document).exists())
+            submit.assert_not_called()
+            for callback in callbacks:
+                callback()
+            submit.assert_called_once_with([document.id])
+
+    def test_extracted_text_is_searchable(self):
+        document = self.upload("paper.pdf", make_pdf("Bellman Ford relaxation"), PDF_MIME_TYPE)
+        image = self.upload("scan.png", b"\x89PNG\r\n", 'image/png')
+
+        summary = TextExtractionService.process_documents([document.id, image.id])
+        self.assertEqual(summary, {'done': 1, 'unsupported': 1})
+        self.assertEqual(DocumentContent.objects.get(document=document).text, "Bellman Ford relaxation")
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(reverse('document-search'), {'q': 'relaxation'})
+        self.assertEqual([item['id'] for item in response.data['data']['results']], [document.id])
+
+    def test_backfill_command_resumes_from_checkpoint(self):
+        first = self.upload("a.txt", b"Topological sort", TXT_MIME_TYPE)
+        second = self.upload("b.txt", b"Union find", TXT_MIME_TYPE)
+        checkpoint = os.path.join(self.media_root, 'checkpoint.json')
+        with open(checkpoint, 'w') as checkpoint_file:
+            json.dump({'last_id': first.id, 'processed': 1}, checkpoint_file)
+
+        # Threads instead of spawned processes so the workers see the test settings.
+        with mock.patch('core.management.commands.extract_document_text.create_process_pool',
+                               side_effect=lambda workers: ThreadPoolExecutor(workers)):
+            call_command('extract_document_text', checkpoint=checkpoint, workers=2, stdout=io.StringIO())
+
+        self.assertFalse(DocumentContent.objects.filter(document=first).exists())
+        self.assertEqual(DocumentContent.objects.get(document=second).text, "Union find")
+        with open(checkpoint) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file), {'last_id': second.id, 'processed': 2})
@@ -0,0 +1,151 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import User
+from core.models.base import DocumentStatus
+from core.models.user import UserRole
+from core.services.auth_service import AuthService
+from core.tests.test_document_views import DocumentTestDataMixin
+
+
+class UserRoleSyncTests(TestCase):
+    def setUp(self):
+        self.staff = Group.objects.create(name="staff")
+        self.student = Group.objects.create(name="student")
+        self.user = User.objects.create_user(email="user@example.com", password="strongpassword123")
+
+    def role_of(self, user):
+        return User.objects.get(pk=user.pk).role
+
+    def test_role_is_read_without_queries(self):
+        self.user.groups.add(self.staff)
+        with self.assertNumQueries(1):
+            user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.role, "staff")
+
+    def test_role_follows_the_users_groups(self):
+        self.assertIsNone(self.role_of(self.user))
+        self.user.groups.add(self.student)
+        self.assertEqual(self.user.role, "student")
+        # The group with the lowest ID wins, as it did when the role was read from the groups.
+        self.user.groups.add(self.staff)
+        self.assertEqual(self.role_of(self.user), "staff")
+        self.user.groups.remove(self.staff)
+        self.assertEqual(self.role_of(self.user), "student")
+        self.user.groups.set([self.staff])
+        self.assertEqual(self.role_of(self.user), "staff")
+        self.user.groups.clear()
+        self.assertIsNone(self.role_of(self.user))
+        self.assertIsNone(self.user.role)
+
+    def test_role_follows_changes_from_the_group_side(self):
+        other = User.objects.create_user(email="other@example.com", password="strongpassword123")
+        self.student.user_set.add(self.user, other)
+        self.assertEqual(self.role_of(other), "student")
+        self.staff.user_set.add(other)
+        self.assertEqual(self.role_of(other), "staff")
+        self.staff.user_set.remove(other)
+        self.assertEqual(self.role_of(other), "student")
+        self.student.user_set.clear()
+        self.assertIsNone(self.role_of(self.user))
+        self.assertIsNone(self.role_of(other))
+
+    def test_group_rename_and_delete(self):
+        self.user.groups.add(self.staff, self.student)
+        self.staff.name = "admin"
+        self.staff.save()
+        self.assertEqual(self.role_of(self.user), "admin")
+        self.staff.delete()
+        self.assertEqual(self.role_of(self.user), "student")
+
+
+class RoleQueryCountTests(DocumentTestDataMixin, APITestCase):
+    """
+    Locks in the queries each endpoint runs for a JWT-authenticated request: the token blacklist
+    check and the user row, with the role loaded alongside it, then the endpoint's own work.
+    No request reads the user's groups.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.staff = self.create_user("staff@example.com", "staff")
+        self.student = self.create_user("student@example.com", "student")
+        self.course = self.create_course()
+        self.document = self.create_document(self.student, course=self.course)
+        self.pending = self.create_document(self.student, title="Pending", doc_status=DocumentStatus.PENDING)
+
+    def request(self, user, method, url, data=None, queries=0):
+        self.client.credentials()
+        if user is not None:
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AuthService.generate_jwt_tokens(user)['access']}")
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, format='json')
+        executed = [query['sql'] for query in context.captured_queries]
+        self.assertEqual(len(executed), queries, "\n".join(executed))
+        self.assertFalse([sql for sql in executed if 'auth_group' in sql or 'core_user_groups' in sql])
+        return response
+
+    def test_document_list(self):
+        for user in (self.staff, self.student):
+            response = self.request(user, 'get', reverse('document-list'), queries=4)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_document_detail(self):
+        response = self.request(self.student, 'get', reverse('document-detail', args=[self.document.id]), queries=3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_document_facets(self):
+        response = self.request(self.student, 'get', reverse('document-facets'), queries=6)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_document_trending(self):
+        self.request(self.student, 'get', reverse('document-trending'), queries=3)
+        # Cached: only authentication queries remain.
+        response = self.request(self.student, 'get', reverse('document-trending'), queries=2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_document_status_change(self):
+        response = self.request(self.staff, 'patch', reverse('document-status-change', args=[self.pending.id]),
+                                {'new_status': 'approved'}, queries=8)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_status_change(self):
+        response = self.request(self.staff, 'post', reverse('document-bulk-status-change'),
+                                {'items': [{'id': self.pending.id, 'new_status': 'rejected'}]}, queries=7)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_review_queue(self):
+        response = self.request(self.staff, 'post', reverse('document-review-queue-next'), {'count': 1}, queries=6)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # A role check that refuses the request costs nothing beyond authentication.
+        response = self.request(self.student, 'post', reverse('document-review-queue-next'), {'count': 1}, queries=2)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_dashboard_role_check(self):
+        response = self.request(self.staff, 'get', reverse('dashboard'), queries=2)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_login(self):
+        response = self.request(None, 'post', reverse('login'),
+                                {'identifier': "staff@example.com", 'password': "strongpassword123"}, queries=2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['user']['role'], "staff")
+
+    def test_register(self):
+        Group.objects.create(name=UserRole.STUDENT)
+        data = {'email': "new@example.com", 'username': "new",
+                'password': "strongpassword123", 'password_confirm': "strongpassword123"}
+        # Joining the default group is the only group work: look it up, add the membership and
+        # store the resulting role. The response reads the stored role.
+        with self.assertNumQueries(13):
+            response = self.client.post(reverse('register'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['user']['role'], UserRole.STUDENT)
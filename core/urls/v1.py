@@ -10,7 +10,7 @@ from core.views.v1.auth.auth_views import (
     LoginView, LogoutView, RegisterView, RefreshTokenView,
 )
 from core.views.v1.dashboard.dashboard_views import DashboardView
-from core.views.v1.documents.document_views import DocumentUploadView, DocumentListView, DocumentDetailView, DocumentStatusChangeView
+from core.views.v1.documents.document_views import DocumentUploadView, DocumentScanUploadView, DocumentDirectUploadView, DocumentDirectUploadFinalizeView, UploadSessionCreateView, UploadSessionDetailView, UploadChunkView, UploadSessionCompleteView, DocumentListView, DocumentExportView, DocumentBundleView, DocumentSearchView, DocumentFacetsView, DocumentTrendingView, DocumentDetailView, DocumentDownloadView, DocumentStatusChangeView, DocumentReviewQueueView, DocumentBulkStatusChangeView, DocumentBulkIngestView
 from core.views.v1.lookups.lookups_views import DegreeLevelListView, ProgramListView, CourseListView, AcademicYearListView, DocumentTypeChoicesView, SemesterNumberChoicesView,  SemesterListView
 
 schema_view = get_schema_view(
@@ -44,8 +44,24 @@ urlpatterns = [
 
     # Documents
     path('documents/upload/', DocumentUploadView.as_view(), name='document-upload'),
+    path('documents/upload/scan/', DocumentScanUploadView.as_view(), name='document-upload-scan'),
+    path('documents/upload/presign/', DocumentDirectUploadView.as_view(), name='document-upload-presign'),
+    path('documents/upload/finalize/', DocumentDirectUploadFinalizeView.as_view(), name='document-upload-finalize'),
+    path('documents/uploads/', UploadSessionCreateView.as_view(), name='upload-session-create'),
+    path('documents/uploads/<uuid:session_id>/', UploadSessionDetailView.as_view(), name='upload-session-detail'),
+    path('documents/uploads/<uuid:session_id>/chunks/<int:index>/', UploadChunkView.as_view(), name='upload-session-chunk'),
+    path('documents/uploads/<uuid:session_id>/complete/', UploadSessionCompleteView.as_view(), name='upload-session-complete'),
     path('documents/', DocumentListView.as_view(), name='document-list'),
+    path('documents/export/', DocumentExportView.as_view(), name='document-export'),
+    path('documents/bundle/', DocumentBundleView.as_view(), name='document-bundle'),
+    path('documents/search/', DocumentSearchView.as_view(), name='document-search'),
+    path('documents/facets/', DocumentFacetsView.as_view(), name='document-facets'),
+    path('documents/trending/', DocumentTrendingView.as_view(), name='document-trending'),
+    path('documents/ingest/', DocumentBulkIngestView.as_view(), name='document-bulk-ingest'),
+    path('documents/status/', DocumentBulkStatusChangeView.as_view(), name='document-bulk-status-change'),
+    path('documents/review-queue/next/', DocumentReviewQueueView.as_view(), name='document-review-queue-next'),
     path('documents/<int:id>/', DocumentDetailView.as_view(), name='document-detail'),
+    path('documents/<int:id>/download/', DocumentDownloadView.as_view(), name='document-download'),
     path('documents/<int:id>/status/', DocumentStatusChangeView.as_view(), name='document-status-change'),
 
     # Swagger UI:
@@ -1 +1 @@
-from request_details import *
\ No newline at end of file
+from .request_details import *
\ No newline at end of file
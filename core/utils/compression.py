@@ -0,0 +1,160 @@
+import io
+import gzip
+import zlib
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+GZIP_ENCODING = 'gzip'
+# Compressed objects get a suffix, so compressed and raw copies of the same content never share a
+# storage name, and code that only has the name (worker processes) knows how to decode it.
+ENCODING_SUFFIXES = {GZIP_ENCODING: '.gz'}
+
+
+def get_upload_encoding(content_type, size=None):
+    """
+    Decides from the declared format alone whether a file is stored compressed, so
+    already-compressed formats (PDF, JPEG, PNG, DOCX) are skipped without reading any bytes.
+    Returns:
+        str | None: The content coding to store the file with, or None to store it as is.
+    """
+    from django.conf import settings
+
+    if not settings.DOCUMENT_COMPRESSION_ENABLED or content_type not in settings.DOCUMENT_COMPRESSION_CONTENT_TYPES:
+        return None
+    if size is not None and size < settings.DOCUMENT_COMPRESSION_MIN_SIZE:
+        return None
+    return GZIP_ENCODING
+
+
+def encoded_name(name, encoding):
+    return f"{name}{ENCODING_SUFFIXES[encoding]}" if encoding else name
+
+
+def get_name_encoding(name):
+    """The content coding of a stored object, derived from its storage name."""
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        if name and name.endswith(suffix):
+            return encoding
+    return None
+
+
+def decoded_name(name):
+    """The storage name without its encoding suffix, e.g. for deriving the original extension."""
+    encoding = get_name_encoding(name)
+    return name[:-len(ENCODING_SUFFIXES[encoding])] if encoding else name
+
+
+class GzipCompressingStream(io.RawIOBase):
+    """
+    Read-only stream of the gzip-compressed bytes of `source`, produced as it is read, so
+    a storage backend can upload a compressed file without it ever being held in full.
+    Counts the bytes read from the source and produced for the storage.
+    """
+
+    def __init__(self, source, level=6):
+        super().__init__()
+        self.source = source
+        # wbits=31 writes a gzip container (with a zero mtime, so output is deterministic).
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        self.buffer = bytearray()
+        self.finished = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while len(self.buffer) < len(target) and not self.finished:
+            block = self.source.read(COPY_BUFFER_SIZE)
+            if block:
+                self.bytes_in += len(block)
+                self.buffer += self.compressor.compress(block)
+            else:
+                self.buffer += self.compressor.flush()
+                self.finished = True
+        count = min(len(target), len(self.buffer))
+        target[:count] = self.buffer[:count]
+        del self.buffer[:count]
+        self.bytes_out += count
+        return count
+
+
+def iter_decoded(chunks, encoding, max_block_size=COPY_BUFFER_SIZE):
+    """
+    Decompresses an iterable of stored chunks incrementally (e.g. a streamed S3 body), never
+    producing more than `max_block_size` bytes at a time, however well the data compressed.
+    """
+    if encoding != GZIP_ENCODING:
+        raise ValueError(f"Unsupported content coding '{encoding}'.")
+    decompressor = zlib.decompressobj(31)
+    for chunk in chunks:
+        while chunk:
+            block = decompressor.decompress(chunk, max_block_size)
+            if block:
+                yield block
+            chunk = decompressor.unconsumed_tail
+    block = decompressor.flush()
+    if block:
+        yield block
+
+
+class DecodingGzipFile(gzip.GzipFile):
+    """GzipFile that also closes the stored file it decompresses."""
+
+    def __init__(self, stored_file):
+        self.stored_file = stored_file
+        super().__init__(fileobj=stored_file, mode='rb')
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.stored_file.close()
+
+
+def open_decoded(storage, name):
+    """Opens a stored object for reading its original (decompressed) bytes."""
+    stored_file = storage.open(name, 'rb')
+    if get_name_encoding(name) == GZIP_ENCODING:
+        return DecodingGzipFile(stored_file)
+    return stored_file
+
+
+class CompressingStorage:
+    """
+    Wraps a storage backend (by default the configured default storage) so that eligible
+    uploads are written gzip-compressed as a stream and read back decompressed. Every other
+    storage operation is delegated unchanged. On S3 the `.gz` name also makes django-storages
+    record `ContentEncoding: gzip` in the object metadata, so presigned URLs decompress in clients.
+    """
+
+    def __init__(self, storage, level=None):
+        self.storage = storage
+        self.level = level
+
+    def __getattr__(self, attribute):
+        return getattr(self.storage, attribute)
+
+    def save_encoded(self, name, content, encoding=None):
+        """
+        Saves `content` under `name` (plus the encoding suffix), compressing it on the way.
+        Returns:
+            tuple: (storage name, original size in bytes, stored size in bytes)
+        """
+        from django.conf import settings
+        from django.core.files import File
+
+        if not encoding:
+            name = self.storage.save(name, content)
+            return name, content.size, content.size
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        stream = GzipCompressingStream(content, self.level or settings.DOCUMENT_COMPRESSION_LEVEL)
+        compressed = File(stream, name=encoded_name(content.name or name, encoding))
+        compressed.content_type = getattr(content, 'content_type', None)
+        name = self.storage.save(encoded_name(name, encoding), compressed)
+        return name, stream.bytes_in, stream.bytes_out
+
+    def open_decoded(self, name):
+        return open_decoded(self.storage, name)
@@ -0,0 +1,72 @@
+import os
+import hashlib
+
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+HASH_CHUNK_SIZE = 64 * 1024
+CONTENT_ADDRESSED_PREFIX = 'documents/sha256'
+
+
+def sha256_file(file, chunk_size=HASH_CHUNK_SIZE):
+    """Returns the hex SHA-256 of a Django File (or any object with `chunks()`)."""
+    digest = hashlib.sha256()
+    for block in file.chunks(chunk_size):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def content_addressed_name(digest, file_name):
+    """
+    Storage name derived from the file's bytes, e.g. documents/sha256/ab/cd/abcd...ef.pdf.
+    Identical uploads map to the same name, so their bytes are stored once.
+    """
+    extension = os.path.splitext(file_name or '')[1].lower()
+    return f"{CONTENT_ADDRESSED_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+class HashingUploadHandlerMixin:
+    """
+    Computes the SHA-256 of each uploaded file while Django receives it, so hashing
+    costs no extra pass over the bytes. The digest is exposed as `uploaded_file.sha256`.
+    """
+
+    def new_file(self, *args, **kwargs):
+        self.digest = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        # An inactive memory handler passes the data on to the temporary-file handler, which hashes it.
+        if getattr(self, 'activated', True):
+            self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        if uploaded_file is not None:
+            uploaded_file.sha256 = self.digest.hexdigest()
+        return uploaded_file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadHandlerMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadHandlerMixin, TemporaryFileUploadHandler):
+    pass
+
+
+def hash_stored_file(document_id, file_name):
+    """
+    Worker-process entry point for the hash backfill; like the text extraction worker
+    it imports no models. Returns (document_id, digest or None, error or None).
+    """
+    from django.core.files import File
+    from django.core.files.storage import default_storage
+    from core.utils.compression import open_decoded
+
+    try:
+        # The digest is of the original bytes, also for files compressed at rest.
+        with open_decoded(default_storage, file_name) as stored_file:
+            return document_id, sha256_file(File(stored_file)), None
+    except Exception as e:
+        return document_id, None, f"{type(e).__name__}: {e}"
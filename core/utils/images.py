@@ -0,0 +1,116 @@
+import io
+import hashlib
+
+from core.utils.content_hashing import content_addressed_name
+from core.utils.previews import JPEG_MIME_TYPE, PNG_MIME_TYPE
+from core.utils.text_extraction import PDF_MIME_TYPE
+
+OUTPUT_EXTENSIONS = {JPEG_MIME_TYPE: '.jpg', PNG_MIME_TYPE: '.png', PDF_MIME_TYPE: '.pdf'}
+
+# Worker outcomes; this module must stay importable without the app registry.
+STATUS_DONE = 'done'
+STATUS_UNCHANGED = 'unchanged'
+STATUS_FAILED = 'failed'
+
+
+def get_max_pixels(dpi, page_inches):
+    """Longest side, in pixels, of a photographed page at `dpi` (the page's long edge is `page_inches`)."""
+    return max(1, round(dpi * page_inches))
+
+
+def prepare_page(data, max_pixels):
+    """
+    Decodes an image, applies its EXIF orientation and downscales it to fit `max_pixels`.
+    The returned image is saved without EXIF (camera, GPS and timestamps are dropped).
+    """
+    from PIL import Image, ImageOps
+
+    image = Image.open(io.BytesIO(data))
+    # Decode at a reduced scale where the codec supports it (JPEG), instead of full size.
+    image.draft('RGB', (max_pixels, max_pixels))
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_pixels, max_pixels))
+    return image
+
+
+def flatten(image):
+    """RGB or greyscale copy of `image`; transparent areas become white, as on paper."""
+    from PIL import Image
+
+    if image.mode in ('RGB', 'L'):
+        return image
+    if 'A' in image.getbands() or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def reencode_image(data, mime_type, dpi, page_inches, quality):
+    """
+    Re-encodes a JPEG or PNG without metadata, downscaled to `dpi`.
+    Pure function of its arguments, so it can run inside a worker process.
+    :returns: The encoded bytes, in the same format.
+    """
+    image = prepare_page(data, get_max_pixels(dpi, page_inches))
+    output = io.BytesIO()
+    if mime_type == JPEG_MIME_TYPE:
+        flatten(image).save(output, format='JPEG', quality=quality, optimize=True, progressive=True, dpi=(dpi, dpi))
+    elif mime_type == PNG_MIME_TYPE:
+        image.save(output, format='PNG', optimize=True, dpi=(dpi, dpi))
+    else:
+        raise ValueError(f"Cannot re-encode format '{mime_type}'.")
+    return output.getvalue()
+
+
+def stitch_pdf(pages, dpi, page_inches, quality):
+    """
+    Combines page images into one PDF, one page per image in order. Each page is decoded
+    and downscaled as it is read, so only the downscaled pages are held in memory.
+    :param pages: Iterable of encoded image bytes.
+    :returns: The PDF bytes.
+    """
+    max_pixels = get_max_pixels(dpi, page_inches)
+    images = [flatten(prepare_page(data, max_pixels)) for data in pages]
+    if not images:
+        raise ValueError("A scan needs at least one page.")
+    output = io.BytesIO()
+    # Pillow embeds RGB/greyscale pages as JPEG (DCTDecode) streams at `quality`.
+    images[0].save(output, format='PDF', save_all=True, append_images=images[1:], resolution=dpi, quality=quality)
+    return output.getvalue()
+
+
+def process_stored_images(document_id, file_names, output_format, dpi, page_inches, quality):
+    """
+    Worker-process entry point. Re-encodes one stored image (`output_format` JPEG/PNG) or
+    stitches several into a PDF, and stores the result content-addressed in the default
+    storage. Never touches the database and imports no models.
+    Returns:
+        tuple: (document_id, status, storage name, SHA-256, size in bytes, error); a re-encode
+        that would not make the file smaller is reported as unchanged.
+    """
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+    from core.utils.compression import open_decoded
+
+    def read(name):
+        with open_decoded(default_storage, name) as stored_file:
+            return stored_file.read()
+
+    try:
+        if output_format == PDF_MIME_TYPE:
+            data = stitch_pdf((read(name) for name in file_names), dpi, page_inches, quality)
+        else:
+            original = read(file_names[0])
+            data = reencode_image(original, output_format, dpi, page_inches, quality)
+            if len(data) >= len(original):
+                return document_id, STATUS_UNCHANGED, None, None, None, None
+
+        digest = hashlib.sha256(data).hexdigest()
+        name = content_addressed_name(digest, f"processed{OUTPUT_EXTENSIONS[output_format]}")
+        if not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(data))
+        return document_id, STATUS_DONE, name, digest, len(data), None
+    except Exception as e:
+        return document_id, STATUS_FAILED, None, None, None, f"{type(e).__name__}: {e}"
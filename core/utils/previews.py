@@ -0,0 +1,137 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+
+from core.utils.text_extraction import PDF_MIME_TYPE, UnsupportedFormatError
+
+JPEG_MIME_TYPE = 'image/jpeg'
+PNG_MIME_TYPE = 'image/png'
+
+IMAGE_EXTENSION_MIME_TYPES = {
+    '.jpg': JPEG_MIME_TYPE,
+    '.jpeg': JPEG_MIME_TYPE,
+    '.png': PNG_MIME_TYPE,
+    '.pdf': PDF_MIME_TYPE,
+}
+
+PREVIEW_EXTENSIONS = {'WEBP': '.webp', 'JPEG': '.jpg'}
+
+# Mirrors the text extraction statuses; this module must stay importable without the app registry.
+STATUS_DONE = 'done'
+STATUS_UNSUPPORTED = 'unsupported'
+STATUS_FAILED = 'failed'
+
+PDFTOPPM_TIMEOUT_SECONDS = 60
+
+
+def preview_name_for(file_name, image_format):
+    """
+    Deterministic preview key stored next to the original, e.g.
+    documents/sha256/ab/cd/<digest>.pdf -> documents/sha256/ab/cd/<digest>.preview.webp.
+    Content-addressed duplicates therefore share one preview.
+    """
+    return f"{os.path.splitext(file_name)[0]}.preview{PREVIEW_EXTENSIONS[image_format]}"
+
+
+def resolve_preview_mime_type(file_format, file_name):
+    if file_format in (PDF_MIME_TYPE, JPEG_MIME_TYPE, PNG_MIME_TYPE):
+        return file_format
+    return IMAGE_EXTENSION_MIME_TYPES.get(os.path.splitext(file_name or '')[1].lower(), file_format)
+
+
+def render_pdf_with_pdftoppm(data, max_size):
+    """Rasterizes the first page with poppler's pdftoppm, if it is installed."""
+    executable = shutil.which('pdftoppm')
+    if executable is None:
+        return None
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        source_path = os.path.join(work_dir, 'source.pdf')
+        with open(source_path, 'wb') as source:
+            source.write(data)
+        output_root = os.path.join(work_dir, 'page')
+        subprocess.run(
+            [executable, '-f', '1', '-l', '1', '-singlefile', '-png', '-scale-to', str(max_size),
+             source_path, output_root],
+            check=True, capture_output=True, timeout=PDFTOPPM_TIMEOUT_SECONDS,
+        )
+        with Image.open(f"{output_root}.png") as page:
+            page.load()
+            return page.copy()
+
+
+def extract_pdf_first_page_image(data):
+    """
+    Without a rasterizer, uses the largest image drawn on the first page. Scanned papers
+    are one full-page image per page, so this is the page itself.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    if not reader.pages:
+        return None
+    images = [image.image for image in reader.pages[0].images if image.image is not None]
+    if not images:
+        return None
+    return max(images, key=lambda image: image.width * image.height)
+
+
+def render_preview(data, file_format, file_name=None, max_size=480, image_format='WEBP', quality=80):
+    """
+    Renders a small preview image: the first page of a PDF or a downscaled JPEG/PNG.
+    Pure function of its arguments, so it can run inside a worker process.
+    :returns: Encoded preview bytes in `image_format`.
+    :raises UnsupportedFormatError: If no preview can be produced for the file.
+    """
+    from PIL import Image, ImageOps
+
+    mime_type = resolve_preview_mime_type(file_format, file_name)
+    if mime_type == PDF_MIME_TYPE:
+        image = render_pdf_with_pdftoppm(data, max_size) or extract_pdf_first_page_image(data)
+        if image is None:
+            raise UnsupportedFormatError("PDF has no renderable first page (pdftoppm is not installed).")
+    elif mime_type in (JPEG_MIME_TYPE, PNG_MIME_TYPE):
+        image = Image.open(io.BytesIO(data))
+        # Decode at a reduced scale where the codec supports it (JPEG), instead of full size.
+        image.draft('RGB', (max_size, max_size))
+        image = ImageOps.exif_transpose(image)
+    else:
+        raise UnsupportedFormatError(f"No preview renderer for format '{file_format}'.")
+
+    has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+    target_mode = 'RGBA' if image_format == 'WEBP' and has_alpha else 'RGB'
+    if image.mode != target_mode:
+        image = image.convert(target_mode)
+    image.thumbnail((max_size, max_size))
+    output = io.BytesIO()
+    image.save(output, format=image_format, quality=quality)
+    return output.getvalue()
+
+
+def generate_stored_preview(document_id, file_name, file_format, max_size, image_format, quality):
+    """
+    Worker-process entry point. Reads the original from the default storage and writes its
+    preview next to it, skipping the work if that preview already exists. Never touches the
+    database and imports no models, so it can run in a freshly spawned process.
+    Returns:
+        tuple: (document_id, status, preview storage name or None, error or None)
+    """
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+    from core.utils.compression import decoded_name, open_decoded
+
+    preview_name = preview_name_for(decoded_name(file_name), image_format)
+    try:
+        if default_storage.exists(preview_name):
+            return document_id, STATUS_DONE, preview_name, None
+        with open_decoded(default_storage, file_name) as stored_file:
+            data = stored_file.read()
+        preview = render_preview(data, file_format, decoded_name(file_name), max_size, image_format, quality)
+        return document_id, STATUS_DONE, default_storage.save(preview_name, ContentFile(preview)), None
+    except UnsupportedFormatError as e:
+        return document_id, STATUS_UNSUPPORTED, None, str(e)
+    except Exception as e:
+        return document_id, STATUS_FAILED, None, f"{type(e).__name__}: {e}"
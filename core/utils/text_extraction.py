@@ -0,0 +1,124 @@
+import io
+import os
+import zipfile
+import xml.etree.ElementTree as ElementTree
+
+PDF_MIME_TYPE = 'application/pdf'
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+TXT_MIME_TYPE = 'text/plain'
+
+EXTENSION_MIME_TYPES = {
+    '.pdf': PDF_MIME_TYPE,
+    '.docx': DOCX_MIME_TYPE,
+    '.txt': TXT_MIME_TYPE,
+}
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Mirrors DocumentContent.ExtractionStatus; this module must stay importable without the app registry.
+STATUS_DONE = 'done'
+STATUS_UNSUPPORTED = 'unsupported'
+STATUS_FAILED = 'failed'
+
+# Cap on the uncompressed size of a DOCX's word/document.xml when no limit is passed.
+DEFAULT_MAX_DOCX_XML_SIZE = 50 * 1024 * 1024
+
+
+class UnsupportedFormatError(Exception):
+    """Raised when no text extractor exists for a file format (e.g. scanned images)."""
+
+
+def resolve_mime_type(file_format, file_name):
+    """Returns the MIME type to extract with, falling back to the file extension."""
+    if file_format in (PDF_MIME_TYPE, DOCX_MIME_TYPE, TXT_MIME_TYPE):
+        return file_format
+    return EXTENSION_MIME_TYPES.get(os.path.splitext(file_name or '')[1].lower(), file_format)
+
+
+def extract_txt(data):
+    for encoding in ('utf-8-sig', 'utf-16'):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('latin-1')
+
+
+def extract_docx(data, max_xml_size=DEFAULT_MAX_DOCX_XML_SIZE):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        if archive.getinfo('word/document.xml').file_size > max_xml_size:
+            raise ValueError(f"word/document.xml exceeds {max_xml_size} bytes.")
+        # The declared size can lie (zip bombs), so the read itself is bounded too.
+        with archive.open('word/document.xml') as entry:
+            xml = entry.read(max_xml_size + 1)
+        if len(xml) > max_xml_size:
+            raise ValueError(f"word/document.xml exceeds {max_xml_size} bytes.")
+        root = ElementTree.fromstring(xml)
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NAMESPACE}p'):
+        text = ''.join(node.text or '' for node in paragraph.iter(f'{WORD_NAMESPACE}t'))
+        if text:
+            paragraphs.append(text)
+    return '\n'.join(paragraphs)
+
+
+def extract_pdf(data):
+    # Imported lazily so that web workers that never extract do not pay for it.
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+EXTRACTORS = {
+    PDF_MIME_TYPE: extract_pdf,
+    DOCX_MIME_TYPE: extract_docx,
+    TXT_MIME_TYPE: extract_txt,
+}
+
+
+def extract_text(data, file_format, file_name=None, max_chars=None, max_docx_xml_size=DEFAULT_MAX_DOCX_XML_SIZE):
+    """
+    Pulls plain text out of a PDF, DOCX or TXT payload.
+    This is a pure function of its arguments, so it can run inside a worker process.
+    :param data: Raw file bytes.
+    :param file_format: MIME type recorded on the document.
+    :param file_name: Storage name, used to guess the format when the MIME type is missing.
+    :param max_chars: Optional cap on the length of the returned text.
+    :param max_docx_xml_size: Cap on the uncompressed document XML of a DOCX.
+    :raises UnsupportedFormatError: If the format has no extractor.
+    """
+    extractor = EXTRACTORS.get(resolve_mime_type(file_format, file_name))
+    if extractor is None:
+        raise UnsupportedFormatError(f"No text extractor for format '{file_format}'.")
+    if extractor is extract_docx:
+        text = extract_docx(data, max_docx_xml_size)
+    else:
+        text = extractor(data)
+    # PostgreSQL text columns reject NUL bytes, which some PDFs emit.
+    text = text.replace('\x00', '')
+    return text[:max_chars] if max_chars else text
+
+
+def extract_stored_file_text(document_id, file_name, file_format, max_chars=None):
+    """
+    Worker-process entry point. Reads a file from the default storage and extracts its text.
+    It never touches the database and this module imports no models, so it can be
+    unpickled in a freshly spawned process.
+    Returns:
+        tuple: (document_id, status, text, error)
+    """
+    from django.conf import settings
+    from django.core.files.storage import default_storage
+    from core.utils.compression import decoded_name, open_decoded
+
+    try:
+        with open_decoded(default_storage, file_name) as stored_file:
+            data = stored_file.read()
+        text = extract_text(data, file_format, decoded_name(file_name), max_chars,
+                            settings.TEXT_EXTRACTION_MAX_DOCX_XML_SIZE)
+        return document_id, STATUS_DONE, text, None
+    except UnsupportedFormatError as e:
+        return document_id, STATUS_UNSUPPORTED, '', str(e)
+    except Exception as e:
+        return document_id, STATUS_FAILED, '', f"{type(e).__name__}: {e}"
@@ -0,0 +1,21 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def initialize_worker():
+    """Process-pool initializer: spawned workers need the Django app registry for storage access."""
+    import django
+    django.setup()
+
+
+def create_process_pool(max_workers):
+    """
+    Process pool for the CPU-bound background work (text extraction, hashing, previews, images).
+    'spawn' avoids forking a web worker that may hold threads and open sockets; each worker
+    starts a fresh interpreter and sets Django up itself.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=initialize_worker,
+    )
@@ -0,0 +1 @@
+from .file_validators import *
\ No newline at end of file
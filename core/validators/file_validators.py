@@ -0,0 +1,8 @@
+# MIME types accepted for document uploads (the formats DocumentUploadView advertises).
+ALLOWED_UPLOAD_CONTENT_TYPES = {
+    'application/pdf': '.pdf',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'text/plain': '.txt',
+}
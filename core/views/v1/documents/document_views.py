@@ -1,7 +1,13 @@
 # core/views/v1/documents/document_views.py
 
+import io
 import logging
 
+from django.db.models import Count, Max
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
@@ -18,16 +24,41 @@ from core.permissions.role_permissions import (
     IsStudentUserRole
 )
 from core.mixins.response_mixins import APIResponseMixin
+from core.mixins.document_visibility_mixins import DocumentVisibilityMixin
+from core.mixins.conditional_mixins import ConditionalResponseMixin
+from core.pagination.keyset_pagination import KeysetPagination
+from core.filters.document_filters import DocumentFilter
 
 # Import the DocumentService
 from core.services.document_service import DocumentService
+from core.services.search_service import SearchService
+from core.services.facet_service import FacetService
+from core.services.direct_upload_service import DirectUploadService, DirectUploadNotSupported
+from core.services.chunked_upload_service import ChunkedUploadService
+from core.services.download_service import DocumentDownloadService
+from core.services.bulk_ingest_service import BulkIngestService, IngestError, IngestSource
+from core.services.export_service import EXPORT_FORMATS, DocumentExportService
+from core.services.bundle_service import BundleTooLarge, DocumentBundleService
+from core.services.counter_service import DocumentCounterService
+from core.services.trending_service import TrendingService
+from core.services.review_queue_service import ReviewQueueService
 
 # Import the Document serializers
 from core.serializers.document_serializers import (
     DocumentUploadSerializer,
     DocumentRetrieveSerializer,
+    DocumentValuesSerializer,
     DocumentUpdateSerializer,
-    DocumentStatusChangeSerializer
+    DocumentStatusChangeSerializer,
+    ReviewQueueClaimSerializer,
+    BulkStatusChangeSerializer,
+    BulkIngestSerializer,
+    ScanUploadSerializer,
+    DocumentBundleSerializer,
+    DocumentTrendingSerializer,
+    DirectUploadRequestSerializer,
+    DirectUploadFinalizeSerializer,
+    UploadSessionCreateSerializer,
 )
 from core.models import Document
 # IMPORT SemesterNumber and DocumentStatus DIRECTLY from base.py
@@ -59,7 +90,8 @@ class DocumentUploadView(APIView, APIResponseMixin):
             201: openapi.Response('Document uploaded successfully.', openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={'message': openapi.Schema(type=openapi.TYPE_STRING),
-                            'document_id': openapi.Schema(type=openapi.TYPE_INTEGER)}
+                            'document_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'duplicate_of': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID of an existing document with identical contents, if any.')}
             )),
             400: 'Bad Request', 401: 'Unauthorized', 403: 'Permission Denied', 500: 'Internal Server Error',
         },
@@ -75,7 +107,7 @@ class DocumentUploadView(APIView, APIResponseMixin):
             logger.info(f"Document (ID: {document.id}) uploaded successfully by {request.user.email}.")
             return self.success_response(
                 message="Document uploaded successfully.",
-                data={"document_id": document.id},
+                data={"document_id": document.id, "duplicate_of": document.duplicate_of_id},
                 status_code=status.HTTP_201_CREATED
             )
         except Exception as e:
@@ -90,61 +122,410 @@ class DocumentUploadView(APIView, APIResponseMixin):
             )
 
 
+class DocumentScanUploadView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Upload a scanned paper as several page images (JPG/PNG, in page order). "
+                              "The pages are stitched into a single PDF document in the background.",
+        manual_parameters=[
+            openapi.Parameter('pages', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True,
+                              description='Page images (repeat the field, in page order).'),
+            openapi.Parameter('title', openapi.IN_FORM, type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('doc_type', openapi.IN_FORM, type=openapi.TYPE_STRING, required=True,
+                              enum=[choice[0] for choice in Document.DocumentType.choices]),
+            openapi.Parameter('course', openapi.IN_FORM, type=openapi.TYPE_INTEGER, required=True),
+            openapi.Parameter('academic_year', openapi.IN_FORM, type=openapi.TYPE_INTEGER, required=True),
+            openapi.Parameter('semester_number', openapi.IN_FORM, type=openapi.TYPE_STRING, required=True,
+                              enum=[choice[0] for choice in SemesterNumber.choices]),
+        ],
+        consumes=['multipart/form-data'],
+        responses={
+            201: openapi.Response('Scan uploaded; the PDF is generated in the background.', openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={'message': openapi.Schema(type=openapi.TYPE_STRING),
+                            'document_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'pages': openapi.Schema(type=openapi.TYPE_INTEGER)}
+            )),
+            400: 'Bad Request', 401: 'Unauthorized', 500: 'Internal Server Error',
+        },
+        tags=['Documents']
+    )
+    def post(self, request, *args, **kwargs):
+        logger.info(f"User {request.user.email} (Role: {request.user.role}) attempting to upload a scan.")
+
+        serializer = ScanUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors)
+
+        data = dict(serializer.validated_data)
+        pages = data.pop('pages')
+        try:
+            document = DocumentService.create_scan_document(data, pages, request.user)
+            return self.success_response(
+                message="Scan uploaded successfully; the PDF is being generated.",
+                data={"document_id": document.id, "pages": len(pages)},
+                status_code=status.HTTP_201_CREATED
+            )
+        except serializers.ValidationError as e:
+            return self.error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.exception(f"Scan upload failed for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to upload the scan.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+# --- Direct (presigned) Upload Views ---
+class DocumentDirectUploadView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Step 1 of a direct upload: validate document metadata and get a presigned POST "
+                              "to send the file straight to storage. Finish with /documents/upload/finalize/.",
+        request_body=DirectUploadRequestSerializer,
+        responses={
+            201: openapi.Response('Presigned upload issued.', openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={'url': openapi.Schema(type=openapi.TYPE_STRING),
+                            'fields': openapi.Schema(type=openapi.TYPE_OBJECT),
+                            'key': openapi.Schema(type=openapi.TYPE_STRING),
+                            'upload_token': openapi.Schema(type=openapi.TYPE_STRING),
+                            'expires_in': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'max_size': openapi.Schema(type=openapi.TYPE_INTEGER)}
+            )),
+            400: 'Bad Request', 401: 'Unauthorized', 501: 'Storage backend does not support direct uploads',
+        },
+        tags=['Documents']
+    )
+    def post(self, request, *args, **kwargs):
+        logger.info(f"User {request.user.email} (Role: {request.user.role}) requesting a direct upload.")
+        serializer = DirectUploadRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors)
+
+        try:
+            upload = DirectUploadService.create_upload(serializer.validated_data, request.user)
+            return self.success_response(
+                message="Upload the file to 'url' with 'fields', then call finalize with 'upload_token'.",
+                data=upload,
+                status_code=status.HTTP_201_CREATED
+            )
+        except DirectUploadNotSupported as e:
+            return self.error_response(
+                message=str(e),
+                status_code=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        except Exception as e:
+            logger.exception(f"Direct upload request failed for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to prepare the upload.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class DocumentDirectUploadFinalizeView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Step 2 of a direct upload: confirm the object exists in storage and create the document.",
+        request_body=DirectUploadFinalizeSerializer,
+        responses={
+            201: openapi.Response('Document uploaded successfully.', openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={'document_id': openapi.Schema(type=openapi.TYPE_INTEGER)}
+            )),
+            400: 'Bad Request', 401: 'Unauthorized', 501: 'Storage backend does not support direct uploads',
+        },
+        tags=['Documents']
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = DirectUploadFinalizeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors)
+
+        try:
+            document = DirectUploadService.finalize_upload(serializer.validated_data['upload_token'], request.user)
+            logger.info(f"Document (ID: {document.id}) direct upload finalized by {request.user.email}.")
+            return self.success_response(
+                message="Document uploaded successfully.",
+                data={"document_id": document.id},
+                status_code=status.HTTP_201_CREATED
+            )
+        except serializers.ValidationError as e:
+            return self.validation_error_response(e.detail, message="Upload could not be finalized.")
+        except DirectUploadNotSupported as e:
+            return self.error_response(
+                message=str(e),
+                status_code=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        except Exception as e:
+            logger.exception(f"Direct upload finalize failed for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to finalize the upload.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+# --- Resumable (chunked) Upload Views ---
+UPLOAD_PROGRESS_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={'session_id': openapi.Schema(type=openapi.TYPE_STRING),
+                'status': openapi.Schema(type=openapi.TYPE_STRING),
+                'total_size': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'chunk_size': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'total_chunks': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'received_chunks': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+                'missing_chunks': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+                'received_ranges': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER))),
+                'received_bytes': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'expires_at': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+                'document_id': openapi.Schema(type=openapi.TYPE_INTEGER)}
+)
+
+
+class UploadSessionCreateView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Start a resumable upload: declare the file size and document metadata, then PUT "
+                              "each chunk to /documents/uploads/{session_id}/chunks/{index}/ and call complete.",
+        request_body=UploadSessionCreateSerializer,
+        responses={
+            201: openapi.Response('Upload session created.', UPLOAD_PROGRESS_SCHEMA),
+            400: 'Bad Request', 401: 'Unauthorized',
+        },
+        tags=['Documents']
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = UploadSessionCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors)
+
+        try:
+            session = ChunkedUploadService.create_session(serializer.validated_data, request.user)
+            return self.success_response(
+                message="Upload session created.",
+                data=ChunkedUploadService.get_progress(session),
+                status_code=status.HTTP_201_CREATED
+            )
+        except Exception as e:
+            logger.exception(f"Failed to create upload session for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to create the upload session.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class UploadSessionDetailView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Report which chunks of an upload session have been received, so an "
+                              "interrupted client can resume with the missing ones.",
+        responses={
+            200: openapi.Response('Upload progress.', UPLOAD_PROGRESS_SCHEMA),
+            401: 'Unauthorized', 404: 'Not Found',
+        },
+        tags=['Documents']
+    )
+    def get(self, request, session_id, *args, **kwargs):
+        try:
+            session = ChunkedUploadService.get_session(session_id, request.user)
+            return self.success_response(
+                data=ChunkedUploadService.get_progress(session),
+                status_code=status.HTTP_200_OK
+            )
+        except Http404 as e:
+            return self.error_response(message=str(e), status_code=status.HTTP_404_NOT_FOUND)
+
+    @swagger_auto_schema(
+        operation_description="Abort an unfinished upload session and discard its chunks.",
+        responses={204: 'Upload session aborted.', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found'},
+        tags=['Documents']
+    )
+    def delete(self, request, session_id, *args, **kwargs):
+        try:
+            ChunkedUploadService.abort_session(ChunkedUploadService.get_session(session_id, request.user))
+            return self.success_response(
+                message="Upload session aborted.",
+                status_code=status.HTTP_204_NO_CONTENT
+            )
+        except Http404 as e:
+            return self.error_response(message=str(e), status_code=status.HTTP_404_NOT_FOUND)
+        except serializers.ValidationError as e:
+            return self.validation_error_response(e.detail, message="Upload session cannot be aborted.")
+
+
+class UploadChunkView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Upload one chunk as the raw request body (application/octet-stream). "
+                              "Chunks are zero-indexed, every chunk but the last must be exactly chunk_size "
+                              "bytes, and re-sending a chunk replaces it.",
+        manual_parameters=[
+            openapi.Parameter('X-Chunk-SHA256', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=True,
+                              description='Hex SHA-256 of the chunk body.'),
+        ],
+        responses={
+            200: openapi.Response('Chunk stored.', UPLOAD_PROGRESS_SCHEMA),
+            400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+        },
+        tags=['Documents']
+    )
+    def put(self, request, session_id, index, *args, **kwargs):
+        try:
+            session = ChunkedUploadService.get_session(session_id, request.user)
+            # Read the raw body as a stream; touching request.data would buffer and parse it.
+            ChunkedUploadService.write_chunk(session, index, request.stream or io.BytesIO(),
+                                             request.headers.get('X-Chunk-SHA256'))
+            return self.success_response(
+                message=f"Chunk {index} stored.",
+                data=ChunkedUploadService.get_progress(session),
+                status_code=status.HTTP_200_OK
+            )
+        except Http404 as e:
+            return self.error_response(message=str(e), status_code=status.HTTP_404_NOT_FOUND)
+        except serializers.ValidationError as e:
+            return self.validation_error_response(e.detail, message="Chunk rejected.")
+        except Exception as e:
+            logger.exception(f"Failed to store chunk {index} of upload session {session_id}: {e}")
+            return self.error_response(
+                message="Failed to store the chunk.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class UploadSessionCompleteView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Assemble the uploaded chunks and create the document.",
+        responses={
+            201: openapi.Response('Document uploaded successfully.', openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={'document_id': openapi.Schema(type=openapi.TYPE_INTEGER)}
+            )),
+            400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+        },
+        tags=['Documents']
+    )
+    def post(self, request, session_id, *args, **kwargs):
+        try:
+            document = ChunkedUploadService.complete_session(session_id, request.user)
+            return self.success_response(
+                message="Document uploaded successfully.",
+                data={"document_id": document.id},
+                status_code=status.HTTP_201_CREATED
+            )
+        except Http404 as e:
+            return self.error_response(message=str(e), status_code=status.HTTP_404_NOT_FOUND)
+        except serializers.ValidationError as e:
+            return self.validation_error_response(e.detail, message="Upload could not be completed.")
+        except Exception as e:
+            logger.exception(f"Failed to complete upload session {session_id} for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to complete the upload.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 # --- Document ListView ---
-class DocumentListView(APIView, APIResponseMixin):
+class DocumentListView(APIView, APIResponseMixin, DocumentVisibilityMixin, ConditionalResponseMixin):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
-        operation_description="List all academic documents. Filters available: status, uploader_id.",
+        operation_description="List academic documents, one keyset-paginated page at a time. "
+                              "Filters available: status, uploader_id, course, academic_year, semester_number, "
+                              "doc_type, file_format, created_at_after, created_at_before.",
         manual_parameters=[
             openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING,
                               # CORRECTED LINE: Reference DocumentStatus directly
                               enum=[choice[0] for choice in DocumentStatus.choices], description="Filter by document status (e.g., 'pending', 'approved', 'rejected')."),
             openapi.Parameter('uploader_id', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
                               description="Filter by uploader ID (Admin/Staff only)."),
+            openapi.Parameter('course', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by course ID."),
+            openapi.Parameter('academic_year', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by academic year ID."),
+            openapi.Parameter('semester_number', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in SemesterNumber.choices], description="Filter by semester number."),
+            openapi.Parameter('doc_type', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in Document.DocumentType.choices], description="Filter by document type."),
+            openapi.Parameter('file_format', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Filter by MIME type (e.g., 'application/pdf')."),
+            openapi.Parameter('created_at_after', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description="Only documents created on or after this date (YYYY-MM-DD)."),
+            openapi.Parameter('created_at_before', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description="Only documents created on or before this date (YYYY-MM-DD)."),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Opaque cursor taken from 'next_cursor' or 'previous_cursor' of a previous page."),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Number of documents per page (capped by the server)."),
+            openapi.Parameter('ordering', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[prefix + field for field in KeysetPagination.ordering_fields for prefix in ('', '-')],
+                              description="Sort order; prefix with '-' for descending. Defaults to '-created_at'."),
+            openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Comma-separated fields to return, e.g. 'id,title,status'. Defaults to all fields."),
+            openapi.Parameter('expand', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Comma-separated relations to nest (course, academic_year, uploader). "
+                                          "When given, relations not listed are returned as IDs. Defaults to all."),
         ],
         responses={
-            200: openapi.Response('List of documents', DocumentRetrieveSerializer(many=True)),
-            401: 'Unauthorized', 403: 'Permission Denied', 500: 'Internal Server Error',
+            200: openapi.Response('Page of documents', DocumentRetrieveSerializer(many=True)),
+            400: 'Bad Request', 401: 'Unauthorized', 403: 'Permission Denied', 500: 'Internal Server Error',
         },
         tags=['Documents']
     )
     def get(self, request, *args, **kwargs):
         logger.info(f"User {request.user.email} (Role: {request.user.role}) requesting list of documents.")
-        filter_kwargs = {}
-
-        # Important: Implement role-based filtering logic *within* the view's get method
-        if request.user.role == 'student':
-            filter_kwargs['status'] = DocumentStatus.APPROVED.value # Corrected for consistency with imported enum
-            if request.query_params.get('my_uploads', 'false').lower() == 'true':
-                filter_kwargs['uploader'] = request.user
-            if request.query_params.get('uploader_id') and str(request.user.id) != request.query_params.get('uploader_id'):
-                logger.warning(f"Student {request.user.email} attempted to view documents of uploader ID {request.query_params.get('uploader_id')}.")
-                return self.error_response(
-                    message="Students can only view their own uploads or general approved documents.",
-                    status_code=status.HTTP_403_FORBIDDEN
-                )
-            elif request.query_params.get('uploader_id') and str(request.user.id) == request.query_params.get('uploader_id'):
-                 filter_kwargs['uploader_id'] = request.user.id
-        elif IsAdminOrStaffUserRole().has_permission(request, self):
-            status_param = request.query_params.get('status')
-            if status_param:
-                filter_kwargs['status'] = status_param
-            uploader_id = request.query_params.get('uploader_id')
-            if uploader_id:
-                filter_kwargs['uploader_id'] = uploader_id
-        else:
-            filter_kwargs['status'] = DocumentStatus.APPROVED.value
 
+        try:
+            # Important: role-based filtering is resolved by DocumentVisibilityMixin
+            filter_kwargs = self.get_visibility_filter_kwargs(request)
+        except PermissionDenied as e:
+            return self.error_response(
+                message=str(e.detail),
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        documents = DocumentService.get_all_documents(filter_kwargs=filter_kwargs)
+        filterset = DocumentFilter(request.query_params, queryset=documents)
+        if not filterset.is_valid():
+            return self.validation_error_response(filterset.errors, message="Invalid filter parameters.")
 
         try:
-            documents = DocumentService.get_all_documents(filter_kwargs=filter_kwargs)
-            serializer = DocumentRetrieveSerializer(documents, many=True)
-            logger.info(f"Retrieved {len(serializer.data)} documents for user {request.user.email}.")
-            return self.success_response(
-                data=serializer.data,
+            fields, expand = DocumentRetrieveSerializer.get_field_selection(request.query_params)
+            # The newest change and the row count move whenever a visible document is added,
+            # edited, re-reviewed or removed. Deletions do not move the maximum, so only the
+            # ETag (which includes the count) is evaluated, never If-Modified-Since.
+            freshness = filterset.qs.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+            etag = self.get_weak_etag(request, freshness['last_modified'], freshness['count'])
+            not_modified = self.get_not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+
+            paginator = KeysetPagination()
+            # Pages are built from values_list() tuples; only the selected columns
+            # (plus the id and ordering column the cursor needs) are loaded.
+            serializer = DocumentValuesSerializer(fields=fields, expand=expand)
+            rows = serializer.get_rows(filterset.qs, extra_fields=['id', paginator.get_ordering(request).lstrip('-')])
+            page = paginator.paginate_queryset(rows, request, get_value=serializer.get_value)
+            data = serializer.serialize(page)
+            logger.info(f"Retrieved {len(data)} documents for user {request.user.email}.")
+            response = self.success_response(
+                data=paginator.get_paginated_data(data),
                 status_code=status.HTTP_200_OK
             )
+            return self.set_validator_headers(response, etag, freshness['last_modified'])
+        except serializers.ValidationError as e:
+            return self.error_response(
+                errors=e.detail,
+                message="Invalid query parameters.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             logger.exception(f"Error listing documents for user {request.user.email}: {e}")
             return self.error_response(
@@ -153,23 +534,308 @@ class DocumentListView(APIView, APIResponseMixin):
             )
 
 
+# --- Document ExportView ---
+class DocumentExportView(APIView, APIResponseMixin, DocumentVisibilityMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Admin-only export of the document catalog (with course, academic year, uploader and "
+                              "status), streamed as NDJSON or CSV. Accepts the same filters as the document list.",
+        manual_parameters=[
+            openapi.Parameter('output', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=list(EXPORT_FORMATS),
+                              description="Export format; defaults to 'ndjson'."),
+            openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in DocumentStatus.choices], description="Filter by document status."),
+            openapi.Parameter('uploader_id', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by uploader ID."),
+            openapi.Parameter('course', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by course ID."),
+            openapi.Parameter('academic_year', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by academic year ID."),
+            openapi.Parameter('semester_number', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in SemesterNumber.choices], description="Filter by semester number."),
+            openapi.Parameter('doc_type', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in Document.DocumentType.choices], description="Filter by document type."),
+            openapi.Parameter('file_format', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Filter by MIME type (e.g., 'application/pdf')."),
+            openapi.Parameter('created_at_after', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description="Only documents created on or after this date (YYYY-MM-DD)."),
+            openapi.Parameter('created_at_before', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description="Only documents created on or before this date (YYYY-MM-DD)."),
+        ],
+        responses={
+            200: 'Streamed NDJSON (one document per line) or CSV with a header row.',
+            400: 'Bad Request', 401: 'Unauthorized', 403: 'Permission Denied',
+        },
+        tags=['Documents']
+    )
+    def get(self, request, *args, **kwargs):
+        if not IsAdminUserRole().has_permission(request, self):
+            logger.warning(f"User {request.user.email} (Role: {request.user.role}) attempted an unauthorized catalog export.")
+            return self.error_response(
+                message="Only administrators can export the document catalog.",
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        export_format = request.query_params.get('output', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return self.error_response(
+                message=f"Unsupported export format; use one of: {', '.join(EXPORT_FORMATS)}.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        documents = DocumentService.get_all_documents(filter_kwargs=self.get_visibility_filter_kwargs(request))
+        filterset = DocumentFilter(request.query_params, queryset=documents)
+        if not filterset.is_valid():
+            return self.validation_error_response(filterset.errors, message="Invalid filter parameters.")
+
+        content_type, extension = EXPORT_FORMATS[export_format]
+        # Rows are read and encoded while the response is sent; nothing is built up in memory.
+        response = StreamingHttpResponse(DocumentExportService.stream(filterset.qs, export_format),
+                                         content_type=f"{content_type}; charset=utf-8")
+        response['Content-Disposition'] = content_disposition_header(
+            as_attachment=True, filename=f"documents-{timezone.now():%Y%m%d-%H%M%S}.{extension}")
+        response['Cache-Control'] = 'private, no-store'
+        # Lets nginx pass chunks through as they are produced instead of buffering the export.
+        response['X-Accel-Buffering'] = 'no'
+        logger.info(f"User {request.user.email} started a {export_format} catalog export.")
+        return response
+
+
+# --- Document BundleView ---
+class DocumentBundleView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Download every approved paper of a course, or of an academic year's semester, as one "
+                              "ZIP archive streamed on the fly. Identical selections get the same ETag, so clients "
+                              "can revalidate with If-None-Match.",
+        manual_parameters=[
+            openapi.Parameter('course', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Course ID."),
+            openapi.Parameter('academic_year', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Academic year ID (with semester_number, or to narrow a course)."),
+            openapi.Parameter('semester_number', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in SemesterNumber.choices], description="Semester number."),
+        ],
+        responses={
+            200: 'ZIP archive (application/zip).',
+            304: 'Not Modified', 400: 'Bad Request', 401: 'Unauthorized', 404: 'No approved documents match.',
+        },
+        tags=['Documents']
+    )
+    def get(self, request, *args, **kwargs):
+        serializer = DocumentBundleSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors, message="Invalid bundle parameters.")
+
+        filters = serializer.get_filters()
+        try:
+            documents = DocumentBundleService.get_documents(filters)
+        except BundleTooLarge as e:
+            return self.error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+        if not documents:
+            return self.error_response(message="No approved documents match.", status_code=status.HTTP_404_NOT_FOUND)
+
+        validators = {
+            'ETag': DocumentBundleService.get_etag(filters, documents),
+            # Bundles hold approved papers only, but the API is still for authenticated users.
+            'Cache-Control': 'private, max-age=0, must-revalidate',
+        }
+        conditional = get_conditional_response(request, etag=validators['ETag'])
+        if conditional is not None:
+            DocumentDownloadService.set_headers(conditional, validators)
+            return conditional
+
+        response = StreamingHttpResponse(DocumentBundleService.stream(documents), content_type='application/zip')
+        DocumentDownloadService.set_headers(response, validators)
+        response['Content-Disposition'] = content_disposition_header(
+            as_attachment=True, filename=DocumentBundleService.get_archive_name(filters))
+        response['X-Accel-Buffering'] = 'no'
+        logger.info(f"User {request.user.email} downloading a bundle of {len(documents)} document(s) ({filters}).")
+        return response
+
+
+# --- Document SearchView ---
+class DocumentSearchView(APIView, APIResponseMixin, DocumentVisibilityMixin):
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = 100
+
+    @swagger_auto_schema(
+        operation_description="Full-text search over document title, course code, course name, program name and "
+                              "document type, ranked by relevance. Accepts the same filters as the document list.",
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+                              description="Search terms."),
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Maximum number of results (default 20, max 100)."),
+        ],
+        responses={
+            200: openapi.Response('Ranked search results', DocumentRetrieveSerializer(many=True)),
+            400: 'Bad Request', 401: 'Unauthorized', 403: 'Permission Denied', 500: 'Internal Server Error',
+        },
+        tags=['Documents']
+    )
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        logger.info(f"User {request.user.email} (Role: {request.user.role}) searching documents for '{query}'.")
+        if not query:
+            return self.error_response(
+                message="A search query ('q') is required.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return self.error_response(
+                message="'limit' must be a positive integer.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            filter_kwargs = self.get_visibility_filter_kwargs(request)
+        except PermissionDenied as e:
+            return self.error_response(
+                message=str(e.detail),
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        filterset = DocumentFilter(request.query_params, queryset=DocumentService.get_all_documents(filter_kwargs=filter_kwargs))
+        if not filterset.is_valid():
+            return self.validation_error_response(filterset.errors, message="Invalid filter parameters.")
+
+        try:
+            documents = list(SearchService.search(filterset.qs, query)[:limit])
+            results = DocumentRetrieveSerializer(documents, many=True).data
+            for result, document in zip(results, documents):
+                result['rank'] = document.rank
+            logger.info(f"Search for '{query}' returned {len(results)} documents for user {request.user.email}.")
+            return self.success_response(
+                data={"query": query, "results": results},
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            logger.exception(f"Error searching documents for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to search documents.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+# --- Document FacetsView ---
+class DocumentFacetsView(APIView, APIResponseMixin, DocumentVisibilityMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Document counts per doc type, course, academic year and semester for the current "
+                              "filter selection. Accepts the same filters as the document list.",
+        manual_parameters=[
+            openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in DocumentStatus.choices], description="Filter by document status (Admin/Staff only)."),
+            openapi.Parameter('course', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by course ID."),
+            openapi.Parameter('academic_year', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by academic year ID."),
+            openapi.Parameter('semester_number', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in SemesterNumber.choices], description="Filter by semester number."),
+            openapi.Parameter('doc_type', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[choice[0] for choice in Document.DocumentType.choices], description="Filter by document type."),
+        ],
+        responses={
+            200: 'Facet counts: {"total": int, "facets": {facet: [{"value", "label", "count"}]}}',
+            400: 'Bad Request', 401: 'Unauthorized', 403: 'Permission Denied', 500: 'Internal Server Error',
+        },
+        tags=['Documents']
+    )
+    def get(self, request, *args, **kwargs):
+        logger.info(f"User {request.user.email} (Role: {request.user.role}) requesting document facets.")
+        try:
+            filter_kwargs = self.get_visibility_filter_kwargs(request)
+        except PermissionDenied as e:
+            return self.error_response(
+                message=str(e.detail),
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        filterset = DocumentFilter(request.query_params, queryset=DocumentService.get_all_documents(filter_kwargs=filter_kwargs))
+        if not filterset.is_valid():
+            return self.validation_error_response(filterset.errors, message="Invalid filter parameters.")
+
+        try:
+            facets = FacetService.get_facets(filterset.qs, {**filter_kwargs, **filterset.form.cleaned_data})
+            return self.success_response(
+                data=facets,
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            logger.exception(f"Error computing document facets for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to compute document facets.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+# --- Document TrendingView ---
+class DocumentTrendingView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Approved documents ranked by recent view and download activity (time-decayed), "
+                              "optionally within a program or course. Scores come from a periodically refreshed "
+                              "rollup and results are cached briefly, so new activity shows up within minutes.",
+        manual_parameters=[
+            openapi.Parameter('program', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by program ID."),
+            openapi.Parameter('course', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Filter by course ID."),
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Maximum number of results (default 20, max 100)."),
+        ],
+        responses={
+            200: openapi.Response('Trending documents, each with a "trending_score"',
+                                  DocumentRetrieveSerializer(many=True)),
+            400: 'Bad Request', 401: 'Unauthorized', 500: 'Internal Server Error',
+        },
+        tags=['Documents']
+    )
+    def get(self, request, *args, **kwargs):
+        serializer = DocumentTrendingSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors, message="Invalid trending parameters.")
+
+        try:
+            # Only approved documents are ranked, which every role may see.
+            results = TrendingService.get_trending(serializer.validated_data.get('program'),
+                                                   serializer.validated_data.get('course'),
+                                                   serializer.validated_data['limit'])
+            return self.success_response(
+                data=results,
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            logger.exception(f"Error computing trending documents for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to retrieve trending documents.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 # --- Document Detail/Update/Delete View ---
-class DocumentDetailView(APIView, APIResponseMixin):
+class DocumentDetailView(APIView, APIResponseMixin, DocumentVisibilityMixin, ConditionalResponseMixin):
     permission_classes = [IsAuthenticated]
 
-    def get_object(self, id):
+    def get_object(self, id, queryset=None):
         """Helper method to get document instance or raise 404."""
         from django.http import Http404 # Ensure Http404 is imported if used directly
         from rest_framework.exceptions import PermissionDenied # Ensure PermissionDenied is imported
 
         try:
-            document = DocumentService.get_document(id)
+            document = DocumentService.get_document(id, queryset=queryset)
             # Internal object-level permission check based on role
-            if not (IsAdminOrStaffUserRole().has_permission(self.request, self) or
-                    (self.request.user.role == 'student' and
-                     (document.uploader == self.request.user or document.status == DocumentStatus.APPROVED.value))): # Corrected to use .value
-                logger.warning(f"User {self.request.user.email} (Role: {self.request.user.role}) attempted unauthorized access to document ID {id}.")
-                raise PermissionDenied("You do not have permission to access this document.")
+            self.check_document_access(self.request, document)
             return document
         except Http404:
             raise Http404("Document not found.") # Re-raise Http404 to get proper DRF 404 behavior
@@ -182,6 +848,13 @@ class DocumentDetailView(APIView, APIResponseMixin):
 
     @swagger_auto_schema(
         operation_description="Retrieve an academic document by ID.",
+        manual_parameters=[
+            openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Comma-separated fields to return, e.g. 'id,title,status'. Defaults to all fields."),
+            openapi.Parameter('expand', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Comma-separated relations to nest (course, academic_year, uploader). "
+                                          "When given, relations not listed are returned as IDs. Defaults to all."),
+        ],
         responses={
             200: openapi.Response('Document details', DocumentRetrieveSerializer),
             401: 'Unauthorized', 403: 'Permission Denied', 404: 'Not Found', 500: 'Internal Server Error',
@@ -191,12 +864,28 @@ class DocumentDetailView(APIView, APIResponseMixin):
     def get(self, request, id, *args, **kwargs):
         logger.info(f"User {request.user.email} (Role: {request.user.role}) requesting details for document ID: {id}.")
         try:
-            document = self.get_object(id)
-            serializer = DocumentRetrieveSerializer(document)
-            return self.success_response(
+            fields, expand = DocumentRetrieveSerializer.get_field_selection(request.query_params)
+        except serializers.ValidationError as e:
+            return self.validation_error_response(e.detail, message="Invalid query parameters.")
+        try:
+            # The access check reads the status and uploader, so those are always loaded.
+            queryset = DocumentRetrieveSerializer.optimize_queryset(
+                Document.objects.all(), fields, expand, extra_fields=['status', 'uploader', 'updated_at'])
+            document = self.get_object(id, queryset=queryset)
+            # Checked after the access check, so a 304 never reveals a document the user may not see.
+            # The counters are deliberately not part of the ETag: they would change it on every flush.
+            etag = self.get_weak_etag(request, document.updated_at)
+            not_modified = self.get_not_modified_response(request, etag, document.updated_at)
+            if not_modified is not None:
+                return not_modified
+            # A revalidation that comes back 304 is a poll, not a view.
+            DocumentCounterService.increment(document.id, DocumentCounterService.VIEWS)
+            serializer = DocumentRetrieveSerializer(document, fields=fields, expand=expand)
+            response = self.success_response(
                 data=serializer.data,
                 status_code=status.HTTP_200_OK
             )
+            return self.set_validator_headers(response, etag, document.updated_at)
         except Http404 as e:
             return self.error_response(
                 message=str(e),
@@ -316,6 +1005,47 @@ class DocumentDetailView(APIView, APIResponseMixin):
             )
 
 
+# --- Document Download View ---
+class DocumentDownloadView(APIView, APIResponseMixin, DocumentVisibilityMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Download the file of a document the user may access. Supports Range "
+                              "(single byte range), If-Range, If-None-Match and If-Modified-Since.",
+        manual_parameters=[
+            openapi.Parameter('Range', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+                              description='e.g. bytes=0-1048575'),
+        ],
+        responses={
+            200: 'File contents', 206: 'Partial file contents', 304: 'Not Modified',
+            401: 'Unauthorized', 403: 'Permission Denied', 404: 'Not Found', 416: 'Range Not Satisfiable',
+        },
+        tags=['Documents']
+    )
+    def get(self, request, id, *args, **kwargs):
+        try:
+            document = DocumentService.get_document(id)
+            self.check_document_access(request, document)
+            response = DocumentDownloadService.build_response(request, document, request.user)
+            # Resumed downloads (ranges not starting at byte 0) and 304s are not counted again.
+            if DocumentCounterService.is_download_start(response):
+                DocumentCounterService.increment(document.id, DocumentCounterService.DOWNLOADS)
+            return response
+        except Http404:
+            return self.error_response(message="Document not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except PermissionDenied as e:
+            return self.error_response(message=str(e.detail), status_code=status.HTTP_403_FORBIDDEN)
+        except FileNotFoundError as e:
+            logger.error(f"File for document ID {id} is missing from storage: {e}")
+            return self.error_response(message="Document file not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.exception(f"Download of document ID {id} failed for user {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to download the document.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 # --- Document Status Change View ---
 class DocumentStatusChangeView(APIView, APIResponseMixin):
     permission_classes = [IsAuthenticated]
@@ -363,4 +1093,174 @@ class DocumentStatusChangeView(APIView, APIResponseMixin):
     # Helper method for status view as it's not a generic view
     def get_object_or_404(self, queryset, *args, **kwargs):
         from django.shortcuts import get_object_or_404
-        return get_object_or_404(queryset, *args, **kwargs)
\ No newline at end of file
+        return get_object_or_404(queryset, *args, **kwargs)
+
+
+# --- Review Queue View ---
+class DocumentReviewQueueView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Claim the next pending documents for review, oldest first. Reviewers working at "
+                              "the same time never receive the same document. Claims lapse after "
+                              "DOCUMENT_REVIEW_LEASE_SECONDS unless a status decision is made; documents the caller "
+                              "already holds are returned (and their lease renewed) first.",
+        request_body=ReviewQueueClaimSerializer,
+        responses={
+            200: 'Claimed documents: {"lease_expires_at": datetime, "documents": [...]}',
+            400: 'Bad Request', 401: 'Unauthorized', 403: 'Permission Denied', 500: 'Internal Server Error',
+        },
+        tags=['Documents']
+    )
+    def post(self, request, *args, **kwargs):
+        if not IsAdminOrStaffUserRole().has_permission(request, self):
+            logger.warning(f"User {request.user.email} (Role: {request.user.role}) attempted to claim review work.")
+            return self.error_response(
+                message="Only administrators and staff can review documents.",
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = ReviewQueueClaimSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors, message="Invalid review queue request.")
+
+        try:
+            document_ids, expires_at = ReviewQueueService.claim_next(request.user, serializer.validated_data['count'])
+            values = DocumentValuesSerializer()
+            documents = values.serialize(values.get_rows(
+                Document.objects.filter(id__in=document_ids).order_by('created_at', 'id')))
+            return self.success_response(
+                data={"lease_expires_at": expires_at, "documents": documents},
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            logger.exception(f"Claiming review work failed for {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to claim documents for review.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+# --- Bulk Document Status Change View ---
+class DocumentBulkStatusChangeView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Approve or reject many documents in one call. Send 'items' ([{id, new_status}]) "
+                              "and/or 'ids' with a shared 'new_status'. Returns the outcome for every ID: "
+                              "updated, unchanged, not_found or conflict.",
+        request_body=BulkStatusChangeSerializer,
+        responses={
+            200: openapi.Response('Bulk review applied.', openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                            'outcome': openapi.Schema(type=openapi.TYPE_STRING)})),
+                            'summary': openapi.Schema(type=openapi.TYPE_OBJECT)}
+            )),
+            400: 'Bad Request', 401: 'Unauthorized', 403: 'Permission Denied', 500: 'Internal Server Error',
+        },
+        tags=['Documents']
+    )
+    def post(self, request, *args, **kwargs):
+        if not IsAdminOrStaffUserRole().has_permission(request, self):
+            logger.warning(f"User {request.user.email} (Role: {request.user.role}) attempted an unauthorized bulk status change.")
+            return self.error_response(
+                message="Only administrators and staff can change document status.",
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = BulkStatusChangeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors)
+
+        try:
+            outcomes = DocumentService.bulk_change_status(serializer.validated_data['changes'], request.user)
+            summary = {}
+            for outcome in outcomes.values():
+                summary[outcome] = summary.get(outcome, 0) + 1
+            return self.success_response(
+                message="Bulk review applied.",
+                data={
+                    "results": [{"id": document_id, "outcome": outcome} for document_id, outcome in outcomes.items()],
+                    "summary": summary,
+                },
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            logger.exception(f"Bulk status change failed for {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to apply the bulk review.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+# --- Bulk Ingest View ---
+class DocumentBulkIngestView(APIView, APIResponseMixin):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Staff bulk ingest: upload a ZIP archive (or several files) with a JSON/CSV manifest "
+                              "whose rows give file, title, doc_type, course (ID or code), academic_year "
+                              "(ID or e.g. 2023-2024) and semester_number. Returns a per-file report.",
+        manual_parameters=[
+            openapi.Parameter('archive', openapi.IN_FORM, type=openapi.TYPE_FILE, required=False,
+                              description='ZIP archive of documents.'),
+            openapi.Parameter('files', openapi.IN_FORM, type=openapi.TYPE_FILE, required=False,
+                              description='Individual document files (repeat the field).'),
+            openapi.Parameter('manifest', openapi.IN_FORM, type=openapi.TYPE_FILE, required=False,
+                              description='manifest.json or manifest.csv.'),
+        ],
+        consumes=['multipart/form-data'],
+        responses={
+            200: openapi.Response('Ingest report.', openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+                            'summary': openapi.Schema(type=openapi.TYPE_OBJECT)}
+            )),
+            400: 'Bad Request', 401: 'Unauthorized', 403: 'Permission Denied', 500: 'Internal Server Error',
+        },
+        tags=['Documents']
+    )
+    def post(self, request, *args, **kwargs):
+        if not IsAdminOrStaffUserRole().has_permission(request, self):
+            logger.warning(f"User {request.user.email} (Role: {request.user.role}) attempted an unauthorized bulk ingest.")
+            return self.error_response(
+                message="Only administrators and staff can bulk ingest documents.",
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = BulkIngestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.validation_error_response(serializer.errors)
+
+        data = serializer.validated_data
+        source = None
+        try:
+            if data.get('archive'):
+                source = IngestSource.from_zip(data['archive'])
+            else:
+                source = IngestSource.from_uploaded_files(data['files'])
+            if data.get('manifest'):
+                rows = BulkIngestService.parse_manifest(data['manifest'].read(), data['manifest'].name)
+            else:
+                rows = BulkIngestService.find_manifest(source)
+            report = BulkIngestService.ingest(source, rows, request.user)
+            return self.success_response(
+                message=f"Ingested {report['summary'].get('created', 0)} of {len(rows)} listed document(s).",
+                data=report,
+                status_code=status.HTTP_200_OK
+            )
+        except IngestError as e:
+            return self.error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.exception(f"Bulk ingest failed for {request.user.email}: {e}")
+            return self.error_response(
+                message="Failed to ingest the documents.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        finally:
+            if source:
+                source.close()
+